@@ -0,0 +1,31 @@
+-- =============================================
+-- 0001: Hot-path composite indexes (rollback)
+-- =============================================
+-- Composite indexes that were serving a foreign key can only be dropped in
+-- the same statement that re-creates the single-column FK index.
+
+ALTER TABLE projects
+    ADD INDEX fk_project_dept (department_id),
+    DROP INDEX idx_projects_dept_status;
+
+ALTER TABLE warehouse_products
+    DROP INDEX idx_wp_qty_reorder;
+
+ALTER TABLE customers
+    DROP INDEX idx_customers_name;
+
+ALTER TABLE person
+    ADD INDEX fk_person_dept (department_id),
+    DROP INDEX idx_person_dept_active_type;
+
+ALTER TABLE orders_m
+    ADD INDEX fk_salesman (salesman_id),
+    DROP INDEX idx_orders_salesman_status_date,
+    DROP INDEX idx_orders_status_date,
+    DROP INDEX idx_orders_date;
+
+ALTER TABLE work_log
+    ADD INDEX fk_worklog_employee (employee_id),
+    DROP INDEX idx_work_log_employee_date,
+    DROP INDEX idx_work_log_date,
+    DROP INDEX idx_work_log_status_date;
@@ -0,0 +1,47 @@
+-- =============================================
+-- 0001: Hot-path composite indexes
+-- =============================================
+-- Each index is matched to a repository query (see models/*_repository.py).
+-- Where a composite index starts with a foreign-key column, InnoDB drops the
+-- implicit single-column FK index it created, so the down migration puts
+-- that index back before dropping the composite.
+
+-- WorkLogRepository.get_all/get_page 'employee' filter, ordered by work_date
+-- (replaces the implicit fk_worklog_employee index)
+ALTER TABLE work_log
+    ADD INDEX idx_work_log_employee_date (employee_id, work_date),
+    -- Default listing: ORDER BY w.work_date DESC, w.log_id DESC (keyset)
+    ADD INDEX idx_work_log_date (work_date, log_id),
+    -- 'status' filter (pending approvals), ordered by work_date
+    ADD INDEX idx_work_log_status_date (approval_status, work_date);
+
+-- OrderRepository 'salesman' (+ 'status') filter ordered by order_date,
+-- get_total_count(salesman_id) and the get_top_salesmen join on
+-- salesman_id + status = 'COMPLETED' (replaces the implicit fk_salesman index)
+ALTER TABLE orders_m
+    ADD INDEX idx_orders_salesman_status_date (salesman_id, status, order_date),
+    -- 'status' filter without a salesman, and get_total_revenue
+    ADD INDEX idx_orders_status_date (status, order_date),
+    -- Default listing: ORDER BY o.order_date DESC, o.order_id DESC (keyset)
+    ADD INDEX idx_orders_date (order_date, order_id);
+
+-- EmployeeRepository 'department' + 'is_active' + 'person_type' filters and
+-- the WorkLogRepository 'hod' filter (replaces the implicit fk_person_dept index)
+ALTER TABLE person
+    ADD INDEX idx_person_dept_active_type (department_id, is_active, person_type);
+
+-- CustomerRepository listing ORDER BY c.name, c.customer_id (keyset) and
+-- get_customers(). customers(salesman_id) for get_count(salesman_id) is
+-- already served by the implicit fk_customer_salesman index.
+ALTER TABLE customers
+    ADD INDEX idx_customers_name (name, customer_id);
+
+-- ProductRepository low-stock count/list (qty <= reorder_level is answered
+-- from the index alone) and the order dialog's wp.qty > 0 product lookup
+ALTER TABLE warehouse_products
+    ADD INDEX idx_wp_qty_reorder (qty, reorder_level);
+
+-- ProjectRepository 'department' + 'status' filters
+-- (replaces the implicit fk_project_dept index)
+ALTER TABLE projects
+    ADD INDEX idx_projects_dept_status (department_id, status);
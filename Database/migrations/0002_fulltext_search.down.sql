@@ -0,0 +1,16 @@
+-- =============================================
+-- 0002: FULLTEXT indexes (rollback)
+-- =============================================
+-- Set DB_SEARCH_MODE back to 'like' before rolling this back.
+
+ALTER TABLE projects
+    DROP INDEX ft_projects_name;
+
+ALTER TABLE products
+    DROP INDEX ft_products_name_type;
+
+ALTER TABLE customers
+    DROP INDEX ft_customers_name_email;
+
+ALTER TABLE person
+    DROP INDEX ft_person_name_email;
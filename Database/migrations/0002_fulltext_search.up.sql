@@ -0,0 +1,24 @@
+-- =============================================
+-- 0002: FULLTEXT indexes for search_mode = 'fulltext'
+-- =============================================
+-- Backs the 'search_ft' filters of the employee, customer, product, project
+-- and work log listings (see models/search.py). The MATCH column lists in
+-- the repositories must name exactly the columns of one of these indexes.
+-- Words shorter than innodb_ft_min_token_size (default 3) are not indexed;
+-- such search terms fall back to LIKE.
+
+-- EmployeeRepository and WorkLogRepository (employee name / email)
+ALTER TABLE person
+    ADD FULLTEXT INDEX ft_person_name_email (name, email);
+
+-- CustomerRepository
+ALTER TABLE customers
+    ADD FULLTEXT INDEX ft_customers_name_email (name, email);
+
+-- ProductRepository
+ALTER TABLE products
+    ADD FULLTEXT INDEX ft_products_name_type (product_name, product_type);
+
+-- ProjectRepository and WorkLogRepository (project name)
+ALTER TABLE projects
+    ADD FULLTEXT INDEX ft_projects_name (project_name);
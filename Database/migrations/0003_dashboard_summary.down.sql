@@ -0,0 +1,18 @@
+-- =============================================
+-- 0003: Trigger-maintained dashboard summary (rollback)
+-- =============================================
+-- ReportService falls back to aggregating the source tables when
+-- dashboard_summary does not exist.
+
+DROP TRIGGER IF EXISTS before_product_delete_summary;
+DROP TRIGGER IF EXISTS before_warehouse_delete_summary;
+DROP TRIGGER IF EXISTS after_stock_delete_summary;
+DROP TRIGGER IF EXISTS after_stock_update_summary;
+DROP TRIGGER IF EXISTS after_stock_insert_summary;
+DROP TRIGGER IF EXISTS after_customer_delete_summary;
+DROP TRIGGER IF EXISTS after_customer_insert_summary;
+DROP TRIGGER IF EXISTS after_order_delete_summary;
+DROP TRIGGER IF EXISTS after_order_update_summary;
+DROP TRIGGER IF EXISTS after_order_insert_summary;
+
+DROP TABLE IF EXISTS dashboard_summary;
@@ -0,0 +1,155 @@
+-- =============================================
+-- 0003: Trigger-maintained dashboard summary
+-- =============================================
+-- ReportService.get_dashboard_metrics reads the four dashboard counters
+-- from this table in one query instead of aggregating orders_m, customers
+-- and warehouse_products on every dashboard load.
+--
+-- The counters are split over 16 slot rows; each trigger adds its delta to
+-- the slot of its connection, so concurrent writers rarely wait on the same
+-- row lock. Readers SUM the slots. ReportService.check_dashboard_summary
+-- recomputes the totals from the source tables and can repair drift.
+--
+-- low_stock_count mirrors ProductRepository.get_low_stock_count
+-- (qty <= reorder_level). Rows removed by ON DELETE CASCADE do not fire
+-- triggers, so warehouses and products subtract their low-stock rows
+-- before they are deleted.
+
+CREATE TABLE dashboard_summary (
+    slot TINYINT UNSIGNED NOT NULL,
+    total_orders BIGINT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(16, 2) NOT NULL DEFAULT 0.00,
+    total_customers BIGINT NOT NULL DEFAULT 0,
+    low_stock_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT pk_dashboard_summary PRIMARY KEY (slot)
+);
+
+INSERT INTO dashboard_summary (slot) VALUES
+    (0), (1), (2), (3), (4), (5), (6), (7),
+    (8), (9), (10), (11), (12), (13), (14), (15);
+
+DELIMITER //
+
+CREATE TRIGGER after_order_insert_summary
+AFTER INSERT ON orders_m
+FOR EACH ROW
+BEGIN
+    UPDATE dashboard_summary
+    SET total_orders = total_orders + 1,
+        total_revenue = total_revenue + IF(NEW.status = 'COMPLETED', IFNULL(NEW.total_amount, 0), 0)
+    WHERE slot = CONNECTION_ID() % 16;
+END//
+
+CREATE TRIGGER after_order_update_summary
+AFTER UPDATE ON orders_m
+FOR EACH ROW
+BEGIN
+    DECLARE revenue_change DECIMAL(16, 2);
+    SET revenue_change = IF(NEW.status = 'COMPLETED', IFNULL(NEW.total_amount, 0), 0)
+                       - IF(OLD.status = 'COMPLETED', IFNULL(OLD.total_amount, 0), 0);
+    IF revenue_change <> 0 THEN
+        UPDATE dashboard_summary
+        SET total_revenue = total_revenue + revenue_change
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END//
+
+CREATE TRIGGER after_order_delete_summary
+AFTER DELETE ON orders_m
+FOR EACH ROW
+BEGIN
+    UPDATE dashboard_summary
+    SET total_orders = total_orders - 1,
+        total_revenue = total_revenue - IF(OLD.status = 'COMPLETED', IFNULL(OLD.total_amount, 0), 0)
+    WHERE slot = CONNECTION_ID() % 16;
+END//
+
+CREATE TRIGGER after_customer_insert_summary
+AFTER INSERT ON customers
+FOR EACH ROW
+BEGIN
+    UPDATE dashboard_summary
+    SET total_customers = total_customers + 1
+    WHERE slot = CONNECTION_ID() % 16;
+END//
+
+CREATE TRIGGER after_customer_delete_summary
+AFTER DELETE ON customers
+FOR EACH ROW
+BEGIN
+    UPDATE dashboard_summary
+    SET total_customers = total_customers - 1
+    WHERE slot = CONNECTION_ID() % 16;
+END//
+
+CREATE TRIGGER after_stock_insert_summary
+AFTER INSERT ON warehouse_products
+FOR EACH ROW
+BEGIN
+    IF IFNULL(NEW.qty <= NEW.reorder_level, 0) THEN
+        UPDATE dashboard_summary
+        SET low_stock_count = low_stock_count + 1
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END//
+
+CREATE TRIGGER after_stock_update_summary
+AFTER UPDATE ON warehouse_products
+FOR EACH ROW
+BEGIN
+    DECLARE low_change INT;
+    SET low_change = IFNULL(NEW.qty <= NEW.reorder_level, 0)
+                   - IFNULL(OLD.qty <= OLD.reorder_level, 0);
+    IF low_change <> 0 THEN
+        UPDATE dashboard_summary
+        SET low_stock_count = low_stock_count + low_change
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END//
+
+CREATE TRIGGER after_stock_delete_summary
+AFTER DELETE ON warehouse_products
+FOR EACH ROW
+BEGIN
+    IF IFNULL(OLD.qty <= OLD.reorder_level, 0) THEN
+        UPDATE dashboard_summary
+        SET low_stock_count = low_stock_count - 1
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END//
+
+-- warehouse_products rows cascade-deleted with their warehouse or product
+CREATE TRIGGER before_warehouse_delete_summary
+BEFORE DELETE ON warehouses
+FOR EACH ROW
+BEGIN
+    UPDATE dashboard_summary
+    SET low_stock_count = low_stock_count - (
+        SELECT COUNT(*) FROM warehouse_products
+        WHERE warehouse_id = OLD.warehouse_id AND qty <= reorder_level
+    )
+    WHERE slot = CONNECTION_ID() % 16;
+END//
+
+CREATE TRIGGER before_product_delete_summary
+BEFORE DELETE ON products
+FOR EACH ROW
+BEGIN
+    UPDATE dashboard_summary
+    SET low_stock_count = low_stock_count - (
+        SELECT COUNT(*) FROM warehouse_products
+        WHERE product_id = OLD.product_id AND qty <= reorder_level
+    )
+    WHERE slot = CONNECTION_ID() % 16;
+END//
+
+DELIMITER ;
+
+-- Seed from the current data (slot 0 holds the base totals)
+UPDATE dashboard_summary
+SET total_orders = (SELECT COUNT(*) FROM orders_m),
+    total_revenue = (SELECT COALESCE(SUM(total_amount), 0) FROM orders_m WHERE status = 'COMPLETED'),
+    total_customers = (SELECT COUNT(*) FROM customers),
+    low_stock_count = (SELECT COUNT(*) FROM warehouse_products WHERE qty <= reorder_level)
+WHERE slot = 0;
@@ -0,0 +1,7 @@
+-- =============================================
+-- 0004: Materialised employee directory (rollback)
+-- =============================================
+-- EmployeeRepository falls back to the joined listing when
+-- employee_directory does not exist.
+
+DROP TABLE IF EXISTS employee_directory;
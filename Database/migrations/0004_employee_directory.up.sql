@@ -0,0 +1,62 @@
+-- =============================================
+-- 0004: Materialised employee directory
+-- =============================================
+-- One denormalised row per person holding everything the employee listing
+-- shows, so EmployeeRepository.get_all scans a single table instead of
+-- joining person to departments, the four subtype tables, emp_supervisor
+-- and person again on every load.
+--
+-- The application keeps the rows current: every write to person, the
+-- subtype tables, emp_supervisor or a department name re-derives the
+-- affected rows in the same transaction (EmployeeRepository.
+-- directory_upsert). Rebuild it from the source tables with:
+--     python -m services.employee_service rebuild-directory
+--
+-- The index column orders follow the listing's keyset
+-- (person_type_rank, name, person_id) so filtered pages are index scans.
+
+CREATE TABLE employee_directory (
+    person_id INT NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(100),
+    phone VARCHAR(20),
+    person_type ENUM('GENERAL_EMPLOYEE', 'SUPERVISOR', 'HOD', 'SALESMAN') NOT NULL,
+    person_type_rank TINYINT UNSIGNED NOT NULL,
+    department_id INT,
+    department_name VARCHAR(100),
+    supervisor_id INT,
+    supervisor_name VARCHAR(100),
+    salary_rate DECIMAL(10, 2),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    search_key VARCHAR(201) NOT NULL,
+    CONSTRAINT pk_employee_directory PRIMARY KEY (person_id),
+    CONSTRAINT fk_employee_directory_person FOREIGN KEY (person_id) REFERENCES person (person_id) ON DELETE CASCADE,
+    INDEX idx_directory_list (person_type_rank, name, person_id),
+    INDEX idx_directory_department (department_id, person_type_rank, name, person_id),
+    INDEX idx_directory_supervisor (supervisor_id, person_type_rank, name, person_id),
+    FULLTEXT INDEX ft_directory_name_email (name, email)
+);
+
+INSERT INTO employee_directory (
+    person_id, name, email, phone, person_type, person_type_rank,
+    department_id, department_name, supervisor_id, supervisor_name,
+    salary_rate, is_active, search_key
+)
+SELECT
+    p.person_id, p.name, p.email, p.phone, p.person_type, p.person_type + 0,
+    p.department_id, d.department_name, es.supervisor_id, s.name,
+    CASE
+        WHEN p.person_type = 'HOD' THEN h.fixed_salary
+        WHEN p.person_type = 'SUPERVISOR' THEN sup.fixed_salary
+        WHEN p.person_type = 'SALESMAN' THEN sm.hourly_rate
+        WHEN p.person_type = 'GENERAL_EMPLOYEE' THEN ge.hourly_rate
+    END,
+    COALESCE(p.is_active, FALSE), CONCAT_WS(' ', p.name, p.email)
+FROM person p
+LEFT JOIN departments d ON p.department_id = d.department_id
+LEFT JOIN hod h ON p.person_id = h.person_id
+LEFT JOIN supervisor sup ON p.person_id = sup.person_id
+LEFT JOIN salesman sm ON p.person_id = sm.person_id
+LEFT JOIN general_employee ge ON p.person_id = ge.person_id
+LEFT JOIN emp_supervisor es ON p.person_id = es.employee_id
+LEFT JOIN person s ON es.supervisor_id = s.person_id;
@@ -0,0 +1,54 @@
+-- =============================================
+-- 0005: Incremental order totals (rollback)
+-- =============================================
+-- Restores the recomputing order_items triggers from schema.sql.
+
+DROP TRIGGER IF EXISTS after_order_item_insert;
+DROP TRIGGER IF EXISTS after_order_item_delete;
+DROP TRIGGER IF EXISTS after_order_item_update;
+
+DELIMITER //
+
+CREATE TRIGGER after_order_item_insert
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE warehouse_products
+    SET qty = qty - NEW.qty
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+    
+    UPDATE orders_m
+    SET total_amount = (SELECT SUM(qty * unit_price) FROM order_items WHERE order_id = NEW.order_id)
+    WHERE order_id = NEW.order_id;
+END//
+
+CREATE TRIGGER after_order_item_delete
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE warehouse_products
+    SET qty = qty + OLD.qty
+    WHERE warehouse_id = OLD.warehouse_id AND product_id = OLD.product_id;
+    
+    UPDATE orders_m
+    SET total_amount = (SELECT IFNULL(SUM(qty * unit_price), 0) FROM order_items WHERE order_id = OLD.order_id)
+    WHERE order_id = OLD.order_id;
+END//
+
+CREATE TRIGGER after_order_item_update
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    DECLARE stock_difference INT;
+    SET stock_difference = NEW.qty - OLD.qty;
+
+    UPDATE warehouse_products
+    SET qty = qty - stock_difference
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+    
+    UPDATE orders_m
+    SET total_amount = (SELECT SUM(qty * unit_price) FROM order_items WHERE order_id = NEW.order_id)
+    WHERE order_id = NEW.order_id;
+END//
+
+DELIMITER ;
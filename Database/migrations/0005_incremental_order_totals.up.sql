@@ -0,0 +1,86 @@
+-- =============================================
+-- 0005: Incremental order totals
+-- =============================================
+-- The order_items AFTER triggers from schema.sql recompute
+-- SUM(qty * unit_price) over the whole order for every row they see, so
+-- inserting an n-line order reads O(n^2) rows. These versions apply the
+-- changed row's own amount to orders_m.total_amount instead. Stock handling
+-- is unchanged.
+--
+-- orders_m.total_amount is owned by these triggers: the application
+-- inserts orders with a zero total and never writes it afterwards.
+-- Rows removed by ON DELETE CASCADE do not fire triggers; that only happens
+-- when the order itself is deleted, so no total is left stale.
+--
+-- benchmarks/order_totals.py compares both trigger versions.
+
+DROP TRIGGER IF EXISTS after_order_item_insert;
+DROP TRIGGER IF EXISTS after_order_item_delete;
+DROP TRIGGER IF EXISTS after_order_item_update;
+
+DELIMITER //
+
+CREATE TRIGGER after_order_item_insert
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE warehouse_products
+    SET qty = qty - NEW.qty
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+
+    UPDATE orders_m
+    SET total_amount = IFNULL(total_amount, 0) + NEW.qty * NEW.unit_price
+    WHERE order_id = NEW.order_id;
+END//
+
+CREATE TRIGGER after_order_item_delete
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE warehouse_products
+    SET qty = qty + OLD.qty
+    WHERE warehouse_id = OLD.warehouse_id AND product_id = OLD.product_id;
+
+    UPDATE orders_m
+    SET total_amount = IFNULL(total_amount, 0) - OLD.qty * OLD.unit_price
+    WHERE order_id = OLD.order_id;
+END//
+
+CREATE TRIGGER after_order_item_update
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    DECLARE stock_difference INT;
+    SET stock_difference = NEW.qty - OLD.qty;
+
+    UPDATE warehouse_products
+    SET qty = qty - stock_difference
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+
+    IF NEW.order_id = OLD.order_id THEN
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0)
+                         + NEW.qty * NEW.unit_price - OLD.qty * OLD.unit_price
+        WHERE order_id = NEW.order_id;
+    ELSE
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0) - OLD.qty * OLD.unit_price
+        WHERE order_id = OLD.order_id;
+
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0) + NEW.qty * NEW.unit_price
+        WHERE order_id = NEW.order_id;
+    END IF;
+END//
+
+DELIMITER ;
+
+-- Start from exact totals; earlier application code wrote its own
+UPDATE orders_m o
+LEFT JOIN (
+    SELECT order_id, SUM(qty * unit_price) AS total
+    FROM order_items
+    GROUP BY order_id
+) t ON t.order_id = o.order_id
+SET o.total_amount = IFNULL(t.total, 0)
+WHERE o.total_amount IS NULL OR o.total_amount <> IFNULL(t.total, 0);
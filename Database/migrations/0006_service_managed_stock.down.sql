@@ -0,0 +1,102 @@
+-- =============================================
+-- 0006: Stock reservation moves to InventoryService (rollback)
+-- =============================================
+-- Restores the stock-checking and stock-moving order_items triggers (0005
+-- versions). InventoryService detects them and stops moving line stock
+-- itself.
+
+DROP TRIGGER IF EXISTS after_order_item_insert;
+DROP TRIGGER IF EXISTS after_order_item_delete;
+DROP TRIGGER IF EXISTS after_order_item_update;
+
+DELIMITER //
+
+CREATE TRIGGER after_order_item_insert
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE warehouse_products
+    SET qty = qty - NEW.qty
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+
+    UPDATE orders_m
+    SET total_amount = IFNULL(total_amount, 0) + NEW.qty * NEW.unit_price
+    WHERE order_id = NEW.order_id;
+END//
+
+CREATE TRIGGER after_order_item_delete
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE warehouse_products
+    SET qty = qty + OLD.qty
+    WHERE warehouse_id = OLD.warehouse_id AND product_id = OLD.product_id;
+
+    UPDATE orders_m
+    SET total_amount = IFNULL(total_amount, 0) - OLD.qty * OLD.unit_price
+    WHERE order_id = OLD.order_id;
+END//
+
+CREATE TRIGGER after_order_item_update
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    DECLARE stock_difference INT;
+    SET stock_difference = NEW.qty - OLD.qty;
+
+    UPDATE warehouse_products
+    SET qty = qty - stock_difference
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+
+    IF NEW.order_id = OLD.order_id THEN
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0)
+                         + NEW.qty * NEW.unit_price - OLD.qty * OLD.unit_price
+        WHERE order_id = NEW.order_id;
+    ELSE
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0) - OLD.qty * OLD.unit_price
+        WHERE order_id = OLD.order_id;
+
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0) + NEW.qty * NEW.unit_price
+        WHERE order_id = NEW.order_id;
+    END IF;
+END//
+
+CREATE TRIGGER before_order_item_insert
+BEFORE INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    DECLARE available_stock INT;
+    SELECT qty INTO available_stock
+    FROM warehouse_products
+    WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+    
+    IF available_stock IS NULL THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Product not available in this warehouse';
+    ELSEIF available_stock < NEW.qty THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Insufficient stock available';
+    END IF;
+END//
+
+CREATE TRIGGER before_order_item_update
+BEFORE UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    DECLARE available_stock INT;
+    DECLARE stock_difference INT;
+    SET stock_difference = NEW.qty - OLD.qty;
+    
+    IF stock_difference > 0 THEN
+        SELECT qty INTO available_stock
+        FROM warehouse_products
+        WHERE warehouse_id = NEW.warehouse_id AND product_id = NEW.product_id;
+        
+        IF available_stock < stock_difference THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Insufficient stock update available';
+        END IF;
+    END IF;
+END//
+
+DELIMITER ;
@@ -0,0 +1,60 @@
+-- =============================================
+-- 0006: Stock reservation moves to InventoryService
+-- =============================================
+-- before_order_item_insert/update read warehouse_products.qty without a
+-- lock and after_order_item_insert/update decremented it later, so two
+-- concurrent orders could both pass the check and oversell until the
+-- CHECK (qty >= 0) constraint failed half-way through an order.
+--
+-- InventoryService now locks the stock rows in key order and applies
+-- conditional decrements (qty >= n) in the order's transaction, before the
+-- lines are inserted, and returns stock for deleted lines. The order_items
+-- triggers keep only the incremental order totals from 0005.
+
+DROP TRIGGER IF EXISTS before_order_item_insert;
+DROP TRIGGER IF EXISTS before_order_item_update;
+DROP TRIGGER IF EXISTS after_order_item_insert;
+DROP TRIGGER IF EXISTS after_order_item_delete;
+DROP TRIGGER IF EXISTS after_order_item_update;
+
+DELIMITER //
+
+CREATE TRIGGER after_order_item_insert
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders_m
+    SET total_amount = IFNULL(total_amount, 0) + NEW.qty * NEW.unit_price
+    WHERE order_id = NEW.order_id;
+END//
+
+CREATE TRIGGER after_order_item_delete
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders_m
+    SET total_amount = IFNULL(total_amount, 0) - OLD.qty * OLD.unit_price
+    WHERE order_id = OLD.order_id;
+END//
+
+CREATE TRIGGER after_order_item_update
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    IF NEW.order_id = OLD.order_id THEN
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0)
+                         + NEW.qty * NEW.unit_price - OLD.qty * OLD.unit_price
+        WHERE order_id = NEW.order_id;
+    ELSE
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0) - OLD.qty * OLD.unit_price
+        WHERE order_id = OLD.order_id;
+
+        UPDATE orders_m
+        SET total_amount = IFNULL(total_amount, 0) + NEW.qty * NEW.unit_price
+        WHERE order_id = NEW.order_id;
+    END IF;
+END//
+
+DELIMITER ;
@@ -0,0 +1,5 @@
+-- =============================================
+-- 0007: Bulk order import checkpoints (rollback)
+-- =============================================
+
+DROP TABLE IF EXISTS order_import_checkpoints;
@@ -0,0 +1,19 @@
+-- =============================================
+-- 0007: Bulk order import checkpoints
+-- =============================================
+-- OrderImportService records how far it got through each source file in
+-- the same transaction that writes a chunk of orders, so an interrupted
+-- import resumes exactly after the last committed chunk.
+
+CREATE TABLE order_import_checkpoints (
+    source VARCHAR(255) NOT NULL,
+    fingerprint CHAR(64) NOT NULL,
+    byte_offset BIGINT NOT NULL DEFAULT 0,
+    line_no BIGINT NOT NULL DEFAULT 0,
+    orders_imported BIGINT NOT NULL DEFAULT 0,
+    lines_imported BIGINT NOT NULL DEFAULT 0,
+    orders_rejected BIGINT NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT pk_order_import_checkpoints PRIMARY KEY (source)
+);
@@ -0,0 +1,15 @@
+-- =============================================
+-- 0008: Indexed low-stock tracking (rollback)
+-- =============================================
+-- ProductRepository falls back to evaluating qty <= reorder_level when
+-- is_low_stock does not exist.
+
+DROP TRIGGER IF EXISTS after_stock_update_low_event;
+DROP TRIGGER IF EXISTS after_stock_insert_low_event;
+
+DROP TABLE IF EXISTS low_stock_views;
+DROP TABLE IF EXISTS low_stock_events;
+
+ALTER TABLE warehouse_products
+    DROP INDEX idx_wp_low_stock,
+    DROP COLUMN is_low_stock;
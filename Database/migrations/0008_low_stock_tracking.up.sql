@@ -0,0 +1,65 @@
+-- =============================================
+-- 0008: Indexed low-stock tracking
+-- =============================================
+-- qty <= reorder_level compares two columns, so every low-stock count and
+-- listing had to evaluate it on each warehouse_products row. The stored
+-- generated column is_low_stock holds the result and is indexed together
+-- with qty, so ProductRepository reads the low-stock rows directly, lowest
+-- stock first. Adding a stored column rebuilds the table once.
+--
+-- low_stock_events is a change feed: the warehouse_products triggers
+-- append a LOW event when a row drops to its reorder level and a
+-- RESTOCKED event when it rises above it. low_stock_views records the
+-- last event each person has seen, so the dashboard can flag the items
+-- that went low since their last look. Rows removed by ON DELETE CASCADE
+-- do not fire triggers; their events simply no longer join to a stock row.
+
+ALTER TABLE warehouse_products
+    ADD COLUMN is_low_stock BOOLEAN AS (IFNULL(qty <= reorder_level, FALSE)) STORED NOT NULL,
+    ADD INDEX idx_wp_low_stock (is_low_stock, qty);
+
+CREATE TABLE low_stock_events (
+    event_id BIGINT AUTO_INCREMENT,
+    warehouse_id INT NOT NULL,
+    product_id INT NOT NULL,
+    event_type ENUM('LOW', 'RESTOCKED') NOT NULL,
+    qty INT NOT NULL,
+    reorder_level INT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT pk_low_stock_events PRIMARY KEY (event_id),
+    INDEX idx_low_stock_events_item (warehouse_id, product_id, event_id)
+);
+
+CREATE TABLE low_stock_views (
+    person_id INT NOT NULL,
+    last_event_id BIGINT NOT NULL DEFAULT 0,
+    viewed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT pk_low_stock_views PRIMARY KEY (person_id),
+    CONSTRAINT fk_low_stock_views_person FOREIGN KEY (person_id) REFERENCES person (person_id) ON DELETE CASCADE
+);
+
+DELIMITER //
+
+CREATE TRIGGER after_stock_insert_low_event
+AFTER INSERT ON warehouse_products
+FOR EACH ROW
+BEGIN
+    IF IFNULL(NEW.qty <= NEW.reorder_level, 0) THEN
+        INSERT INTO low_stock_events (warehouse_id, product_id, event_type, qty, reorder_level)
+        VALUES (NEW.warehouse_id, NEW.product_id, 'LOW', NEW.qty, NEW.reorder_level);
+    END IF;
+END//
+
+CREATE TRIGGER after_stock_update_low_event
+AFTER UPDATE ON warehouse_products
+FOR EACH ROW
+BEGIN
+    IF IFNULL(NEW.qty <= NEW.reorder_level, 0) <> IFNULL(OLD.qty <= OLD.reorder_level, 0) THEN
+        INSERT INTO low_stock_events (warehouse_id, product_id, event_type, qty, reorder_level)
+        VALUES (NEW.warehouse_id, NEW.product_id,
+                IF(IFNULL(NEW.qty <= NEW.reorder_level, 0), 'LOW', 'RESTOCKED'),
+                NEW.qty, NEW.reorder_level);
+    END IF;
+END//
+
+DELIMITER ;
@@ -0,0 +1,8 @@
+-- =============================================
+-- 0009: Stock change timestamps (rollback)
+-- =============================================
+-- The product picker falls back to reloading its whole index.
+
+ALTER TABLE warehouse_products
+    DROP INDEX idx_wp_updated_at,
+    DROP COLUMN updated_at;
@@ -0,0 +1,11 @@
+-- =============================================
+-- 0009: Stock change timestamps
+-- =============================================
+-- The order dialog's product picker keeps an in-memory index of in-stock
+-- products (models/product_index.py). With updated_at it refreshes that
+-- index from the stock rows changed since its last load instead of
+-- reading every warehouse_products row again.
+
+ALTER TABLE warehouse_products
+    ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD INDEX idx_wp_updated_at (updated_at);
@@ -0,0 +1,4 @@
+"""
+Database benchmarks. Run them against a development database, never
+production: they change schema objects for the duration of a run.
+"""
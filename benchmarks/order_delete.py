@@ -0,0 +1,191 @@
+"""
+Order Delete Benchmark
+
+Compares two ways of deleting large orders and returning their stock:
+
+    per-line    the old OrderView path: one stock UPDATE per line, then
+                DELETE of the lines (the order_items triggers run for
+                every row) and of the header
+    set-based   OrderService.delete_orders: one grouped UPDATE ... JOIN
+                returns the stock of all orders, one DELETE removes the
+                headers and their lines cascade without firing triggers
+
+Each run places the orders through OrderService, deletes them with one
+variant in a single transaction and checks that the stock is back where
+it started. Before migration 0006 the triggers also return the stock of
+deleted lines, so the per-line path returns it twice (reported as a
+mismatch).
+
+The benchmark creates its own products and stock rows and deletes them
+when it finishes.
+
+Usage:
+    python -m benchmarks.order_delete [--lines 10000] [--orders 1] [--repeat 3]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks.stock_contention import party
+from config.database import get_db_connection
+from services.order_service import OrderService
+
+
+def create_stock(conn, rows, stock):
+    """
+    Create benchmark products stocked in the first warehouse.
+
+    Returns:
+        list: [(warehouse_id, product_id), ...]
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT warehouse_id FROM warehouses ORDER BY warehouse_id LIMIT 1")
+        warehouse = cursor.fetchone()
+        if warehouse is None:
+            raise RuntimeError("Need at least one warehouse")
+        stamp = int(time.time())
+        keys = []
+        for n in range(rows):
+            cursor.execute("""
+                INSERT INTO products (product_name, product_type, unit_price, description)
+                VALUES (%s, 'Benchmark', 1.00, 'Created by benchmarks.order_delete')
+            """, (f"Delete benchmark {stamp}-{n}",))
+            keys.append((warehouse['warehouse_id'], cursor.lastrowid))
+        cursor.executemany("""
+            INSERT INTO warehouse_products (warehouse_id, product_id, qty, reorder_level)
+            VALUES (%s, %s, %s, 0)
+        """, [(*key, stock) for key in keys])
+    conn.commit()
+    return keys
+
+
+def read_stock(conn, keys):
+    """Get the current qty of the benchmark stock rows."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT warehouse_id, product_id, qty FROM warehouse_products
+            WHERE product_id IN ({', '.join(['%s'] * len(keys))})
+        """, [product_id for _, product_id in keys])
+        stock = {(row['warehouse_id'], row['product_id']): row['qty'] for row in cursor.fetchall()}
+    conn.commit()
+    return stock
+
+
+def place_orders(service, customer_id, salesman_id, keys, orders, lines):
+    """
+    Place orders of single-unit lines spread over the stock rows.
+
+    Returns:
+        list: New order_ids
+    """
+    order_ids = []
+    for _ in range(orders):
+        items = [{'warehouse_id': keys[i % len(keys)][0], 'product_id': keys[i % len(keys)][1],
+                  'qty': 1, 'unit_price': 1.0} for i in range(lines)]
+        order_id, error = service.create_order(customer_id, salesman_id, items)
+        if error:
+            raise RuntimeError(f"Could not place a benchmark order: {error}")
+        order_ids.append(order_id)
+    return order_ids
+
+
+def delete_per_line(conn, order_ids):
+    """Delete orders the way OrderView did before OrderService.delete_orders."""
+    try:
+        with conn.cursor() as cursor:
+            conn.begin()
+            for order_id in order_ids:
+                cursor.execute("SELECT warehouse_id, product_id, qty FROM order_items WHERE order_id = %s",
+                               (order_id,))
+                for item in cursor.fetchall():
+                    cursor.execute(
+                        "UPDATE warehouse_products SET qty = qty + %s WHERE warehouse_id = %s AND product_id = %s",
+                        (item['qty'], item['warehouse_id'], item['product_id'])
+                    )
+                cursor.execute("DELETE FROM order_items WHERE order_id = %s", (order_id,))
+                cursor.execute("DELETE FROM orders_m WHERE order_id = %s", (order_id,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def delete_set_based(conn, order_ids):
+    """Delete orders through OrderService."""
+    deleted, error = OrderService().delete_orders(order_ids)
+    if error:
+        raise RuntimeError(error)
+    if deleted != len(order_ids):
+        raise RuntimeError(f"Deleted {deleted} of {len(order_ids)} orders")
+
+
+VARIANTS = {'per-line': delete_per_line, 'set-based': delete_set_based}
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Order delete benchmark")
+    parser.add_argument('--lines', type=int, default=10000, help="lines per order")
+    parser.add_argument('--orders', type=int, default=1, help="orders deleted together")
+    parser.add_argument('--rows', type=int, default=50, help="stock rows the lines are spread over")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per variant (median reported)")
+    args = parser.parse_args(argv)
+
+    conn = get_db_connection()
+    keys = create_stock(conn, args.rows, args.lines * args.orders)
+    service = OrderService()
+    order_ids = []
+    try:
+        customer_id, salesman_id = party(conn)
+        results = {}
+        for variant, delete in VARIANTS.items():
+            runs = []
+            consistent = True
+            for _ in range(args.repeat):
+                before = read_stock(conn, keys)
+                order_ids = place_orders(service, customer_id, salesman_id, keys,
+                                         args.orders, args.lines)
+                started = time.perf_counter()
+                delete(conn, order_ids)
+                runs.append(time.perf_counter() - started)
+                order_ids = []
+
+                after = read_stock(conn, keys)
+                if after != before:
+                    consistent = False
+                    # Start the next run from the original stock
+                    with conn.cursor() as cursor:
+                        cursor.executemany(
+                            "UPDATE warehouse_products SET qty = %s WHERE warehouse_id = %s AND product_id = %s",
+                            [(qty, *key) for key, qty in before.items()]
+                        )
+                    conn.commit()
+            results[variant] = statistics.median(runs), consistent
+
+        lines = args.lines * args.orders
+        print(f"Orders: {args.orders} x {args.lines} lines over {len(keys)} stock rows")
+        for variant, (seconds, consistent) in results.items():
+            print(f"  {variant:>10}: {seconds * 1000:9.1f} ms  {lines / seconds:9.0f} lines/s  "
+                  f"stock {'ok' if consistent else 'MISMATCH'}")
+        speedup = results['per-line'][0] / results['set-based'][0]
+        print(f"  speedup: {speedup:.1f}x")
+        return 0 if results['set-based'][1] else 1
+
+    finally:
+        with conn.cursor() as cursor:
+            if order_ids:
+                cursor.execute(
+                    f"DELETE FROM orders_m WHERE order_id IN ({', '.join(['%s'] * len(order_ids))})",
+                    order_ids
+                )
+            cursor.execute(
+                f"DELETE FROM products WHERE product_id IN ({', '.join(['%s'] * len(keys))})",
+                [product_id for _, product_id in keys]
+            )
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Order Totals Benchmark
+
+Compares order line insert throughput under the two versions of the
+order_items triggers:
+
+    recompute    schema.sql: every row recomputes SUM(qty * unit_price)
+                 over the whole order (O(n^2) for an n-line order)
+    incremental  migration 0005: every row adds its own amount
+
+Each run inserts one order of 10, 100 and 1000 lines with a single batched
+INSERT, exactly as OrderService does, and rolls it back. The trigger
+versions are installed from the 0005 migration files for the run; the
+triggers matching the recorded migration state are put back afterwards.
+
+Usage:
+    python -m benchmarks.order_totals [--sizes 10 100 1000] [--repeat 3]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from config.database import get_db_connection
+from services.migration_service import MigrationService, MigrationError
+
+VERSION = 5
+VARIANTS = {'recompute': 'down', 'incremental': 'up'}
+
+_INSERT_LINE = """
+    INSERT INTO order_items (order_id, warehouse_id, product_id, qty, unit_price)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+def trigger_statements(service, direction, version=VERSION):
+    """
+    Get the trigger DDL of a migration for one direction.
+
+    Args:
+        service: MigrationService used to locate the migration files
+        direction: 'up' or 'down' (for 0005: incremental or recompute)
+        version: Migration version
+
+    Returns:
+        list: DROP / CREATE TRIGGER statements (data fix-ups are skipped)
+    """
+    for migration in service.discover():
+        if migration.version == version:
+            return [statement for statement in migration.statements(direction)
+                    if statement.upper().startswith(('DROP TRIGGER', 'CREATE TRIGGER'))]
+    raise MigrationError(f"Migration {version:04d} not found")
+
+
+def current_triggers(service):
+    """
+    Get the DDL that recreates the order_items triggers of the recorded
+    migration state (0006 replaced the 0005 versions).
+    """
+    applied = {entry['version'] for entry in service.get_status() if entry['applied']}
+    for version in (6, VERSION):
+        if version in applied:
+            return trigger_statements(service, 'up', version)
+    return trigger_statements(service, 'down')
+
+
+def install(conn, statements):
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    conn.commit()
+
+
+def fixtures(conn, stock_rows=20):
+    """Pick a customer, a salesman and some stock rows to order from."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT customer_id FROM customers ORDER BY customer_id LIMIT 1")
+        customer = cursor.fetchone()
+        cursor.execute("SELECT person_id FROM salesman ORDER BY person_id LIMIT 1")
+        salesman = cursor.fetchone()
+        cursor.execute("""
+            SELECT warehouse_id, product_id FROM warehouse_products
+            ORDER BY warehouse_id, product_id LIMIT %s
+        """, (stock_rows,))
+        stock = [(row['warehouse_id'], row['product_id']) for row in cursor.fetchall()]
+    conn.commit()
+    if not (customer and salesman and stock):
+        raise RuntimeError("Need at least one customer, salesman and stock row")
+    return customer['customer_id'], salesman['person_id'], stock
+
+
+def time_order(conn, customer_id, salesman_id, stock, lines):
+    """
+    Insert one order of the given size and roll it back.
+
+    Returns:
+        float: Seconds spent in the line INSERT (triggers included)
+    """
+    rows_per_stock = lines // len(stock) + 1
+    try:
+        with conn.cursor() as cursor:
+            conn.begin()
+            # Enough stock for every line, undone by the rollback
+            cursor.executemany(
+                "UPDATE warehouse_products SET qty = qty + %s WHERE warehouse_id = %s AND product_id = %s",
+                [(rows_per_stock, wid, pid) for wid, pid in stock]
+            )
+            cursor.execute("""
+                INSERT INTO orders_m (customer_id, salesman_id, total_amount, status, order_date)
+                VALUES (%s, %s, 0, 'PENDING', CURDATE())
+            """, (customer_id, salesman_id))
+            order_id = cursor.lastrowid
+            params = [(order_id, *stock[i % len(stock)], 1, 1.25) for i in range(lines)]
+
+            started = time.perf_counter()
+            cursor.executemany(_INSERT_LINE, params)
+            elapsed = time.perf_counter() - started
+
+            cursor.execute("SELECT total_amount FROM orders_m WHERE order_id = %s", (order_id,))
+            total = float(cursor.fetchone()['total_amount'])
+            if abs(total - lines * 1.25) > 0.005:
+                raise RuntimeError(f"Order total {total} != {lines * 1.25}")
+            return elapsed
+    finally:
+        conn.rollback()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Order total trigger benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help="order sizes in lines")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per size (median reported)")
+    args = parser.parse_args(argv)
+
+    service = MigrationService()
+    restore = current_triggers(service)
+    conn = get_db_connection()
+    results = {}
+    try:
+        customer_id, salesman_id, stock = fixtures(conn)
+        for variant, direction in VARIANTS.items():
+            install(conn, trigger_statements(service, direction))
+            for lines in args.sizes:
+                runs = [time_order(conn, customer_id, salesman_id, stock, lines)
+                        for _ in range(args.repeat)]
+                results[variant, lines] = statistics.median(runs)
+    finally:
+        install(conn, restore)
+        conn.close()
+
+    print(f"{'lines':>6}  " + "  ".join(f"{name:>22}" for name in VARIANTS) + "  speedup")
+    for lines in args.sizes:
+        cells = []
+        for variant in VARIANTS:
+            seconds = results[variant, lines]
+            cells.append(f"{seconds * 1000:9.1f} ms {lines / seconds:7.0f}/s")
+        speedup = results['recompute', lines] / results['incremental', lines]
+        print(f"{lines:>6}  " + "  ".join(f"{cell:>22}" for cell in cells) + f"  {speedup:6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
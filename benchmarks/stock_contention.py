@@ -0,0 +1,177 @@
+"""
+Stock Contention Benchmark
+
+Stress test for InventoryService: several threads place orders through
+OrderService against the same few "hot" stock rows until the stock runs
+out, then the benchmark checks that nothing was oversold (stock taken ==
+quantities ordered, no row below zero) and reports orders/sec, rejected
+orders and deadlock retries.
+
+Orders pick their lines from the hot rows in random order, so without the
+key-ordered locking concurrent orders would deadlock constantly.
+
+The benchmark creates its own product and stock rows and deletes them, and
+the orders it placed, when it finishes.
+
+Usage:
+    python -m benchmarks.stock_contention [--threads 8] [--stock 500] [--rows 3]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from config.database import get_db_connection
+from services.order_service import OrderService
+
+_MAX_LINE_QTY = 5
+
+
+def create_stock(conn, rows, stock):
+    """
+    Create a benchmark product stocked in the first rows warehouses.
+
+    Returns:
+        tuple: (product_id, [(warehouse_id, product_id), ...])
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT warehouse_id FROM warehouses ORDER BY warehouse_id LIMIT %s", (rows,))
+        warehouses = [row['warehouse_id'] for row in cursor.fetchall()]
+        if len(warehouses) < rows:
+            raise RuntimeError(f"Need {rows} warehouses, found {len(warehouses)}")
+        cursor.execute("""
+            INSERT INTO products (product_name, product_type, unit_price, description)
+            VALUES (%s, 'Benchmark', 1.00, 'Created by benchmarks.stock_contention')
+        """, (f"Contention benchmark {int(time.time())}",))
+        product_id = cursor.lastrowid
+        cursor.executemany("""
+            INSERT INTO warehouse_products (warehouse_id, product_id, qty, reorder_level)
+            VALUES (%s, %s, %s, 0)
+        """, [(warehouse_id, product_id, stock) for warehouse_id in warehouses])
+    conn.commit()
+    return product_id, [(warehouse_id, product_id) for warehouse_id in warehouses]
+
+
+def party(conn):
+    """Pick a customer and a salesman for the orders."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT customer_id FROM customers ORDER BY customer_id LIMIT 1")
+        customer = cursor.fetchone()
+        cursor.execute("SELECT person_id FROM salesman ORDER BY person_id LIMIT 1")
+        salesman = cursor.fetchone()
+    conn.commit()
+    if not (customer and salesman):
+        raise RuntimeError("Need at least one customer and one salesman")
+    return customer['customer_id'], salesman['person_id']
+
+
+class Salesman(threading.Thread):
+    """Places random orders until the hot rows cannot fill one any more."""
+
+    def __init__(self, keys, customer_id, salesman_id, start_gate):
+        super().__init__(daemon=True)
+        self.keys = keys
+        self.customer_id = customer_id
+        self.salesman_id = salesman_id
+        self.start_gate = start_gate
+        self.service = OrderService()
+        self.placed = []       # (order_id, {key: qty})
+        self.rejected = 0
+        self.errors = []
+
+    def run(self):
+        rng = random.Random()
+        self.start_gate.wait()
+        misses = 0
+        # Single-unit orders still fit while any row has stock left
+        while misses < 3 * len(self.keys):
+            lines = rng.sample(self.keys, rng.randint(1, len(self.keys)))
+            if misses:
+                lines, qty_range = lines[:1], (1, 1)
+            else:
+                qty_range = (1, _MAX_LINE_QTY)
+            items = [{'warehouse_id': key[0], 'product_id': key[1],
+                      'qty': rng.randint(*qty_range), 'unit_price': 1.0} for key in lines]
+            order_id, error = self.service.create_order(self.customer_id, self.salesman_id, items)
+            if order_id:
+                misses = 0
+                self.placed.append((order_id, {(i['warehouse_id'], i['product_id']): i['qty'] for i in items}))
+            elif error.startswith("Insufficient stock"):
+                self.rejected += 1
+                misses += 1
+            else:
+                self.errors.append(error)
+                return
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Concurrent stock reservation benchmark")
+    parser.add_argument('--threads', type=int, default=8, help="concurrent salesmen")
+    parser.add_argument('--stock', type=int, default=500, help="starting qty per hot row")
+    parser.add_argument('--rows', type=int, default=3, help="hot stock rows (warehouses)")
+    args = parser.parse_args(argv)
+
+    conn = get_db_connection()
+    product_id, keys = create_stock(conn, args.rows, args.stock)
+    workers = []
+    try:
+        customer_id, salesman_id = party(conn)
+        gate = threading.Event()
+        workers = [Salesman(keys, customer_id, salesman_id, gate) for _ in range(args.threads)]
+        for worker in workers:
+            worker.start()
+        started = time.perf_counter()
+        gate.set()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        ordered = {key: 0 for key in keys}
+        for worker in workers:
+            for _, lines in worker.placed:
+                for key, qty in lines.items():
+                    ordered[key] += qty
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT warehouse_id, qty FROM warehouse_products WHERE product_id = %s",
+                           (product_id,))
+            remaining = {(row['warehouse_id'], product_id): row['qty'] for row in cursor.fetchall()}
+        conn.commit()
+
+        orders = sum(len(worker.placed) for worker in workers)
+        print(f"Threads: {args.threads}  hot rows: {len(keys)}  stock per row: {args.stock}")
+        print(f"Orders placed: {orders} in {elapsed:.2f} s ({orders / elapsed:.1f} orders/sec)")
+        print(f"Rejected (insufficient stock): {sum(worker.rejected for worker in workers)}")
+        print(f"Deadlock / lock wait retries: {sum(worker.service.inventory.retries for worker in workers)}")
+
+        ok = True
+        for key in keys:
+            taken = args.stock - remaining[key]
+            status = "ok" if taken == ordered[key] and remaining[key] >= 0 else "MISMATCH"
+            ok = ok and status == "ok"
+            print(f"  warehouse {key[0]}: ordered {ordered[key]}, taken {taken}, "
+                  f"left {remaining[key]}  {status}")
+        for worker in workers:
+            for error in worker.errors:
+                ok = False
+                print(f"  error: {error}")
+        print("No overselling" if ok else "STOCK INCONSISTENT")
+        return 0 if ok else 1
+
+    finally:
+        order_ids = [order_id for worker in workers for order_id, _ in worker.placed]
+        with conn.cursor() as cursor:
+            for start in range(0, len(order_ids), 500):
+                chunk = order_ids[start:start + 500]
+                cursor.execute(
+                    f"DELETE FROM orders_m WHERE order_id IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+            cursor.execute("DELETE FROM products WHERE product_id = %s", (product_id,))
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
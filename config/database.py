@@ -1,7 +1,14 @@
 """
 Database Configuration and Connection Management
+
+Connections are served from a bounded, thread-safe pool. Callers keep using
+``get_db_connection()`` / ``conn.close()`` exactly as before: ``close()`` on a
+pooled connection hands it back to the pool instead of tearing down the
+socket, so repeated short queries no longer pay the TCP + auth handshake.
 """
 import os
+import threading
+import time
 import pymysql
 from dotenv import load_dotenv
 
@@ -17,27 +24,385 @@ DB_CONFIG = {
     'charset': 'utf8mb4'
 }
 
+# Connection pool configuration from environment
+POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+    'idle_timeout': float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),   # seconds
+    'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),  # seconds
+    'checkout_timeout': float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '10')),  # seconds
+}
 
-def get_db_connection():
+# Statements slower than this are written to the slow query log (0 disables)
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '500'))
+
+# Default search mode for repositories: 'like', or 'fulltext' once
+# migration 0002 has added the FULLTEXT indexes
+SEARCH_MODE = os.getenv('DB_SEARCH_MODE', 'like').lower()
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
     """
-    Create and return a database connection.
+    Raised when no pooled connection becomes available in time.
     
-    Returns:
-        pymysql.Connection: Database connection with DictCursor
-        
-    Raises:
-        pymysql.Error: If connection fails
+    Carries no MySQL error code (args is just the message), so handlers
+    that reconnect or retry on server error codes do not mistake a busy
+    pool for a lost connection; match on the class instead.
     """
+    pass
+
+
+def _create_raw_connection():
+    """Open a new physical connection with DictCursor."""
     return pymysql.connect(
         **DB_CONFIG,
         cursorclass=pymysql.cursors.DictCursor
     )
 
 
+class PooledConnection:
+    """
+    Thin proxy around a pymysql connection borrowed from a ConnectionPool.
+
+    Everything except ``close()`` is delegated to the real connection.
+    ``close()`` returns the connection to the pool; ``invalidate()`` drops it
+    (use when the connection is left in an unknown state).
+    """
+
+    def __init__(self, pool, conn, created_at):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+        self._released = False
+
+    @property
+    def raw(self):
+        """Underlying pymysql connection."""
+        return self._conn
+
+    def close(self):
+        """Return the connection to the pool (safe to call twice)."""
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._conn, self._created_at)
+
+    def invalidate(self):
+        """Close the physical connection and free its pool slot."""
+        if self._released:
+            return
+        self._released = True
+        self._pool._discard(self._conn)
+
+    def __getattr__(self, name):
+        if self._released:
+            raise pymysql.err.InterfaceError(0, "Connection already returned to pool")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for callers that forget close() on an error path:
+        # the slot is reclaimed instead of leaking until the pool is exhausted.
+        if not getattr(self, '_released', True):
+            self._released = True
+            self._pool._discard(self._conn)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of pymysql connections.
+
+    - ``min_size`` connections are kept warm once the pool is first used
+    - at most ``max_size`` connections exist at any time; extra borrowers wait
+      up to ``checkout_timeout`` seconds
+    - idle connections older than ``idle_timeout`` (above ``min_size``) and any
+      connection older than ``max_lifetime`` are closed instead of reused
+    - every checkout pings the connection and replaces it if the server
+      dropped it
+
+    Usage:
+        pool = ConnectionPool(max_size=5)
+        conn = pool.get_connection()
+        try:
+            ...
+        finally:
+            conn.close()  # back to the pool
+    """
+
+    def __init__(self, min_size=1, max_size=10, idle_timeout=300,
+                 max_lifetime=3600, checkout_timeout=10, connect_func=None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect_func or _create_raw_connection
+
+        self._lock = threading.Condition(threading.RLock())
+        self._idle = []          # list of (conn, created_at, released_at), LIFO
+        self._size = 0           # open physical connections (idle + borrowed)
+        self._warmed = False
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'creations': 0,
+            'closed_idle': 0,
+            'closed_expired': 0,
+            'closed_broken': 0,
+            'timeouts': 0,
+        }
+
+    def get_connection(self):
+        """
+        Borrow a connection from the pool.
+
+        Returns:
+            PooledConnection: Proxy whose close() returns it to the pool
+
+        Raises:
+            PoolTimeoutError: If the pool stays exhausted for checkout_timeout
+            pymysql.Error: If a new connection cannot be opened
+        """
+        self._warm_up()
+        deadline = None
+
+        while True:
+            candidate = None
+            create = False
+
+            with self._lock:
+                expired = self._evict_stale()
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + self.checkout_timeout
+                        self._stats['waits'] += 1
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Connection pool exhausted ({self.max_size} in use)"
+                        )
+                    started = time.monotonic()
+                    self._lock.wait(remaining)
+                    self._stats['wait_time'] += time.monotonic() - started
+                    continue
+
+            for conn in expired:
+                self._close_quietly(conn)
+
+            if create:
+                conn, created_at = self._open()
+                return self._checkout(conn, created_at)
+
+            conn, created_at, _ = candidate
+            if self._is_alive(conn):
+                return self._checkout(conn, created_at)
+
+            with self._lock:
+                self._stats['closed_broken'] += 1
+            self._discard(conn)
+
+    def get_stats(self):
+        """
+        Snapshot of pool counters for monitoring.
+
+        Returns:
+            dict: checkouts, waits, creations, eviction counters and the
+                  current size / idle / in-use connection counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['max_size'] = self.max_size
+            return stats
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones close on return)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    # ---- internals -------------------------------------------------------
+
+    def _warm_up(self):
+        """Open min_size connections the first time the pool is used."""
+        if self._warmed:
+            return
+        with self._lock:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            try:
+                conn, created_at = self._open()
+            except Exception:
+                # Warm-up is best effort; the real checkout will surface errors
+                continue
+            with self._lock:
+                self._idle.append((conn, created_at, time.monotonic()))
+                self._lock.notify()
+
+    def _open(self):
+        """Open a physical connection for an already-reserved slot."""
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._stats['creations'] += 1
+        return conn, time.monotonic()
+
+    def _checkout(self, conn, created_at):
+        with self._lock:
+            self._stats['checkouts'] += 1
+        return PooledConnection(self, conn, created_at)
+
+    def _is_alive(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _evict_stale(self):
+        """
+        Drop idle connections past idle_timeout / max_lifetime (lock held).
+
+        Returns:
+            list: Evicted connections for the caller to close outside the lock
+        """
+        now = time.monotonic()
+        keep = []
+        expired = []
+        # Oldest first so the most recently used connections survive
+        for entry in self._idle:
+            conn, created_at, released_at = entry
+            if self.max_lifetime and now - created_at >= self.max_lifetime:
+                expired.append(entry)
+                self._stats['closed_expired'] += 1
+            elif (self.idle_timeout and now - released_at >= self.idle_timeout
+                    and self._size - len(expired) > self.min_size):
+                expired.append(entry)
+                self._stats['closed_idle'] += 1
+            else:
+                keep.append(entry)
+
+        if expired:
+            self._idle = keep
+            self._size -= len(expired)
+            self._lock.notify_all()
+        return [conn for conn, _, _ in expired]
+
+    def _release(self, conn, created_at):
+        """Take a connection back from a borrower."""
+        try:
+            # End any transaction the borrower left open so the next user
+            # does not inherit a stale REPEATABLE READ snapshot or locks.
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        if self.max_lifetime and time.monotonic() - created_at >= self.max_lifetime:
+            with self._lock:
+                self._stats['closed_expired'] += 1
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._lock.notify()
+
+    def _discard(self, conn):
+        """Close a connection and free its slot."""
+        self._close_quietly(conn)
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Get the process-wide ConnectionPool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**POOL_CONFIG)
+    return _pool
+
+
+def get_db_connection():
+    """
+    Borrow a database connection from the pool.
+
+    Callers must still call ``close()`` when done - it returns the connection
+    to the pool rather than closing the socket.
+
+    Returns:
+        PooledConnection: Pooled pymysql connection with DictCursor
+
+    Raises:
+        pymysql.Error: If connection fails or the pool is exhausted
+    """
+    return get_pool().get_connection()
+
+
+def get_pool_stats():
+    """
+    Get connection pool statistics for monitoring.
+
+    Returns:
+        dict: Pool counters (see ConnectionPool.get_stats)
+    """
+    return get_pool().get_stats()
+
+
+def close_pool():
+    """Close idle pooled connections (call on application shutdown)."""
+    if _pool is not None:
+        _pool.close_all()
+
+
 def test_connection():
     """
     Test database connectivity.
-    
+
     Returns:
         tuple: (bool success, str message)
     """
@@ -55,3 +420,4 @@ if __name__ == "__main__":
     # Test connection when run directly
     success, message = test_connection()
     print(message)
+    print(f"Pool stats: {get_pool_stats()}")
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.lookup_cache import invalidate_tables
 
 class CustomerDialog:
     def __init__(self, parent, mode='add', customer_data=None, current_user=None, db_connection_func=None):
@@ -221,6 +222,7 @@ class CustomerDialog:
                 """, (name, email, phone, address, salesman_id, department_id))
                 
                 conn.commit()
+                invalidate_tables('customers')
                 messagebox.showinfo("Success", f"Customer '{name}' added successfully!")
             
             else:  # Edit mode
@@ -234,6 +236,7 @@ class CustomerDialog:
                 """, (name, email, phone, address, customer_id))
                 
                 conn.commit()
+                invalidate_tables('customers')
                 messagebox.showinfo("Success", f"Customer '{name}' updated successfully!")
             
             conn.close()
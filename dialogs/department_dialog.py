@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.department_repository import DepartmentRepository
+from models.employee_repository import EmployeeRepository
+from models.lookup_cache import invalidate_tables
 
 class DepartmentDialog:
     def __init__(self, parent, mode='add', department_data=None, db_connection_func=None):
@@ -148,13 +151,9 @@ class DepartmentDialog:
         return combo
     
     def get_locations(self):
-        """Fetch locations from database"""
+        """Fetch locations (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT location_id, location_name FROM locations ORDER BY location_name")
-            locations = cursor.fetchall()
-            conn.close()
+            locations = DepartmentRepository().get_locations()
             return [(loc['location_name'], loc['location_id']) for loc in locations]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load locations: {e}")
@@ -163,32 +162,12 @@ class DepartmentDialog:
     def get_available_hods(self):
         """Fetch available HODs (not already assigned to other departments)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             # Get HODs not assigned to any department, or assigned to current department (in edit mode)
+            current_hod_id = None
             if self.mode == 'edit' and 'department_id' in self.department_data:
-                cursor.execute("""
-                    SELECT p.person_id, p.name 
-                    FROM person p
-                    JOIN hod h ON p.person_id = h.person_id
-                    WHERE p.is_active = TRUE 
-                    AND (p.person_id NOT IN (SELECT hod_id FROM departments WHERE hod_id IS NOT NULL)
-                         OR p.person_id = %s)
-                    ORDER BY p.name
-                """, (self.department_data.get('hod_id'),))
-            else:
-                cursor.execute("""
-                    SELECT p.person_id, p.name 
-                    FROM person p
-                    JOIN hod h ON p.person_id = h.person_id
-                    WHERE p.is_active = TRUE 
-                    AND p.person_id NOT IN (SELECT hod_id FROM departments WHERE hod_id IS NOT NULL)
-                    ORDER BY p.name
-                """)
+                current_hod_id = self.department_data.get('hod_id')
             
-            hods = cursor.fetchall()
-            conn.close()
+            hods = EmployeeRepository().get_available_hods(current_hod_id)
             return [("None", None)] + [(hod['name'], hod['person_id']) for hod in hods]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load HODs: {e}")
@@ -270,6 +249,7 @@ class DepartmentDialog:
                 """, (dept_name, location_id, hod_id))
                 
                 conn.commit()
+                invalidate_tables('departments')
                 messagebox.showinfo("Success", f"Department '{dept_name}' added successfully!")
             
             else:  # Edit mode
@@ -282,7 +262,10 @@ class DepartmentDialog:
                     WHERE department_id = %s
                 """, (dept_name, location_id, hod_id, dept_id))
                 
+                # Members show the department name in the employee directory
+                EmployeeRepository.refresh_directory_on(cursor, department_id=dept_id)
                 conn.commit()
+                invalidate_tables('departments', 'employee_directory')
                 messagebox.showinfo("Success", f"Department '{dept_name}' updated successfully!")
             
             conn.close()
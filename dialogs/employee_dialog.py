@@ -2,6 +2,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
 from services.auth_service import AuthService
+from models.department_repository import DepartmentRepository
+from models.employee_repository import EmployeeRepository
+from models.lookup_cache import invalidate_tables
 import re
 from datetime import datetime
 
@@ -271,32 +274,18 @@ class EmployeeDialog:
         # Note: supervisor dropdown management would go here
     
     def get_departments(self):
-        """Fetch departments from database"""
+        """Fetch departments (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT department_id, department_name FROM departments ORDER BY department_name")
-            depts = cursor.fetchall()
-            conn.close()
+            depts = DepartmentRepository().get_departments()
             return [(d['department_name'], d['department_id']) for d in depts]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load departments: {e}")
             return []
     
     def get_supervisors(self):
-        """Fetch supervisors from database"""
+        """Fetch active supervisors (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT p.person_id, p.name 
-                FROM person p
-                JOIN supervisor s ON p.person_id = s.person_id
-                WHERE p.is_active = TRUE
-                ORDER BY p.name
-            """)
-            supervisors = cursor.fetchall()
-            conn.close()
+            supervisors = EmployeeRepository().get_supervisors()
             return [("None", None)] + [(s['name'], s['person_id']) for s in supervisors]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load supervisors: {e}")
@@ -507,7 +496,10 @@ class EmployeeDialog:
                                 (person_id, supervisor_id)
                             )
                 
+                EmployeeRepository.refresh_directory_on(cursor, person_id)
                 conn.commit()
+                invalidate_tables('person', 'hod', 'supervisor', 'salesman',
+                                  'general_employee', 'emp_supervisor', 'employee_directory')
                 messagebox.showinfo("Success", f"Employee '{person_data['name']}' added successfully!")
             
             else:  # Edit mode
@@ -567,7 +559,10 @@ class EmployeeDialog:
                             (person_id, supervisor_id)
                         )
 
+                EmployeeRepository.refresh_directory_on(cursor, person_id)
                 conn.commit()
+                invalidate_tables('person', 'hod', 'supervisor', 'salesman',
+                                  'general_employee', 'emp_supervisor', 'employee_directory')
                 messagebox.showinfo("Success", f"Employee '{person_data['name']}' updated successfully!")
             
             conn.close()
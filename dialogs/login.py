@@ -1,12 +1,13 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 import os
 import sys
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.startup_profiler import after_first_paint
+
 class LoginWindow:
     def __init__(self, root, on_login_success):
         self.root = root
@@ -91,7 +92,9 @@ class LoginWindow:
         right_panel = tk.Frame(main_container, bg="#f1f5f9")
         right_panel.place(relx=0.4, rely=0, relwidth=0.6, relheight=1)
         
-        self.load_background_image(right_panel)
+        # The side image needs PIL and a resize; draw it once the form is
+        # visible so it does not delay the first paint
+        after_first_paint(self.root, lambda: self.load_background_image(right_panel))
         
         # Bind Enter key
         self.root.bind('<Return>', lambda e: self.login_action())
@@ -104,7 +107,11 @@ class LoginWindow:
 
     def load_background_image(self, parent):
         """Load and display the side image"""
+        if not parent.winfo_exists():
+            return
         try:
+            from PIL import Image, ImageTk
+            
             # Try loading the new NovaFlow asset
             image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Images", "novaflow_login.png")
             
@@ -1,6 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.customer_repository import CustomerRepository
+from models.product_index import product_index
+from services.order_service import OrderService
+from utils.background_executor import get_executor
 from datetime import datetime
 
 class OrderDialog:
@@ -26,7 +30,7 @@ class OrderDialog:
         self.dialog.title(f"{'New' if mode == 'add' else 'Edit'} Order")
         
         # Geometry
-        width, height = 900, 600
+        width, height = 900, 680
         self.dialog.geometry(f"{width}x{height}")
         self.dialog.configure(bg='#f0f0f0')
         self.dialog.grab_set()
@@ -89,11 +93,21 @@ class OrderDialog:
         tk.Frame(left, height=2, bg='#e5e7eb').pack(fill='x', pady=10)
         tk.Label(left, text="Add Item", font=('Segoe UI', 11, 'bold'), bg='white').pack(anchor='w', pady=(0, 10))
         
-        # Product Selection (from Stock)
-        tk.Label(left, text="Select Product (from Warehouse) *", bg='white').pack(anchor='w')
+        # Product Selection (from Stock): type to search, pick from the matches
+        tk.Label(left, text="Search Product (name, type or warehouse) *", bg='white').pack(anchor='w')
         self.product_var = tk.StringVar()
-        self.product_cb = ttk.Combobox(left, textvariable=self.product_var, state='readonly', width=35)
-        self.product_cb.pack(fill='x', pady=(5, 10))
+        self.selected_product = None
+        self.product_entry = tk.Entry(left, textvariable=self.product_var, width=38)
+        self.product_entry.pack(fill='x', pady=(5, 2))
+        self.product_list = tk.Listbox(left, height=6, activestyle='none', exportselection=False)
+        self.product_list.pack(fill='x', pady=(0, 10))
+        self.product_matches = []
+        
+        self.product_var.trace_add('write', lambda *args: self.search_products())
+        self.product_entry.bind('<Down>', self.focus_product_list)
+        self.product_entry.bind('<Return>', lambda e: self.pick_product(0, focus=True))
+        self.product_list.bind('<<ListboxSelect>>', lambda e: self.pick_product())
+        self.product_list.bind('<Return>', lambda e: self.pick_product(focus=True))
         self.load_available_products()
         
         # Quantity
@@ -152,11 +166,7 @@ class OrderDialog:
 
     def load_customers(self):
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT customer_id, name FROM customers ORDER BY name")
-            custs = cursor.fetchall()
-            conn.close()
+            custs = CustomerRepository().get_customers()
             
             self.cust_map = {c['name']: c['customer_id'] for c in custs}
             self.customer_cb['values'] = list(self.cust_map.keys())
@@ -164,50 +174,68 @@ class OrderDialog:
             messagebox.showerror("Error", f"Failed to load customers: {e}")
 
     def load_available_products(self):
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Fetch products with available stock
-            cursor.execute("""
-                SELECT 
-                    wp.warehouse_id, wp.product_id, wp.qty,
-                    p.product_name, p.unit_price,
-                    w.warehouse_name
-                FROM warehouse_products wp
-                JOIN products p ON wp.product_id = p.product_id
-                JOIN warehouses w ON wp.warehouse_id = w.warehouse_id
-                WHERE wp.qty > 0
-                ORDER BY p.product_name
-            """)
-            products = cursor.fetchall()
-            conn.close()
-            
-            # Create mapping
-            self.prod_map = {}
-            display_list = []
-            
-            for p in products:
-                display = f"{p['product_name']} (${p['unit_price']}) - {p['warehouse_name']} [Qty: {p['qty']}]"
-                key = display
-                self.prod_map[key] = {
-                    'product_id': p['product_id'],
-                    'warehouse_id': p['warehouse_id'],
-                    'unit_price': p['unit_price'],
-                    'max_qty': p['qty'],
-                    'name': p['product_name'],
-                    'wh_name': p['warehouse_name']
-                }
-                display_list.append(display)
-            
-            self.product_cb['values'] = display_list
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load products: {e}")
+        """Load (or bring up to date) the shared product index in the background"""
+        self.search_products()
+        get_executor(self.dialog).submit(
+            ('order_dialog_products', id(self)), product_index.refresh,
+            on_success=lambda index: self.search_products(),
+            on_error=self.products_failed
+        )
+
+    def products_failed(self, error):
+        if self.dialog.winfo_exists():
+            messagebox.showerror("Error", f"Failed to load products: {error}", parent=self.dialog)
+
+    def search_products(self):
+        """Show the top matches for the search text"""
+        if not self.dialog.winfo_exists():
+            return
+        text = self.product_var.get()
+        if self.selected_product is not None and text == self.selected_product['display']:
+            return
+        self.selected_product = None
+        
+        self.product_list.delete(0, 'end')
+        if not product_index.ready:
+            self.product_matches = []
+            self.product_list.insert('end', "Loading products…")
+            return
+        
+        self.product_matches = product_index.search(text)
+        for entry in self.product_matches:
+            self.product_list.insert('end', entry['display'])
+        if not self.product_matches:
+            self.product_list.insert('end', "No products in stock match")
+
+    def focus_product_list(self, event=None):
+        if self.product_matches:
+            self.product_list.focus_set()
+            self.product_list.selection_clear(0, 'end')
+            self.product_list.selection_set(0)
+            self.product_list.activate(0)
+            self.pick_product(0)
+        return 'break'
+
+    def pick_product(self, index=None, focus=False):
+        """Select a match (the listbox selection, or the given row)"""
+        if index is None:
+            selection = self.product_list.curselection()
+            if not selection:
+                return
+            index = selection[0]
+        if index >= len(self.product_matches):
+            return
+        
+        self.selected_product = self.product_matches[index]
+        self.product_var.set(self.selected_product['display'])
+        if focus:
+            self.product_entry.icursor('end')
+            self.product_entry.focus_set()
+        return 'break'
 
     def add_item_to_list(self):
-        selection = self.product_var.get()
-        if not selection:
+        prod_info = self.selected_product
+        if prod_info is None:
             messagebox.showwarning("Input Error", "Please select a product.")
             return
         
@@ -217,10 +245,9 @@ class OrderDialog:
             return
         
         qty = int(qty_str)
-        prod_info = self.prod_map[selection]
         
-        if qty > prod_info['max_qty']:
-            messagebox.showwarning("Stock Error", f"Only {prod_info['max_qty']} items available in this warehouse.")
+        if qty > prod_info['qty']:
+            messagebox.showwarning("Stock Error", f"Only {prod_info['qty']} items available in this warehouse.")
             return
         
         subtotal = qty * prod_info['unit_price']
@@ -231,8 +258,8 @@ class OrderDialog:
             'warehouse_id': prod_info['warehouse_id'],
             'qty': qty,
             'unit_price': prod_info['unit_price'],
-            'name': prod_info['name'],
-            'wh_name': prod_info['wh_name'],
+            'name': prod_info['product_name'],
+            'wh_name': prod_info['warehouse_name'],
             'subtotal': subtotal
         }
         self.current_items.append(item_data)
@@ -339,110 +366,24 @@ class OrderDialog:
             return
         
         cust_id = self.cust_map[self.customer_var.get()]
-        total_amount = sum(item['subtotal'] for item in self.current_items)
         salesman_id = self.current_user['person_id']
+        service = OrderService()
+        
+        if self.mode == 'add':
+            order_id, error = service.create_order(cust_id, salesman_id, self.current_items)
+        else:
+            order_id = self.order_data['order_id']
+            _, error = service.update_order(
+                order_id, self.status_var.get(),
+                new_items=[item for item in self.current_items if 'order_item_id' not in item],
+                removed_item_ids=self.deleted_items
+            )
+        
+        if error:
+            messagebox.showerror("Error", f"Failed to save order: {error}")
+            return
         
-        conn = None
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            if self.mode == 'add':
-                # Create Order Master
-                cursor.execute("""
-                    INSERT INTO orders_m (customer_id, salesman_id, total_amount, status, order_date)
-                    VALUES (%s, %s, %s, 'PENDING', CURDATE())
-                """, (cust_id, salesman_id, total_amount))
-                order_id = cursor.lastrowid
-                
-                # Insert Items
-                for item in self.current_items:
-                    cursor.execute("""
-                        INSERT INTO order_items (order_id, warehouse_id, product_id, qty, unit_price)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (order_id, item['warehouse_id'], item['product_id'], item['qty'], item['unit_price']))
-                    
-                    # Update Stock (Deduct)
-                    # NOTE: In a real system, triggers might handle this, or we do it transactionally
-                    # The schema suggests triggers might exist or we do logic here. 
-                    # Let's do it manually to be safe if no triggers exist.
-                    cursor.execute("""
-                        UPDATE warehouse_products 
-                        SET qty = qty - %s 
-                        WHERE warehouse_id = %s AND product_id = %s
-                    """, (item['qty'], item['warehouse_id'], item['product_id']))
-                
-                messagebox.showinfo("Success", f"Order #{order_id} created successfully!")
-                
-            else:
-                # Edit Order
-                order_id = self.order_data['order_id']
-                status = self.status_var.get()
-                
-                # Update Master
-                cursor.execute("""
-                    UPDATE orders_m SET total_amount = %s, status = %s WHERE order_id = %s
-                """, (total_amount, status, order_id))
-
-                # STOCK RESTORATION LOGIC FOR CANCELLATION
-                if status == 'CANCELLED':
-                    # Check if we need to return stock (if it wasn't cancelled before)
-                    # NOTE: This assumes we want to return stock. 
-                    # We get all items for this order
-                    cursor.execute("SELECT warehouse_id, product_id, qty FROM order_items WHERE order_id = %s", (order_id,))
-                    current_items_db = cursor.fetchall()
-                    for item in current_items_db:
-                        cursor.execute("""
-                            UPDATE warehouse_products 
-                            SET qty = qty + %s 
-                            WHERE warehouse_id = %s AND product_id = %s
-                        """, (item['qty'], item['warehouse_id'], item['product_id']))
-                    # We might want to clear items or keep them. Often cancelled orders keep items for record. 
-                    # If we keep them, we must ensure we don't double-return stock if saved again. 
-                    # For simplicity in this project: We will NOT delete items, but we returned stock. 
-                    # WARNING: If user sets to CANCELLED (stock returns), then back to PENDING, stock is not auto-deducted here. 
-                    # To be safe: If status is CANCELLED, we should probably block further edits or handle the reverse.
-                    # Let's keep it simple: Just return stock.
-
-                
-                # Handle Deleted Items (Stock Return)
-                for item_id in self.deleted_items:
-                    # Get info to return stock
-                    cursor.execute("SELECT warehouse_id, product_id, qty FROM order_items WHERE order_item_id = %s", (item_id,))
-                    old_item = cursor.fetchone()
-                    if old_item:
-                        cursor.execute("UPDATE warehouse_products SET qty = qty + %s WHERE warehouse_id = %s AND product_id = %s", 
-                                     (old_item['qty'], old_item['warehouse_id'], old_item['product_id']))
-                        cursor.execute("DELETE FROM order_items WHERE order_item_id = %s", (item_id,))
-                
-                # Update/Insert Items
-                # Strategy: We assume immutable items for edit simplicity in this demo, 
-                # but if user removes and re-adds, handled by 'deleted_items' and 'insert'.
-                # Existing items in list without ID (added during edit) need insert.
-                # Existing items with ID (loaded) -> typically read-only or we skip update logic here for simplicity.
-                
-                for item in self.current_items:
-                    if 'order_item_id' not in item:
-                        # New item
-                        cursor.execute("""
-                            INSERT INTO order_items (order_id, warehouse_id, product_id, qty, unit_price)
-                            VALUES (%s, %s, %s, %s, %s)
-                        """, (order_id, item['warehouse_id'], item['product_id'], item['qty'], item['unit_price']))
-                        
-                        # Deduct Stock
-                        cursor.execute("""
-                            UPDATE warehouse_products 
-                            SET qty = qty - %s 
-                            WHERE warehouse_id = %s AND product_id = %s
-                        """, (item['qty'], item['warehouse_id'], item['product_id']))
-                
-                messagebox.showinfo("Success", f"Order #{order_id} updated successfully!")
-
-            conn.commit()
-            conn.close()
-            self.result = True
-            self.dialog.destroy()
-            
-        except Exception as e:
-            if conn: conn.rollback()
-            messagebox.showerror("Error", f"Failed to save order: {e}")
+        action = 'created' if self.mode == 'add' else 'updated'
+        messagebox.showinfo("Success", f"Order #{order_id} {action} successfully!")
+        self.result = True
+        self.dialog.destroy()
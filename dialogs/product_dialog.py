@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.lookup_cache import invalidate_tables
 
 class ProductDialog:
     def __init__(self, parent, mode='add', product_data=None, current_user=None, db_connection_func=None):
@@ -380,6 +381,7 @@ class ProductDialog:
                 """, (warehouse_id, product_id, stock_quantity))
             
             conn.commit()
+            invalidate_tables('products', 'warehouse_products')
             
             if self.mode == 'add':
                 messagebox.showinfo("Success", f"Product '{product_name}' linked to warehouse successfully!")
@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.lookup_cache import invalidate_tables
+from models.department_repository import DepartmentRepository
 from datetime import datetime
 
 class ProjectDialog:
@@ -190,26 +192,18 @@ class ProjectDialog:
         return combo
     
     def get_departments(self):
-        """Fetch departments from database"""
+        """Fetch departments (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT department_id, department_name FROM departments ORDER BY department_name")
-            depts = cursor.fetchall()
-            conn.close()
+            depts = DepartmentRepository().get_departments()
             return [(d['department_name'], d['department_id']) for d in depts]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load departments: {e}")
             return []
     
     def get_locations(self):
-        """Fetch locations from database"""
+        """Fetch locations (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT location_id, location_name FROM locations ORDER BY location_name")
-            locations = cursor.fetchall()
-            conn.close()
+            locations = DepartmentRepository().get_locations()
             return [(loc['location_name'], loc['location_id']) for loc in locations]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load locations: {e}")
@@ -337,6 +331,7 @@ class ProjectDialog:
                 """, (project_name, department_id, location_id, status, start_date, end_date))
                 
                 conn.commit()
+                invalidate_tables('projects')
                 messagebox.showinfo("Success", f"Project '{project_name}' added successfully!")
             
             else:  # Edit mode
@@ -351,6 +346,7 @@ class ProjectDialog:
                 """, (project_name, department_id, location_id, status, start_date, end_date, project_id))
                 
                 conn.commit()
+                invalidate_tables('projects')
                 messagebox.showinfo("Success", f"Project '{project_name}' updated successfully!")
             
             conn.close()
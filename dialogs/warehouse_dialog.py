@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.lookup_cache import invalidate_tables
+from models.department_repository import DepartmentRepository
+from models.employee_repository import EmployeeRepository
 
 class WarehouseDialog:
     def __init__(self, parent, mode='add', warehouse_data=None, current_user=None, db_connection_func=None):
@@ -181,32 +184,18 @@ class WarehouseDialog:
         return combo
     
     def get_locations(self):
-        """Fetch locations from database"""
+        """Fetch locations (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT location_id, location_name FROM locations ORDER BY location_name")
-            locations = cursor.fetchall()
-            conn.close()
+            locations = DepartmentRepository().get_locations()
             return [(loc['location_name'], loc['location_id']) for loc in locations]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load locations: {e}")
             return []
     
     def get_supervisors(self):
-        """Fetch active supervisors from database"""
+        """Fetch active supervisors (cached lookup)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT p.person_id, p.name 
-                FROM person p
-                JOIN supervisor s ON p.person_id = s.person_id
-                WHERE p.is_active = TRUE
-                ORDER BY p.name
-            """)
-            supervisors = cursor.fetchall()
-            conn.close()
+            supervisors = EmployeeRepository().get_supervisors()
             return [(sup['name'], sup['person_id']) for sup in supervisors]
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load supervisors: {e}")
@@ -310,6 +299,7 @@ class WarehouseDialog:
                 """, (wh_name, location_id, supervisor_id, capacity))
                 
                 conn.commit()
+                invalidate_tables('warehouses')
                 messagebox.showinfo("Success", f"Warehouse '{wh_name}' added successfully!")
             
             else:  # Edit mode
@@ -323,6 +313,7 @@ class WarehouseDialog:
                 """, (wh_name, location_id, supervisor_id, capacity, wh_id))
                 
                 conn.commit()
+                invalidate_tables('warehouses')
                 messagebox.showinfo("Success", f"Warehouse '{wh_name}' updated successfully!")
             
             conn.close()
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pymysql
+from models.lookup_cache import invalidate_tables
 from datetime import datetime, time
 
 class WorkLogDialog:
@@ -409,6 +410,7 @@ class WorkLogDialog:
                 """, (employee_id, project_id, work_date, start_time_str, end_time_str, notes))
                 
                 conn.commit()
+                invalidate_tables('work_log')
                 messagebox.showinfo("Success", "Work hours submitted successfully!\n\nStatus: Pending Supervisor Approval")
             
             else:  # Edit mode
@@ -422,6 +424,7 @@ class WorkLogDialog:
                 """, (project_id, work_date, start_time_str, end_time_str, notes, log_id))
                 
                 conn.commit()
+                invalidate_tables('work_log')
                 messagebox.showinfo("Success", "Work log updated successfully!")
             
             conn.close()
@@ -3,18 +3,38 @@ SpaceX Company Management System
 Main Application Entry Point
 
 Refactored to use MVC-like architecture.
+
+Usage:
+    python main.py                    # run the application
+    python main.py --profile-startup  # also report import times and
+                                      # time to first paint on stderr
 """
+import sys
+import threading
+
+# Must be enabled before the imports below to time them
+from utils.startup_profiler import profiler, after_first_paint
+
+PROFILE_STARTUP = '--profile-startup' in sys.argv[1:]
+if PROFILE_STARTUP:
+    profiler.enable()
+
 import tkinter as tk
 from tkinter import messagebox
 from dotenv import load_dotenv
 
-from config.database import get_db_connection
 from utils.logger import setup_logger
-from services.auth_service import AuthService
-from views.dashboard_view import DashboardView
+from utils.background_executor import shutdown_executor
 from dialogs.login import LoginWindow
 from Style.theme_manager import ThemeManager
 
+# Loaded in the background once the login window is up (see App.warm_up)
+WARM_UP_MODULES = (
+    'config.database',
+    'services.auth_service',
+    'views.dashboard_view',
+)
+
 # Setup logging
 logger = setup_logger(__name__)
 
@@ -30,19 +50,49 @@ class App:
         # Apply Theme
         ThemeManager.apply_theme(self.root)
         
-        # Services
-        self.auth_service = AuthService()
-        
         # State
         self.current_user = None
+        self._warmed_up = False
         
         # Start with Login
         self.show_login()
 
+    @property
+    def auth_service(self):
+        """Shared AuthService (imported on first use, not at startup)"""
+        from services.auth_service import get_auth_service
+        return get_auth_service()
+
     def show_login(self):
         """Display login screen"""
         self.clear_root()
         self.login_view = LoginWindow(self.root, self.on_login_success)
+        after_first_paint(self.root, self.on_login_painted)
+
+    def on_login_painted(self):
+        """The login window is visible; start the deferred startup work"""
+        profiler.mark('login first paint')
+        self.warm_up()
+
+    def warm_up(self):
+        """
+        Import the database layer and dashboard on a worker thread while the
+        user types their credentials, so the first login does not pay for it.
+        Only module bodies run there; no widgets are created.
+        """
+        if self._warmed_up:
+            return
+        self._warmed_up = True
+        
+        def load():
+            import importlib
+            for name in WARM_UP_MODULES:
+                try:
+                    importlib.import_module(name)
+                except Exception as e:
+                    logger.warning(f"Warm-up import of {name} failed: {e}")
+        
+        threading.Thread(target=load, name='warm-up', daemon=True).start()
 
     def on_login_success(self, user_data):
         """Handle successful login"""
@@ -52,9 +102,17 @@ class App:
 
     def show_dashboard(self):
         """Display main dashboard"""
+        from views.dashboard_view import DashboardView
         self.clear_root()
         # Initialize Dashboard View
         DashboardView(self.root, self.current_user, self.logout)
+        if PROFILE_STARTUP:
+            after_first_paint(self.root, self.on_dashboard_painted)
+
+    def on_dashboard_painted(self):
+        profiler.mark('dashboard first paint')
+        profiler.report()
+        profiler.disable()
 
     def logout(self):
         """Handle logout"""
@@ -71,8 +129,15 @@ class App:
 if __name__ == "__main__":
     try:
         root = tk.Tk()
+        profiler.mark('Tk root created')
         app = App(root)
         root.mainloop()
+        if profiler.enabled:
+            # Closed before reaching the dashboard
+            profiler.report()
+        shutdown_executor(root)
+        from config.database import close_pool
+        close_pool()
     except Exception as e:
         logger.critical(f"Application crashed: {e}", exc_info=True)
         messagebox.showerror("Critical Error", f"Application crashed: {e}")
\ No newline at end of file
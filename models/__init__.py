@@ -1,2 +1,3 @@
 # Models package - Repository pattern for data access
 from models.base_repository import BaseRepository
+from models.query_stats import get_query_stats, reset_query_stats
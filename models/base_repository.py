@@ -4,11 +4,92 @@ Base Repository - Provides common database operations
 This is the parent class for all repositories, providing a consistent
 interface for database operations and reducing code duplication.
 """
-from config.database import get_db_connection
+import threading
+import time
+from contextlib import contextmanager
+import pymysql
+from config.database import get_db_connection, SEARCH_MODE
+from models import pagination, search
+from models.lookup_cache import lookup_cache, tables_written
+from models.query_stats import query_stats, estimate_bytes
+from utils.constants import STREAM_CHUNK_SIZE
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Active unit of work per thread (see BaseRepository.session)
+_local = threading.local()
+
+# MySQL errors for a table / column that does not exist (e.g. migration
+# not applied)
+ER_NO_SUCH_TABLE = 1146
+ER_BAD_FIELD_ERROR = 1054
+
+
+def missing_table(error):
+    """
+    Check whether a database error means the queried table does not exist.
+    
+    Args:
+        error: Exception raised by a query
+        
+    Returns:
+        bool: True for MySQL error 1146
+    """
+    return isinstance(error, pymysql.err.ProgrammingError) and \
+        bool(error.args) and error.args[0] == ER_NO_SUCH_TABLE
+
+
+def missing_column(error):
+    """
+    Check whether a database error means a queried column does not exist.
+    
+    Args:
+        error: Exception raised by a query
+        
+    Returns:
+        bool: True for MySQL error 1054
+    """
+    return isinstance(error, pymysql.err.MySQLError) and \
+        bool(error.args) and error.args[0] == ER_BAD_FIELD_ERROR
+
+
+class UnitOfWork:
+    """
+    Shared connection scope handed out by BaseRepository.session().
+    
+    While a unit of work is active on the current thread, every repository
+    call made on that thread runs on its connection instead of borrowing a
+    new one. In transactional mode writes are not committed individually;
+    the whole scope commits on exit or rolls back on error.
+    """
+    
+    def __init__(self, connection, transactional):
+        self.connection = connection
+        self.transactional = transactional
+        # Tables written but not yet committed (lookup cache invalidation)
+        self.written_tables = set()
+    
+    def cursor(self):
+        """Get a cursor on the shared connection."""
+        return self.connection.cursor()
+    
+    def commit(self):
+        """Commit work done so far (the scope stays open)."""
+        self.connection.commit()
+        self._flush_written()
+    
+    def rollback(self):
+        """Roll back work done so far (the scope stays open)."""
+        self.connection.rollback()
+        self.written_tables.clear()
+    
+    def _flush_written(self):
+        """Invalidate cached lookups for tables written by committed work."""
+        if self.written_tables:
+            lookup_cache.invalidate_tables(self.written_tables)
+            self.written_tables.clear()
+
 
 class BaseRepository:
     """
@@ -18,11 +99,119 @@ class BaseRepository:
         class EmployeeRepository(BaseRepository):
             def get_by_id(self, id):
                 return self.execute_query("SELECT * FROM employees WHERE id = %s", (id,), fetch_one=True)
+        
+        # Several repository calls on one connection / one transaction
+        with BaseRepository.session(transactional=True):
+            order_id = order_repo.create_order(...)
+            order_repo.add_item(order_id, ...)
     """
     
+    # 'like' or 'fulltext' for listings that declare a 'search_ft' filter;
+    # None uses DB_SEARCH_MODE. Override per repository class or instance.
+    search_mode = None
+    
+    # Row fields the listing's 'search' filter matches (see search_predicate)
+    SEARCH_FIELDS = ()
+    
     def __init__(self):
         self.get_connection = get_db_connection
     
+    @staticmethod
+    @contextmanager
+    def session(transactional=False):
+        """
+        Share one connection across all repository calls in the block.
+        
+        Args:
+            transactional: If True, run the block as a single transaction
+                           (commit on success, rollback on error). Reads in
+                           the block then see one consistent snapshot.
+        
+        Yields:
+            UnitOfWork: The active unit of work
+        
+        Nested session() calls join the outer unit of work. A transactional
+        one inside a non-transactional session runs as a transaction of its
+        own on the shared connection.
+        """
+        current = getattr(_local, 'uow', None)
+        if current is not None and transactional and not current.transactional:
+            current.transactional = True
+            try:
+                current.connection.begin()
+                yield current
+                current.commit()
+            except Exception:
+                current.rollback()
+                raise
+            finally:
+                current.transactional = False
+            return
+        if current is not None:
+            yield current
+            return
+        
+        conn = get_db_connection()
+        uow = UnitOfWork(conn, transactional)
+        _local.uow = uow
+        try:
+            if transactional:
+                conn.begin()
+            yield uow
+            uow.commit()
+        except Exception:
+            uow.rollback()
+            raise
+        finally:
+            _local.uow = None
+            conn.close()
+    
+    @staticmethod
+    def current_session():
+        """Get the unit of work active on this thread, or None."""
+        return getattr(_local, 'uow', None)
+    
+    @contextmanager
+    def _borrow(self):
+        """Yield (connection, unit_of_work) - shared if a session is active."""
+        uow = getattr(_local, 'uow', None)
+        if uow is not None:
+            yield uow.connection, uow
+            return
+        
+        conn = self.get_connection()
+        try:
+            yield conn, None
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _commit(conn, uow):
+        """Commit unless the write belongs to a transactional unit of work."""
+        if uow is None or not uow.transactional:
+            conn.commit()
+    
+    @staticmethod
+    def _rollback(conn, uow):
+        """Roll back unless a transactional unit of work owns the outcome."""
+        if uow is None or not uow.transactional:
+            conn.rollback()
+    
+    @staticmethod
+    def _written(uow, *queries):
+        """
+        Invalidate cached lookups for the tables written by queries.
+        
+        Inside a transactional unit of work this is deferred until commit.
+        """
+        tables = set()
+        for query in queries:
+            tables |= tables_written(query)
+        if uow is not None and uow.transactional:
+            uow.written_tables |= tables
+        else:
+            lookup_cache.invalidate_tables(tables)
+    
     def execute_query(self, query, params=None, fetch_one=False):
         """
         Execute a SELECT query and return results.
@@ -35,24 +224,84 @@ class BaseRepository:
         Returns:
             dict or list: Query results
         """
+        with self._borrow() as (conn, uow):
+            started = time.perf_counter()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query, params or ())
+                
+                if fetch_one:
+                    result = cursor.fetchone()
+                else:
+                    result = cursor.fetchall()
+                
+                row_count = (1 if result else 0) if fetch_one else len(result) if result else 0
+                query_stats.record(query, params, time.perf_counter() - started,
+                                   rows=row_count, size=estimate_bytes(result))
+                logger.debug(f"Query executed: {query[:100]}... | Rows: {row_count}")
+                return result
+                
+            except Exception as e:
+                query_stats.record(query, params, time.perf_counter() - started, error=True)
+                logger.error(f"Query failed: {query[:100]}... | Error: {e}")
+                raise
+    
+    def iter_query(self, query, params=None, chunk_size=None):
+        """
+        Stream a SELECT query row by row with an unbuffered server-side cursor.
+        
+        Rows are pulled from the server in fetchmany() chunks, so memory use
+        stays constant and the first rows are available before the whole
+        result has been transferred.
+        
+        Args:
+            query: SQL query string with %s placeholders
+            params: Tuple of parameters
+            chunk_size: Rows fetched per round trip (default STREAM_CHUNK_SIZE)
+            
+        Yields:
+            dict: One row at a time
+        
+        Note:
+            The stream always uses its own connection (never the active
+            session's), because an unbuffered result blocks its connection
+            until fully read. Stopping iteration early discards that
+            connection instead of draining the remaining rows.
+        """
+        chunk_size = chunk_size or STREAM_CHUNK_SIZE
         conn = self.get_connection()
+        exhausted = False
+        started = time.perf_counter()
+        row_count = 0
         try:
-            cursor = conn.cursor()
+            cursor = conn.cursor(pymysql.cursors.SSDictCursor)
             cursor.execute(query, params or ())
             
-            if fetch_one:
-                result = cursor.fetchone()
-            else:
-                result = cursor.fetchall()
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                row_count += len(chunk)
+                for row in chunk:
+                    yield row
             
-            logger.debug(f"Query executed: {query[:100]}... | Rows: {1 if fetch_one else len(result) if result else 0}")
-            return result
+            cursor.close()
+            exhausted = True
+            query_stats.record(query, params, time.perf_counter() - started,
+                               rows=row_count, kind='stream')
+            logger.debug(f"Stream executed: {query[:100]}... | Rows: {row_count}")
             
         except Exception as e:
-            logger.error(f"Query failed: {query[:100]}... | Error: {e}")
+            query_stats.record(query, params, time.perf_counter() - started,
+                               rows=row_count, kind='stream', error=True)
+            logger.error(f"Stream failed: {query[:100]}... | Error: {e}")
             raise
         finally:
-            conn.close()
+            if exhausted:
+                conn.close()
+            else:
+                # Unread rows are still pending on the socket
+                getattr(conn, 'invalidate', conn.close)()
     
     def execute_write(self, query, params=None):
         """
@@ -65,22 +314,26 @@ class BaseRepository:
         Returns:
             int: Last inserted ID (for INSERT) or row count (for UPDATE/DELETE)
         """
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(query, params or ())
-            conn.commit()
-            
-            result = cursor.lastrowid or cursor.rowcount
-            logger.debug(f"Write executed: {query[:100]}... | Result: {result}")
-            return result
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Write failed: {query[:100]}... | Error: {e}")
-            raise
-        finally:
-            conn.close()
+        with self._borrow() as (conn, uow):
+            started = time.perf_counter()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query, params or ())
+                self._commit(conn, uow)
+                self._written(uow, query)
+                
+                query_stats.record(query, params, time.perf_counter() - started,
+                                   rows=cursor.rowcount, kind='write')
+                result = cursor.lastrowid or cursor.rowcount
+                logger.debug(f"Write executed: {query[:100]}... | Result: {result}")
+                return result
+                
+            except Exception as e:
+                query_stats.record(query, params, time.perf_counter() - started,
+                                   kind='write', error=True)
+                self._rollback(conn, uow)
+                logger.error(f"Write failed: {query[:100]}... | Error: {e}")
+                raise
     
     def execute_many(self, query, params_list):
         """
@@ -93,22 +346,26 @@ class BaseRepository:
         Returns:
             int: Number of affected rows
         """
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.executemany(query, params_list)
-            conn.commit()
-            
-            result = cursor.rowcount
-            logger.debug(f"Batch executed: {query[:100]}... | Rows: {result}")
-            return result
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Batch failed: {query[:100]}... | Error: {e}")
-            raise
-        finally:
-            conn.close()
+        with self._borrow() as (conn, uow):
+            started = time.perf_counter()
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(query, params_list)
+                self._commit(conn, uow)
+                self._written(uow, query)
+                
+                result = cursor.rowcount
+                query_stats.record(query, params_list, time.perf_counter() - started,
+                                   rows=result, kind='batch')
+                logger.debug(f"Batch executed: {query[:100]}... | Rows: {result}")
+                return result
+                
+            except Exception as e:
+                query_stats.record(query, params_list, time.perf_counter() - started,
+                                   kind='batch', error=True)
+                self._rollback(conn, uow)
+                logger.error(f"Batch failed: {query[:100]}... | Error: {e}")
+                raise
     
     def execute_transaction(self, queries_with_params):
         """
@@ -120,23 +377,30 @@ class BaseRepository:
         Returns:
             bool: True if all queries succeeded
         """
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            for query, params in queries_with_params:
-                cursor.execute(query, params or ())
-            
-            conn.commit()
-            logger.debug(f"Transaction completed: {len(queries_with_params)} queries")
-            return True
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Transaction failed: {e}")
-            raise
-        finally:
-            conn.close()
+        with self._borrow() as (conn, uow):
+            try:
+                cursor = conn.cursor()
+                
+                for query, params in queries_with_params:
+                    started = time.perf_counter()
+                    try:
+                        cursor.execute(query, params or ())
+                    except Exception:
+                        query_stats.record(query, params, time.perf_counter() - started,
+                                           kind='transaction', error=True)
+                        raise
+                    query_stats.record(query, params, time.perf_counter() - started,
+                                       rows=cursor.rowcount, kind='transaction')
+                
+                self._commit(conn, uow)
+                self._written(uow, *(query for query, _ in queries_with_params))
+                logger.debug(f"Transaction completed: {len(queries_with_params)} queries")
+                return True
+                
+            except Exception as e:
+                self._rollback(conn, uow)
+                logger.error(f"Transaction failed: {e}")
+                raise
     
     def get_count(self, table, where_clause=None, params=None):
         """
@@ -156,3 +420,119 @@ class BaseRepository:
         
         result = self.execute_query(query, params, fetch_one=True)
         return result['count'] if result else 0
+    
+    def search_filter(self, search_term, builder=None):
+        """
+        Get the active search filter for a term in this repository's mode.
+        
+        Args:
+            search_term: Search text (empty for no search)
+            builder: Listing QueryBuilder (default: self.LIST_QUERY)
+            
+        Returns:
+            dict: Filter entry to merge into a listing's where dict
+        """
+        builder = builder or self.LIST_QUERY
+        return search.search_filter(builder, search_term, self.search_mode or SEARCH_MODE)
+    
+    def search_predicate(self, search_term):
+        """
+        Get a Python predicate equivalent to this repository's search filter.
+        
+        Views use it to narrow an already loaded, complete result set when the
+        term is extended, instead of querying again.
+        
+        Args:
+            search_term: Search text
+            
+        Returns:
+            callable: row -> bool, or None if the term cannot be matched
+                      client-side exactly (FULLTEXT mode, LIKE wildcards)
+        """
+        mode = self.search_mode or SEARCH_MODE
+        if mode == search.FULLTEXT and 'search_ft' in self.LIST_QUERY.filters:
+            return None
+        return search.like_predicate(self.SEARCH_FIELDS, search_term)
+    
+    def execute_page(self, builder, where=None, page_size=None, cursor=None,
+                     columns=None, with_total=False):
+        """
+        Fetch one page of a listing using keyset (seek) pagination.
+        
+        Args:
+            builder: QueryBuilder describing the listing; its order_by keys
+                     (ending with the primary key) form the keyset
+            where: Active filters, as for QueryBuilder.build
+            page_size: Rows per page (clamped to MAX_PAGE_SIZE)
+            cursor: Cursor from a previous page, or None for the first page
+            columns: Optional subset of row fields to select
+            with_total: False, True (optimizer estimate) or 'exact'
+            
+        Returns:
+            dict: {'rows', 'next_cursor', 'prev_cursor', 'page_size'} plus
+                  'total' and 'total_is_estimate' when with_total is set
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        keyset = builder.order_by
+        page_size = pagination.clamp_page_size(page_size)
+        
+        seek = None
+        direction = pagination.NEXT
+        if cursor:
+            values, direction = pagination.decode_cursor(cursor, len(keyset))
+            seek = (direction, values)
+        
+        query, params = builder.build(where, columns, seek=seek, limit=page_size + 1)
+        rows = list(self.execute_query(query, params))
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == pagination.PREV:
+            rows.reverse()
+        
+        next_cursor = prev_cursor = None
+        if rows:
+            first = pagination.row_key(rows[0], keyset)
+            last = pagination.row_key(rows[-1], keyset)
+            if direction == pagination.NEXT:
+                next_cursor = pagination.encode_cursor(last, pagination.NEXT) if has_more else None
+                prev_cursor = pagination.encode_cursor(first, pagination.PREV) if cursor else None
+            else:
+                prev_cursor = pagination.encode_cursor(first, pagination.PREV) if has_more else None
+                next_cursor = pagination.encode_cursor(last, pagination.NEXT)
+        
+        page = {
+            'rows': rows,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'page_size': page_size
+        }
+        
+        if with_total:
+            exact = with_total == 'exact'
+            count_query, count_params = builder.build(where, columns, ordered=False)
+            page['total'] = self._count_rows(count_query, count_params, exact)
+            page['total_is_estimate'] = not exact
+        
+        return page
+    
+    def _count_rows(self, query, params, exact=False):
+        """
+        Count the rows a listing query would return.
+        
+        The default is the optimizer's estimate from EXPLAIN (no scan); pass
+        exact=True for a real COUNT(*).
+        """
+        if exact:
+            result = self.execute_query(
+                f"SELECT COUNT(*) AS count FROM ({query}) AS page_total", params, fetch_one=True
+            )
+            return result['count'] if result else 0
+        
+        plan = self.execute_query(f"EXPLAIN {query}", params)
+        if not plan:
+            return 0
+        first = plan[0]
+        estimate = (first.get('rows') or 0) * float(first.get('filtered') or 100) / 100
+        return int(round(estimate))
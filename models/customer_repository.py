@@ -2,10 +2,43 @@
 Customer Repository - Data access for customer operations
 """
 from models.base_repository import BaseRepository
+from models.query_builder import QueryBuilder, Join
+from models.lookup_cache import cached_lookup
 
 class CustomerRepository(BaseRepository):
     """Repository for Customer CRUD operations"""
     
+    # Customer listing with order counts
+    LIST_QUERY = QueryBuilder(
+        table="customers c",
+        columns=[
+            ('customer_id', 'c.customer_id'),
+            ('name', 'c.name'),
+            ('email', 'c.email'),
+            ('phone', 'c.phone'),
+            ('address', 'c.address'),
+            ('salesman_id', 'c.salesman_id'),
+            ('salesman_name', 'p.name'),
+            ('order_count', 'COUNT(o.order_id)')
+        ],
+        joins=[
+            Join('p', "LEFT JOIN person p ON c.salesman_id = p.person_id", optional=True),
+            Join('o', "LEFT JOIN orders_m o ON c.customer_id = o.customer_id")
+        ],
+        filters={
+            'search': "(c.name LIKE %s OR c.email LIKE %s)",
+            'search_ft': "MATCH(c.name, c.email) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        rankings={
+            'search_ft': "MATCH(c.name, c.email) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        group_by="c.customer_id",
+        order_by=[('c.name', 'name'), ('c.customer_id', 'customer_id')]
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('name', 'email')
+    
     def get_all(self, salesman_id=None, search_term=None):
         """
         Get customers with filters.
@@ -17,31 +50,42 @@ class CustomerRepository(BaseRepository):
         Returns:
             list: List of customer dicts
         """
-        query = """
-            SELECT 
-                c.customer_id, c.name, c.email, c.phone, c.address, c.salesman_id,
-                p.name AS salesman_name,
-                COUNT(o.order_id) AS order_count
-            FROM customers c
-            LEFT JOIN person p ON c.salesman_id = p.person_id
-            LEFT JOIN orders_m o ON c.customer_id = o.customer_id
-            WHERE 1=1
+        where = self._list_filters(salesman_id, search_term)
+        return self.execute_query(*self.LIST_QUERY.build(where, ranked=True))
+    
+    def get_page(self, salesman_id=None, search_term=None, page_size=None,
+                 cursor=None, with_total=False):
         """
-        params = []
+        Get one page of customers using keyset pagination.
         
-        # Note: We typically show all customers but highlight own customers. 
-        # But if we wanted to strictly filter:
-        # if salesman_id:
-        #     query += " AND c.salesman_id = %s"
-        #     params.append(salesman_id)
+        Args:
+            salesman_id, search_term: Same filters as get_all
+            page_size: Rows per page (default DEFAULT_PAGE_SIZE)
+            cursor: next_cursor / prev_cursor from a previous page
+            with_total: Include an approximate total (or 'exact')
+            
+        Returns:
+            dict: Page with 'rows', 'next_cursor', 'prev_cursor'
+        """
+        where = self._list_filters(salesman_id, search_term)
+        return self.execute_page(self.LIST_QUERY, where, page_size, cursor,
+                                 with_total=with_total)
+    
+    def _list_filters(self, salesman_id=None, search_term=None):
+        """Map get_all arguments to active LIST_QUERY filters."""
+        where = {}
         
-        if search_term:
-            query += " AND (c.name LIKE %s OR c.email LIKE %s)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
+        # Note: We typically show all customers but highlight own customers,
+        # so salesman_id does not filter the listing.
         
-        query += " GROUP BY c.customer_id ORDER BY c.name"
+        where.update(self.search_filter(search_term))
         
-        return self.execute_query(query, params)
+        return where
+    
+    @cached_lookup('customers')
+    def get_customers(self):
+        """Get all customers for dropdown"""
+        return self.execute_query("SELECT customer_id, name FROM customers ORDER BY name")
     
     def get_by_id(self, customer_id):
         """Get customer by ID"""
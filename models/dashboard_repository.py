@@ -0,0 +1,118 @@
+"""
+Dashboard Repository - Data access for the dashboard summary counters
+
+The counters live in the dashboard_summary table (migration 0003), which
+triggers on orders_m, customers and warehouse_products keep up to date.
+The table is split into slot rows that are summed on read.
+"""
+from models.base_repository import BaseRepository, missing_table
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+METRICS = ('total_orders', 'total_revenue', 'total_customers', 'low_stock_count')
+
+
+class DashboardRepository(BaseRepository):
+    """
+    Repository for the dashboard summary.
+    """
+
+    SUMMARY_QUERY = """
+        SELECT
+            SUM(total_orders) as total_orders,
+            SUM(total_revenue) as total_revenue,
+            SUM(total_customers) as total_customers,
+            SUM(low_stock_count) as low_stock_count
+        FROM dashboard_summary
+    """
+
+    # Same figures aggregated from the source tables, in one round trip
+    SOURCE_QUERY = """
+        SELECT
+            (SELECT COUNT(*) FROM orders_m) as total_orders,
+            (SELECT COALESCE(SUM(total_amount), 0) FROM orders_m
+             WHERE status = 'COMPLETED') as total_revenue,
+            (SELECT COUNT(*) FROM customers) as total_customers,
+            (SELECT COUNT(*) FROM warehouse_products
+             WHERE qty <= reorder_level) as low_stock_count
+    """
+
+    def get_summary(self):
+        """
+        Read the maintained counters.
+
+        Returns:
+            dict: The four metrics, or None if dashboard_summary does not
+                  exist (migration 0003 not applied)
+        """
+        try:
+            row = self.execute_query(self.SUMMARY_QUERY, fetch_one=True)
+        except Exception as e:
+            if missing_table(e):
+                return None
+            raise
+        if not row or row['total_orders'] is None:
+            return None
+        return self._normalize(row)
+
+    def compute_from_source(self):
+        """
+        Aggregate the metrics from orders_m, customers and warehouse_products.
+
+        Returns:
+            dict: The four metrics
+        """
+        return self._normalize(self.execute_query(self.SOURCE_QUERY, fetch_one=True))
+
+    def check(self, repair=False):
+        """
+        Compare the counters with the source tables.
+
+        The summary rows are locked before the source tables are read, so
+        writers that commit during the check either are already counted in
+        both or add their trigger deltas after a repair is written.
+
+        Args:
+            repair: Overwrite the counters with the recomputed values when
+                    they differ
+
+        Returns:
+            dict: metric -> (summary value, source value) for every metric
+                  that differs (empty when consistent)
+        """
+        with self.session(transactional=True) as uow:
+            with uow.cursor() as cursor:
+                cursor.execute("SELECT slot FROM dashboard_summary FOR UPDATE")
+                cursor.execute(self.SUMMARY_QUERY)
+                summary = self._normalize(cursor.fetchone())
+                cursor.execute(self.SOURCE_QUERY)
+                source = self._normalize(cursor.fetchone())
+
+                drift = {name: (summary[name], source[name]) for name in METRICS
+                         if summary[name] != source[name]}
+                if drift and repair:
+                    cursor.execute("""
+                        UPDATE dashboard_summary
+                        SET total_orders = 0, total_revenue = 0,
+                            total_customers = 0, low_stock_count = 0
+                        WHERE slot <> 0
+                    """)
+                    cursor.execute("""
+                        UPDATE dashboard_summary
+                        SET total_orders = %s, total_revenue = %s,
+                            total_customers = %s, low_stock_count = %s
+                        WHERE slot = 0
+                    """, tuple(source[name] for name in METRICS))
+                    logger.warning(f"Repaired dashboard summary drift: {drift}")
+        return drift
+
+    @staticmethod
+    def _normalize(row):
+        row = row or {}
+        return {
+            'total_orders': int(row.get('total_orders') or 0),
+            'total_revenue': float(row.get('total_revenue') or 0),
+            'total_customers': int(row.get('total_customers') or 0),
+            'low_stock_count': int(row.get('low_stock_count') or 0)
+        }
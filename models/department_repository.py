@@ -2,10 +2,40 @@
 Department Repository - Data access for department operations
 """
 from models.base_repository import BaseRepository
+from models.employee_repository import EmployeeRepository
+from models.query_builder import QueryBuilder, Join
+from models.lookup_cache import cached_lookup
 
 class DepartmentRepository(BaseRepository):
     """Repository for Department CRUD operations"""
     
+    # Department listing with active headcount
+    LIST_QUERY = QueryBuilder(
+        table="departments d",
+        columns=[
+            ('department_id', 'd.department_id'),
+            ('department_name', 'd.department_name'),
+            ('location_name', 'l.location_name'),
+            ('hod_name', 'p.name'),
+            ('hod_id', 'd.hod_id'),
+            ('location_id', 'd.location_id'),
+            ('employee_count', 'COUNT(DISTINCT e.person_id)')
+        ],
+        joins=[
+            Join('l', "LEFT JOIN locations l ON d.location_id = l.location_id", optional=True),
+            Join('p', "LEFT JOIN person p ON d.hod_id = p.person_id", optional=True),
+            Join('e', "LEFT JOIN person e ON d.department_id = e.department_id AND e.is_active = TRUE")
+        ],
+        filters={
+            'search': "(d.department_name LIKE %s OR l.location_name LIKE %s)"
+        },
+        group_by="d.department_id",
+        order_by=[('d.department_name', 'department_name'), ('d.department_id', 'department_id')]
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('department_name', 'location_name')
+    
     def get_all(self, search_term=None):
         """
         Get all departments with optional search.
@@ -16,30 +46,12 @@ class DepartmentRepository(BaseRepository):
         Returns:
             list: List of department dicts
         """
-        query = """
-            SELECT 
-                d.department_id,
-                d.department_name,
-                l.location_name,
-                p.name AS hod_name,
-                d.hod_id,
-                d.location_id,
-                COUNT(DISTINCT e.person_id) AS employee_count
-            FROM departments d
-            LEFT JOIN locations l ON d.location_id = l.location_id
-            LEFT JOIN person p ON d.hod_id = p.person_id
-            LEFT JOIN person e ON d.department_id = e.department_id AND e.is_active = TRUE
-            WHERE 1=1
-        """
-        params = []
+        where = {}
         
         if search_term:
-            query += " AND (d.department_name LIKE %s OR l.location_name LIKE %s)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
-        
-        query += " GROUP BY d.department_id ORDER BY d.department_name"
+            where['search'] = [f"%{search_term}%", f"%{search_term}%"]
         
-        return self.execute_query(query, params)
+        return self.execute_query(*self.LIST_QUERY.build(where))
     
     def get_by_id(self, dept_id):
         """Get single department by ID"""
@@ -59,18 +71,31 @@ class DepartmentRepository(BaseRepository):
         return self.execute_write(query, (name, location_id, hod_id))
     
     def update(self, dept_id, name, location_id, hod_id):
-        """Update department"""
+        """Update department (and its members' employee directory rows)"""
         query = """
             UPDATE departments 
             SET department_name = %s, location_id = %s, hod_id = %s
             WHERE department_id = %s
         """
-        return self.execute_write(query, (name, location_id, hod_id, dept_id))
+        with self.session(transactional=True):
+            rows = self.execute_write(query, (name, location_id, hod_id, dept_id))
+            EmployeeRepository().refresh_directory(department_id=dept_id)
+        return rows
     
     def delete(self, dept_id):
-        """Delete department"""
-        return self.execute_write("DELETE FROM departments WHERE department_id = %s", (dept_id,))
+        """Delete department (its members keep their directory rows, without a department)"""
+        with self.session(transactional=True):
+            EmployeeRepository().clear_directory_department(dept_id)
+            return self.execute_write("DELETE FROM departments WHERE department_id = %s", (dept_id,))
+    
+    @cached_lookup('departments')
+    def get_departments(self):
+        """Get all departments for dropdown"""
+        return self.execute_query(
+            "SELECT department_id, department_name FROM departments ORDER BY department_name"
+        )
     
+    @cached_lookup('locations')
     def get_locations(self):
         """Get all locations for dropdown"""
         return self.execute_query("SELECT * FROM locations ORDER BY location_name")
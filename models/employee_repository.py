@@ -1,16 +1,152 @@
 """
 Employee Repository - Data access for employee operations
 """
-from models.base_repository import BaseRepository
+from models.base_repository import BaseRepository, missing_table
+from models.query_builder import QueryBuilder, Join
+from models.lookup_cache import cached_lookup
 from utils.constants import PersonType
+from utils.logger import setup_logger
 import hashlib
 
+logger = setup_logger(__name__)
+
 
 class EmployeeRepository(BaseRepository):
     """Repository for Employee CRUD operations"""
     
+    # Employee listing, served from the employee_directory projection
+    # (migration 0004): one row per person, no joins. The keyset seeks on
+    # idx_directory_list / _department / _supervisor. search_ft uses the
+    # projection's own FULLTEXT index.
+    LIST_QUERY = QueryBuilder(
+        table="employee_directory ed",
+        columns=[
+            ('person_id', 'ed.person_id'),
+            ('name', 'ed.name'),
+            ('email', 'ed.email'),
+            ('person_type', 'ed.person_type'),
+            ('person_type_rank', 'ed.person_type_rank'),
+            ('department_name', 'ed.department_name'),
+            ('phone', 'ed.phone'),
+            ('is_active', 'ed.is_active'),
+            ('supervisor_name', 'ed.supervisor_name'),
+            ('salary_rate', 'ed.salary_rate'),
+            ('search_key', 'ed.search_key')
+        ],
+        filters={
+            'department': "ed.department_id = %s",
+            'supervisor': "ed.supervisor_id = %s",
+            'person_type': "ed.person_type = %s",
+            'is_active': "ed.is_active = %s",
+            'search': "ed.search_key LIKE %s",
+            'search_ft': "MATCH(ed.name, ed.email) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        rankings={
+            'search_ft': "MATCH(ed.name, ed.email) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        order_by=[
+            ('ed.person_type_rank', 'person_type_rank'),
+            ('ed.name', 'name'),
+            ('ed.person_id', 'person_id')
+        ]
+    )
+    
+    # The same listing joined from the source tables; used until migration
+    # 0004 is applied. The salary and supervisor joins match at most one
+    # row each, so they are skipped unless a selected column needs them.
+    # person_type is an ENUM and sorts by ordinal (person_type_rank).
+    SOURCE_QUERY = QueryBuilder(
+        table="person p",
+        columns=[
+            ('person_id', 'p.person_id'),
+            ('name', 'p.name'),
+            ('email', 'p.email'),
+            ('person_type', 'p.person_type'),
+            ('person_type_rank', 'p.person_type + 0'),
+            ('department_name', 'd.department_name'),
+            ('phone', 'p.phone'),
+            ('is_active', 'p.is_active'),
+            ('supervisor_name', 's.name'),
+            ('salary_rate', """CASE 
+                    WHEN p.person_type = 'HOD' THEN h.fixed_salary
+                    WHEN p.person_type = 'SUPERVISOR' THEN sup.fixed_salary
+                    WHEN p.person_type = 'SALESMAN' THEN sm.hourly_rate
+                    WHEN p.person_type = 'GENERAL_EMPLOYEE' THEN ge.hourly_rate
+                END"""),
+            ('search_key', "CONCAT_WS(' ', p.name, p.email)")
+        ],
+        joins=[
+            Join('d', "LEFT JOIN departments d ON p.department_id = d.department_id", optional=True),
+            Join('h', "LEFT JOIN hod h ON p.person_id = h.person_id", optional=True),
+            Join('sup', "LEFT JOIN supervisor sup ON p.person_id = sup.person_id", optional=True),
+            Join('sm', "LEFT JOIN salesman sm ON p.person_id = sm.person_id", optional=True),
+            Join('ge', "LEFT JOIN general_employee ge ON p.person_id = ge.person_id", optional=True),
+            Join('es', "LEFT JOIN emp_supervisor es ON p.person_id = es.employee_id", optional=True),
+            Join('s', "LEFT JOIN person s ON es.supervisor_id = s.person_id", optional=True)
+        ],
+        filters={
+            'department': "p.department_id = %s",
+            'supervisor': "es.supervisor_id = %s",
+            'person_type': "p.person_type = %s",
+            'is_active': "p.is_active = %s",
+            'search': "CONCAT_WS(' ', p.name, p.email) LIKE %s",
+            'search_ft': "MATCH(p.name, p.email) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        rankings={
+            'search_ft': "MATCH(p.name, p.email) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        order_by=[
+            ('p.person_type + 0', 'person_type_rank'),
+            ('p.name', 'name'),
+            ('p.person_id', 'person_id')
+        ]
+    )
+    
+    # Re-derives directory rows from the source tables; {where} selects
+    # the people affected by a write.
+    DIRECTORY_UPSERT = """
+        INSERT INTO employee_directory (
+            person_id, name, email, phone, person_type, person_type_rank,
+            department_id, department_name, supervisor_id, supervisor_name,
+            salary_rate, is_active, search_key
+        )
+        SELECT
+            p.person_id, p.name, p.email, p.phone, p.person_type, p.person_type + 0,
+            p.department_id, d.department_name, es.supervisor_id, s.name,
+            CASE
+                WHEN p.person_type = 'HOD' THEN h.fixed_salary
+                WHEN p.person_type = 'SUPERVISOR' THEN sup.fixed_salary
+                WHEN p.person_type = 'SALESMAN' THEN sm.hourly_rate
+                WHEN p.person_type = 'GENERAL_EMPLOYEE' THEN ge.hourly_rate
+            END,
+            COALESCE(p.is_active, FALSE), CONCAT_WS(' ', p.name, p.email)
+        FROM person p
+        LEFT JOIN departments d ON p.department_id = d.department_id
+        LEFT JOIN hod h ON p.person_id = h.person_id
+        LEFT JOIN supervisor sup ON p.person_id = sup.person_id
+        LEFT JOIN salesman sm ON p.person_id = sm.person_id
+        LEFT JOIN general_employee ge ON p.person_id = ge.person_id
+        LEFT JOIN emp_supervisor es ON p.person_id = es.employee_id
+        LEFT JOIN person s ON es.supervisor_id = s.person_id
+        WHERE {where}
+        ON DUPLICATE KEY UPDATE
+            name = VALUES(name), email = VALUES(email), phone = VALUES(phone),
+            person_type = VALUES(person_type), person_type_rank = VALUES(person_type_rank),
+            department_id = VALUES(department_id), department_name = VALUES(department_name),
+            supervisor_id = VALUES(supervisor_id), supervisor_name = VALUES(supervisor_name),
+            salary_rate = VALUES(salary_rate), is_active = VALUES(is_active),
+            search_key = VALUES(search_key)
+    """
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('search_key',)
+    
+    # False once employee_directory turned out to be missing (migration
+    # 0004 not applied); listings then use SOURCE_QUERY
+    directory_ready = True
+    
     def get_all(self, department_id=None, supervisor_id=None, 
-                person_type=None, is_active=None, search_term=None):
+                person_type=None, is_active=None, search_term=None, columns=None):
         """
         Get employees with optional filters.
         
@@ -20,57 +156,191 @@ class EmployeeRepository(BaseRepository):
             person_type: Filter by PersonType enum or string
             is_active: Filter by active status
             search_term: Search in name or email
+            columns: Optional subset of LIST_QUERY columns to fetch
             
         Returns:
             list: List of employee dicts
         """
-        query = """
-            SELECT 
-                p.person_id, p.name, p.email, p.person_type,
-                d.department_name, p.phone, p.is_active,
-                s.name AS supervisor_name,
-                CASE 
-                    WHEN p.person_type = 'HOD' THEN h.fixed_salary
-                    WHEN p.person_type = 'SUPERVISOR' THEN sup.fixed_salary
-                    WHEN p.person_type = 'SALESMAN' THEN sm.hourly_rate
-                    WHEN p.person_type = 'GENERAL_EMPLOYEE' THEN ge.hourly_rate
-                END as salary_rate
-            FROM person p
-            LEFT JOIN departments d ON p.department_id = d.department_id
-            LEFT JOIN hod h ON p.person_id = h.person_id
-            LEFT JOIN supervisor sup ON p.person_id = sup.person_id
-            LEFT JOIN salesman sm ON p.person_id = sm.person_id
-            LEFT JOIN general_employee ge ON p.person_id = ge.person_id
-            LEFT JOIN emp_supervisor es ON p.person_id = es.employee_id
-            LEFT JOIN person s ON es.supervisor_id = s.person_id
-            WHERE 1=1
+        return self._from_directory(
+            lambda builder: self.execute_query(*builder.build(
+                self._list_filters(department_id, supervisor_id, person_type,
+                                   is_active, search_term, builder),
+                columns, ranked=True))
+        )
+    
+    def get_page(self, department_id=None, supervisor_id=None, person_type=None,
+                 is_active=None, search_term=None, page_size=None, cursor=None,
+                 with_total=False, columns=None):
+        """
+        Get one page of employees using keyset pagination.
+        
+        Args:
+            department_id, supervisor_id, person_type, is_active, search_term,
+            columns: Same as get_all
+            page_size: Rows per page (default DEFAULT_PAGE_SIZE)
+            cursor: next_cursor / prev_cursor from a previous page
+            with_total: Include an approximate total (or 'exact')
+            
+        Returns:
+            dict: Page with 'rows', 'next_cursor', 'prev_cursor'
+        """
+        return self._from_directory(
+            lambda builder: self.execute_page(
+                builder,
+                self._list_filters(department_id, supervisor_id, person_type,
+                                   is_active, search_term, builder),
+                page_size, cursor, columns=columns, with_total=with_total)
+        )
+    
+    def _from_directory(self, run):
+        """
+        Run a listing against the directory, or the joined source listing
+        when the directory table does not exist.
+        
+        Args:
+            run: Callable taking the QueryBuilder to use
         """
-        params = []
+        if EmployeeRepository.directory_ready:
+            try:
+                return run(self.LIST_QUERY)
+            except Exception as e:
+                if not missing_table(e):
+                    raise
+                logger.warning("employee_directory missing; apply migration 0004")
+                EmployeeRepository.directory_ready = False
+        return run(self.SOURCE_QUERY)
+    
+    def _list_filters(self, department_id=None, supervisor_id=None,
+                      person_type=None, is_active=None, search_term=None,
+                      builder=None):
+        """Map get_all arguments to active listing filters."""
+        where = {}
         
         if department_id:
-            query += " AND p.department_id = %s"
-            params.append(department_id)
+            where['department'] = department_id
         
         if supervisor_id:
-            query += " AND es.supervisor_id = %s"
-            params.append(supervisor_id)
+            where['supervisor'] = supervisor_id
         
         if person_type:
-            type_value = person_type.value if isinstance(person_type, PersonType) else person_type
-            query += " AND p.person_type = %s"
-            params.append(type_value)
+            where['person_type'] = person_type.value if isinstance(person_type, PersonType) else person_type
         
         if is_active is not None:
-            query += " AND p.is_active = %s"
-            params.append(is_active)
+            where['is_active'] = is_active
+        
+        where.update(self.search_filter(search_term, builder))
+        
+        return where
+    
+    @classmethod
+    def directory_upsert(cls, person_id=None, department_id=None):
+        """
+        Get the statement that re-derives the directory rows a write affects.
+        
+        Run it in the writing transaction, after the write.
         
-        if search_term:
-            query += " AND (p.name LIKE %s OR p.email LIKE %s)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
+        Args:
+            person_id: Person whose row changed; the people they supervise
+                       are refreshed too (their supervisor_name)
+            department_id: Department that was renamed (all its members)
+            
+        Returns:
+            tuple: (query string, parameters)
+        """
+        if person_id is not None:
+            where = "p.person_id = %s OR es.supervisor_id = %s"
+            params = (person_id, person_id)
+        elif department_id is not None:
+            where = "p.department_id = %s"
+            params = (department_id,)
+        else:
+            raise ValueError("person_id or department_id is required")
+        return cls.DIRECTORY_UPSERT.format(where=where), params
+    
+    @classmethod
+    def refresh_directory_on(cls, cursor, person_id=None, department_id=None):
+        """
+        refresh_directory for code that manages its own connection.
+        
+        Args:
+            cursor: Cursor of the writing transaction
+            person_id, department_id: As for directory_upsert
+        """
+        try:
+            cursor.execute(*cls.directory_upsert(person_id, department_id))
+        except Exception as e:
+            if not missing_table(e):
+                raise
+    
+    def refresh_directory(self, person_id=None, department_id=None):
+        """
+        Bring the directory rows affected by a write up to date.
+        
+        Call inside the session that made the write. Does nothing while the
+        directory table does not exist.
+        
+        Args:
+            person_id, department_id: As for directory_upsert
+            
+        Returns:
+            int: Affected rows
+        """
+        if not EmployeeRepository.directory_ready:
+            return 0
+        try:
+            return self.execute_write(*self.directory_upsert(person_id, department_id))
+        except Exception as e:
+            if not missing_table(e):
+                raise
+            EmployeeRepository.directory_ready = False
+            return 0
+    
+    def clear_directory_department(self, department_id):
+        """
+        Detach a department's members in the directory.
+        
+        Deleting a department sets their person.department_id to NULL
+        through the foreign key, which fires no triggers; call this in the
+        deleting transaction. Does nothing while the directory table does
+        not exist.
+        
+        Args:
+            department_id: Department being deleted
+            
+        Returns:
+            int: Affected rows
+        """
+        if not EmployeeRepository.directory_ready:
+            return 0
+        try:
+            return self.execute_write("""
+                UPDATE employee_directory
+                SET department_id = NULL, department_name = NULL
+                WHERE department_id = %s
+            """, (department_id,))
+        except Exception as e:
+            if not missing_table(e):
+                raise
+            EmployeeRepository.directory_ready = False
+            return 0
+    
+    def rebuild_directory(self):
+        """
+        Recreate every directory row from the source tables.
         
-        query += " ORDER BY p.person_type, p.name"
+        Runs as one transaction, so readers see either the old or the
+        rebuilt projection.
         
-        return self.execute_query(query, params)
+        Returns:
+            int: Rows in the rebuilt directory
+        """
+        with self.session(transactional=True):
+            self.execute_write("DELETE FROM employee_directory")
+            self.execute_write(self.DIRECTORY_UPSERT.format(where="TRUE"))
+            rows = BaseRepository.get_count(self, "employee_directory")
+        EmployeeRepository.directory_ready = True
+        logger.info(f"Employee directory rebuilt: {rows} rows")
+        return rows
     
     def get_by_id(self, person_id):
         """
@@ -118,17 +388,23 @@ class EmployeeRepository(BaseRepository):
         Returns:
             int: Affected rows
         """
-        return self.execute_write(
-            "UPDATE person SET is_active = FALSE WHERE person_id = %s",
-            (person_id,)
-        )
+        with self.session(transactional=True):
+            rows = self.execute_write(
+                "UPDATE person SET is_active = FALSE WHERE person_id = %s",
+                (person_id,)
+            )
+            self.refresh_directory(person_id)
+        return rows
     
     def activate(self, person_id):
         """Reactivate a deactivated employee."""
-        return self.execute_write(
-            "UPDATE person SET is_active = TRUE WHERE person_id = %s",
-            (person_id,)
-        )
+        with self.session(transactional=True):
+            rows = self.execute_write(
+                "UPDATE person SET is_active = TRUE WHERE person_id = %s",
+                (person_id,)
+            )
+            self.refresh_directory(person_id)
+        return rows
     
     def get_count(self, department_id=None, is_active=True):
         """
@@ -150,6 +426,7 @@ class EmployeeRepository(BaseRepository):
         
         return super().get_count("person", " AND ".join(where_parts), params)
     
+    @cached_lookup('person', 'supervisor')
     def get_supervisors(self):
         """Get all active supervisors for dropdown."""
         query = """
@@ -161,6 +438,7 @@ class EmployeeRepository(BaseRepository):
         """
         return self.execute_query(query)
     
+    @cached_lookup('person', 'salesman')
     def get_salesmen(self):
         """Get all active salesmen for dropdown."""
         query = """
@@ -172,6 +450,7 @@ class EmployeeRepository(BaseRepository):
         """
         return self.execute_query(query)
     
+    @cached_lookup('person', 'hod')
     def get_hods(self):
         """Get all active HODs for dropdown."""
         query = """
@@ -182,3 +461,22 @@ class EmployeeRepository(BaseRepository):
             ORDER BY p.name
         """
         return self.execute_query(query)
+    
+    @cached_lookup('person', 'hod', 'departments')
+    def get_available_hods(self, current_hod_id=None):
+        """
+        Get active HODs not heading any department, for dropdown.
+        
+        Args:
+            current_hod_id: HOD of the department being edited (kept in the list)
+        """
+        query = """
+            SELECT p.person_id, p.name 
+            FROM person p
+            JOIN hod h ON p.person_id = h.person_id
+            WHERE p.is_active = TRUE 
+            AND (p.person_id NOT IN (SELECT hod_id FROM departments WHERE hod_id IS NOT NULL)
+                 OR p.person_id = %s)
+            ORDER BY p.name
+        """
+        return self.execute_query(query, (current_hod_id,))
@@ -0,0 +1,117 @@
+"""
+Import Repository - Data access for bulk order imports
+"""
+from models.base_repository import BaseRepository
+
+# innodb_autoinc_lock_mode values that give a multi-row INSERT consecutive ids
+_CONSECUTIVE_AUTOINC_MODES = (0, 1)
+
+
+class ImportRepository(BaseRepository):
+    """Repository for OrderImportService: key preloads, bulk inserts, checkpoints"""
+
+    def load_customer_ids(self):
+        """Get every customer ID (streamed, for large tables)."""
+        return {row['customer_id'] for row in self.iter_query("SELECT customer_id FROM customers")}
+
+    def load_salesman_ids(self):
+        """Get every salesman person ID."""
+        return {row['person_id'] for row in self.iter_query("SELECT person_id FROM salesman")}
+
+    def load_stock_prices(self):
+        """
+        Get the stock rows orders can draw from.
+
+        Returns:
+            dict: (warehouse_id, product_id) -> catalog unit_price
+        """
+        rows = self.iter_query("""
+            SELECT wp.warehouse_id, wp.product_id, p.unit_price
+            FROM warehouse_products wp
+            JOIN products p ON wp.product_id = p.product_id
+        """)
+        return {(row['warehouse_id'], row['product_id']): row['unit_price'] for row in rows}
+
+    def consecutive_insert_ids(self):
+        """
+        Check whether a multi-row INSERT gets consecutive auto-increment ids.
+
+        True for innodb_autoinc_lock_mode 0 (traditional) and 1
+        (consecutive); mode 2 (interleaved) may hand concurrent inserts
+        interleaved ids.
+
+        Returns:
+            tuple: (bool, auto_increment_increment)
+        """
+        row = self.execute_query(
+            "SELECT @@innodb_autoinc_lock_mode AS mode, @@auto_increment_increment AS step",
+            fetch_one=True
+        )
+        return int(row['mode']) in _CONSECUTIVE_AUTOINC_MODES, int(row['step'])
+
+    def insert_headers(self, headers, multi_row, step=1):
+        """
+        Insert order headers (total_amount starts at zero; the order_items
+        triggers maintain it).
+
+        Args:
+            headers: List of (customer_id, salesman_id, status, order_date)
+            multi_row: Insert all headers with one statement and derive the
+                       ids from the first one (only when ids are consecutive)
+            step: auto_increment_increment
+
+        Returns:
+            list: New order_ids, in header order
+        """
+        if not headers:
+            return []
+        if not multi_row:
+            return [self.execute_write("""
+                INSERT INTO orders_m (customer_id, salesman_id, total_amount, status, order_date)
+                VALUES (%s, %s, 0, %s, %s)
+            """, header) for header in headers]
+
+        values = ", ".join(["(%s, %s, 0, %s, %s)"] * len(headers))
+        first_id = self.execute_write(f"""
+            INSERT INTO orders_m (customer_id, salesman_id, total_amount, status, order_date)
+            VALUES {values}
+        """, [value for header in headers for value in header])
+        return [first_id + i * step for i in range(len(headers))]
+
+    def insert_lines(self, lines):
+        """
+        Insert order lines with batched multi-row INSERTs.
+
+        Args:
+            lines: List of (order_id, warehouse_id, product_id, qty, unit_price)
+        """
+        if lines:
+            self.execute_many("""
+                INSERT INTO order_items (order_id, warehouse_id, product_id, qty, unit_price)
+                VALUES (%s, %s, %s, %s, %s)
+            """, lines)
+
+    def get_checkpoint(self, source):
+        """Get the checkpoint row for a source file, or None."""
+        return self.execute_query(
+            "SELECT * FROM order_import_checkpoints WHERE source = %s", (source,), fetch_one=True
+        )
+
+    def save_checkpoint(self, source, fingerprint, byte_offset, line_no, orders, lines,
+                        rejected, completed=False):
+        """Create or advance the checkpoint of a source file."""
+        self.execute_write("""
+            INSERT INTO order_import_checkpoints (
+                source, fingerprint, byte_offset, line_no, orders_imported,
+                lines_imported, orders_rejected, completed
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                fingerprint = VALUES(fingerprint), byte_offset = VALUES(byte_offset),
+                line_no = VALUES(line_no), orders_imported = VALUES(orders_imported),
+                lines_imported = VALUES(lines_imported), orders_rejected = VALUES(orders_rejected),
+                completed = VALUES(completed)
+        """, (source, fingerprint, byte_offset, line_no, orders, lines, rejected, completed))
+
+    def clear_checkpoint(self, source):
+        """Forget a source file's progress (start over)."""
+        self.execute_write("DELETE FROM order_import_checkpoints WHERE source = %s", (source,))
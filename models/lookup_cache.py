@@ -0,0 +1,209 @@
+"""
+Lookup Cache
+
+Read-through TTL + LRU cache for small, frequently read lookup lists
+(departments, locations, supervisors, salesmen, HODs, customers) that feed
+dialog dropdowns.
+
+Entries are keyed by repository method and arguments and remember which
+tables they were read from. BaseRepository invalidates those tables after
+every committed write it runs; code that writes through a raw connection
+must call invalidate_tables() itself.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from utils.constants import LOOKUP_CACHE_TTL, LOOKUP_CACHE_SIZE
+
+# Tables a statement writes to (JOIN catches multi-table UPDATE/DELETE)
+_WRITE_TARGET = re.compile(
+    r"\b(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|"
+    r"DELETE\s+\w+\s+FROM|TRUNCATE\s+(?:TABLE\s+)?|JOIN)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+
+# Tables changed indirectly by triggers or ON DELETE CASCADE (see Database/schema.sql)
+_TRIGGER_TARGETS = {
+    'order_items': ('orders_m', 'warehouse_products'),
+    'orders_m': ('order_items',),
+}
+
+
+def tables_written(query):
+    """
+    Get the tables a write statement modifies.
+
+    Args:
+        query: INSERT / UPDATE / DELETE / REPLACE statement
+
+    Returns:
+        set: Lower-case table names, including trigger-maintained tables
+    """
+    tables = {name.lower() for name in _WRITE_TARGET.findall(query)}
+    for table in list(tables):
+        tables.update(_TRIGGER_TARGETS.get(table, ()))
+    return tables
+
+
+class LookupCache:
+    """
+    Thread-safe TTL + LRU cache with per-table invalidation.
+
+    Each table has a generation counter that invalidation bumps. A loader
+    records the generations before it queries, and its result is only
+    stored if none of them moved in the meantime, so a read that raced a
+    write can never repopulate the cache with pre-write data.
+    """
+
+    def __init__(self, ttl=LOOKUP_CACHE_TTL, max_entries=LOOKUP_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, tables, value)
+        self._generations = {}          # table -> int
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (True, value) on a fresh hit, else (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, entry[2]
+
+    def generations(self, tables):
+        """Snapshot the generation counters of the given tables."""
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in tables)
+
+    def put(self, key, value, tables, generations=None, ttl=None):
+        """
+        Store a value read from the given tables.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            tables: Tables the value was read from
+            generations: Result of generations(tables) taken before reading;
+                         the value is dropped if any table changed since
+            ttl: Optional per-entry TTL in seconds
+        """
+        with self._lock:
+            if generations is not None and generations != tuple(
+                    self._generations.get(table, 0) for table in tables):
+                return
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), frozenset(tables), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate_tables(self, tables):
+        """Drop every entry read from any of the given tables."""
+        tables = {table.lower() for table in tables}
+        if not tables:
+            return
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, (_, entry_tables, _) in self._entries.items()
+                     if entry_tables & tables]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Cache counters for monitoring.
+
+        Returns:
+            dict: hits, misses, invalidations, evictions and current size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            return stats
+
+
+# Process-wide cache used by @cached_lookup
+lookup_cache = LookupCache()
+
+
+def _copy(value):
+    """Shallow-copy list results so callers cannot mutate cached rows."""
+    if isinstance(value, list):
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def cached_lookup(*tables, ttl=None):
+    """
+    Cache a repository read method's result, keyed by method and arguments.
+
+    Args:
+        tables: Tables the method reads; a write to any of them invalidates
+        ttl: Optional TTL override in seconds
+
+    Usage:
+        class DepartmentRepository(BaseRepository):
+            @cached_lookup('locations')
+            def get_locations(self):
+                return self.execute_query("SELECT ...")
+
+    Calls made inside a transactional BaseRepository.session() bypass the
+    cache, since they may see the transaction's uncommitted writes.
+    """
+    tables = tuple(table.lower() for table in tables)
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            session = self.current_session()
+            if session is not None and session.transactional:
+                return func(self, *args, **kwargs)
+
+            key = (name, args, tuple(sorted(kwargs.items())))
+            hit, value = lookup_cache.get(key)
+            if hit:
+                return _copy(value)
+
+            generations = lookup_cache.generations(tables)
+            value = func(self, *args, **kwargs)
+            lookup_cache.put(key, _copy(value), tables, generations, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_tables(*tables):
+    """Invalidate cached lookups after writing to tables outside BaseRepository."""
+    lookup_cache.invalidate_tables(tables)
+
+
+def get_lookup_cache_stats():
+    """Get lookup cache counters (see LookupCache.get_stats)."""
+    return lookup_cache.get_stats()
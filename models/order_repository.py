@@ -2,11 +2,42 @@
 Order Repository - Data access for order operations
 """
 from models.base_repository import BaseRepository
+from models.query_builder import QueryBuilder, Join
 from utils.constants import OrderStatus
 
 class OrderRepository(BaseRepository):
     """Repository for Order CRUD operations"""
     
+    # Order listing, newest first
+    LIST_QUERY = QueryBuilder(
+        table="orders_m o",
+        columns=[
+            ('order_id', 'o.order_id'),
+            ('order_date', 'o.order_date'),
+            ('total_amount', 'o.total_amount'),
+            ('status', 'o.status'),
+            ('customer_name', 'c.name'),
+            ('salesman_name', 'p.name'),
+            ('salesman_id', 'o.salesman_id'),
+            ('customer_id', 'o.customer_id')
+        ],
+        joins=[
+            Join('c', "JOIN customers c ON o.customer_id = c.customer_id"),
+            Join('p', "JOIN person p ON o.salesman_id = p.person_id")
+        ],
+        filters={
+            'salesman': "o.salesman_id = %s",
+            'status': "o.status = %s",
+            'search': "c.name LIKE %s",
+            'search_id': "(c.name LIKE %s OR o.order_id = %s)"
+        },
+        order_by=[('o.order_date', 'order_date'), ('o.order_id', 'order_id')],
+        descending=True
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('customer_name',)
+    
     def get_all(self, salesman_id=None, status=None, search_term=None):
         """
         Get orders with filters.
@@ -19,40 +50,64 @@ class OrderRepository(BaseRepository):
         Returns:
             list: List of order dicts
         """
-        query = """
-            SELECT 
-                o.order_id, o.order_date, o.total_amount, o.status,
-                c.name AS customer_name,
-                p.name AS salesman_name,
-                o.salesman_id, o.customer_id
-            FROM orders_m o
-            JOIN customers c ON o.customer_id = c.customer_id
-            JOIN person p ON o.salesman_id = p.person_id
-            WHERE 1=1
+        where = self._list_filters(salesman_id, status, search_term)
+        return self.execute_query(*self.LIST_QUERY.build(where))
+    
+    def get_page(self, salesman_id=None, status=None, search_term=None,
+                 page_size=None, cursor=None, with_total=False):
         """
-        params = []
+        Get one page of orders (newest first) using keyset pagination.
+        
+        Args:
+            salesman_id, status, search_term: Same filters as get_all
+            page_size: Rows per page (default DEFAULT_PAGE_SIZE)
+            cursor: next_cursor / prev_cursor from a previous page
+            with_total: Include an approximate total (or 'exact')
+            
+        Returns:
+            dict: Page with 'rows', 'next_cursor', 'prev_cursor'
+        """
+        where = self._list_filters(salesman_id, status, search_term)
+        return self.execute_page(self.LIST_QUERY, where, page_size, cursor,
+                                 with_total=with_total)
+    
+    def iter_all(self, salesman_id=None, status=None, search_term=None, chunk_size=None):
+        """
+        Stream orders with the same filters as get_all, in constant memory.
+        
+        Args:
+            chunk_size: Rows fetched per round trip (default STREAM_CHUNK_SIZE)
+            
+        Yields:
+            dict: One order row at a time
+        """
+        query, params = self.LIST_QUERY.build(self._list_filters(salesman_id, status, search_term))
+        return self.iter_query(query, params, chunk_size=chunk_size)
+    
+    def _list_filters(self, salesman_id=None, status=None, search_term=None):
+        """Map get_all arguments to active LIST_QUERY filters."""
+        where = {}
         
         if salesman_id:
-            query += " AND o.salesman_id = %s"
-            params.append(salesman_id)
+            where['salesman'] = salesman_id
         
         if status and status != 'All':
             # Handle enum or string
-            status_val = status.value if hasattr(status, 'value') else status
-            query += " AND o.status = %s"
-            params.append(status_val)
+            where['status'] = status.value if hasattr(status, 'value') else status
         
         if search_term:
             if search_term.isdigit():
-                query += " AND (c.name LIKE %s OR o.order_id = %s)"
-                params.extend([f"%{search_term}%", search_term])
+                where['search_id'] = [f"%{search_term}%", search_term]
             else:
-                query += " AND c.name LIKE %s"
-                params.append(f"%{search_term}%")
-        
-        query += " ORDER BY o.order_date DESC"
+                where['search'] = f"%{search_term}%"
         
-        return self.execute_query(query, params)
+        return where
+    
+    def search_predicate(self, search_term):
+        """Numeric terms also match order_id exactly, so never refine them."""
+        if search_term.isdigit():
+            return None
+        return super().search_predicate(search_term)
     
     def get_by_id(self, order_id):
         """Get order by ID"""
@@ -70,13 +125,18 @@ class OrderRepository(BaseRepository):
         """
         return self.execute_query(query, (order_id,))
     
-    def create_order(self, customer_id, salesman_id, total_amount, status, order_date):
-        """Create order header"""
+    def create_order(self, customer_id, salesman_id, status, order_date):
+        """
+        Create order header.
+        
+        total_amount starts at zero; the order_items triggers maintain it
+        as lines are added and removed.
+        """
         query = """
             INSERT INTO orders_m (customer_id, salesman_id, total_amount, status, order_date)
-            VALUES (%s, %s, %s, %s, %s)
+            VALUES (%s, %s, 0, %s, %s)
         """
-        return self.execute_write(query, (customer_id, salesman_id, total_amount, status, order_date))
+        return self.execute_write(query, (customer_id, salesman_id, status, order_date))
     
     def add_item(self, order_id, warehouse_id, product_id, qty, unit_price):
         """Add item to order"""
@@ -86,11 +146,193 @@ class OrderRepository(BaseRepository):
         """
         return self.execute_write(query, (order_id, warehouse_id, product_id, qty, unit_price))
     
-    def delete_order(self, order_id):
-        """Delete order and items (cascading assumed or handled in logic)"""
-        # Logic to return stock is handled in Service layer, repository just deletes
-        self.execute_write("DELETE FROM order_items WHERE order_id = %s", (order_id,))
-        return self.execute_write("DELETE FROM orders_m WHERE order_id = %s", (order_id,))
+    def add_items(self, order_id, items):
+        """
+        Insert order lines in one batched statement.
+        
+        The order_items triggers add each row's amount to the order total
+        (and, before migration 0006, check and deduct its stock).
+        
+        Args:
+            order_id: Order the lines belong to
+            items: Iterable of dicts with warehouse_id, product_id, qty, unit_price
+            
+        Returns:
+            int: Number of inserted rows
+        """
+        rows = [(order_id, item['warehouse_id'], item['product_id'], item['qty'], item['unit_price'])
+                for item in items]
+        if not rows:
+            return 0
+        return self.execute_many("""
+            INSERT INTO order_items (order_id, warehouse_id, product_id, qty, unit_price)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows)
+    
+    def delete_items(self, order_id, order_item_ids):
+        """
+        Delete order lines in one statement (before migration 0006 the
+        triggers restore their stock).
+        
+        Args:
+            order_id: Order the lines belong to
+            order_item_ids: Lines to delete
+            
+        Returns:
+            int: Number of deleted rows
+        """
+        ids = list(order_item_ids)
+        if not ids:
+            return 0
+        placeholders = ", ".join(["%s"] * len(ids))
+        return self.execute_write(
+            f"DELETE FROM order_items WHERE order_id = %s AND order_item_id IN ({placeholders})",
+            (order_id, *ids)
+        )
+    
+    def lock_order(self, order_id):
+        """
+        Lock an order header for the current transaction.
+        
+        Returns:
+            dict or None: order_id and status
+        """
+        return self.execute_query(
+            "SELECT order_id, status FROM orders_m WHERE order_id = %s FOR UPDATE",
+            (order_id,), fetch_one=True
+        )
+    
+    def update_status(self, order_id, status):
+        """Set an order's status"""
+        return self.execute_write(
+            "UPDATE orders_m SET status = %s WHERE order_id = %s", (status, order_id)
+        )
+    
+    def get_item_totals(self, order_id, order_item_ids=None):
+        """
+        Get an order's quantities per stock row.
+        
+        Args:
+            order_id: Order to total
+            order_item_ids: Optional subset of its lines
+            
+        Returns:
+            dict: (warehouse_id, product_id) -> total qty
+        """
+        params = [order_id]
+        lines = ""
+        if order_item_ids is not None:
+            ids = list(order_item_ids)
+            if not ids:
+                return {}
+            lines = f"AND order_item_id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
+        rows = self.execute_query(f"""
+            SELECT warehouse_id, product_id, SUM(qty) as qty
+            FROM order_items
+            WHERE order_id = %s {lines}
+            GROUP BY warehouse_id, product_id
+        """, params)
+        return {(row['warehouse_id'], row['product_id']): int(row['qty']) for row in rows}
+    
+    def lock_orders(self, order_ids):
+        """
+        Lock order headers for the current transaction, in order_id order.
+        
+        Args:
+            order_ids: Orders to lock
+            
+        Returns:
+            dict: order_id -> status for the orders that exist
+        """
+        ids = sorted(set(order_ids))
+        if not ids:
+            return {}
+        rows = self.execute_query(f"""
+            SELECT order_id, status FROM orders_m
+            WHERE order_id IN ({', '.join(['%s'] * len(ids))})
+            ORDER BY order_id
+            FOR UPDATE
+        """, ids)
+        return {row['order_id']: row['status'] for row in rows}
+    
+    def get_stock_keys(self, order_ids):
+        """
+        Get the stock rows the lines of orders draw from.
+        
+        Cancelled orders are skipped, as in restore_stock.
+        
+        Args:
+            order_ids: Orders to look up
+            
+        Returns:
+            list: (warehouse_id, product_id) pairs, in key order
+        """
+        ids = list(order_ids)
+        if not ids:
+            return []
+        rows = self.execute_query(f"""
+            SELECT DISTINCT oi.warehouse_id, oi.product_id
+            FROM order_items oi
+            JOIN orders_m o ON oi.order_id = o.order_id
+            WHERE oi.order_id IN ({', '.join(['%s'] * len(ids))})
+              AND o.status <> %s
+            ORDER BY oi.warehouse_id, oi.product_id
+        """, (*ids, OrderStatus.CANCELLED.value))
+        return [(row['warehouse_id'], row['product_id']) for row in rows]
+    
+    def restore_stock(self, order_ids):
+        """
+        Return the quantities of orders to stock in one statement.
+        
+        The lines are summed per stock row first, so each row is updated
+        once however many lines and orders refer to it. Cancelled orders
+        are skipped: their stock was returned when they were cancelled.
+        Lock the rows first (ProductRepository.lock_stock on get_stock_keys),
+        so they are locked in key order like every other stock write.
+        
+        Args:
+            order_ids: Orders whose lines go back to stock
+            
+        Returns:
+            int: Stock rows updated
+        """
+        ids = list(order_ids)
+        if not ids:
+            return 0
+        return self.execute_write(f"""
+            UPDATE warehouse_products wp
+            JOIN (
+                SELECT oi.warehouse_id, oi.product_id, SUM(oi.qty) as qty
+                FROM order_items oi
+                JOIN orders_m o ON oi.order_id = o.order_id
+                WHERE oi.order_id IN ({', '.join(['%s'] * len(ids))})
+                  AND o.status <> %s
+                GROUP BY oi.warehouse_id, oi.product_id
+            ) oi ON wp.warehouse_id = oi.warehouse_id AND wp.product_id = oi.product_id
+            SET wp.qty = wp.qty + oi.qty
+        """, (*ids, OrderStatus.CANCELLED.value))
+    
+    def delete_orders(self, order_ids):
+        """
+        Delete order headers; their lines go with them (ON DELETE CASCADE).
+        
+        Cascaded deletes do not fire the order_items triggers, so no
+        per-line total or stock updates run; return the stock with
+        restore_stock first, in the same transaction.
+        
+        Args:
+            order_ids: Orders to delete
+            
+        Returns:
+            int: Number of deleted orders
+        """
+        ids = list(order_ids)
+        if not ids:
+            return 0
+        return self.execute_write(
+            f"DELETE FROM orders_m WHERE order_id IN ({', '.join(['%s'] * len(ids))})", ids
+        )
     
     def get_total_count(self, salesman_id=None):
         """Get total order count"""
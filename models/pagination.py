@@ -0,0 +1,68 @@
+"""
+Keyset Pagination Helpers
+
+Opaque cursors for seek-based paging. A cursor records the sort-key values
+of the boundary row and the direction to read in, so the next query can
+continue with ``WHERE (keys) > (values)`` instead of an OFFSET scan.
+"""
+import base64
+import json
+
+from utils.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+NEXT = 'next'
+PREV = 'prev'
+
+
+def clamp_page_size(page_size):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE (default DEFAULT_PAGE_SIZE)."""
+    if not page_size:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+
+def encode_cursor(values, direction=NEXT):
+    """
+    Encode boundary key values into an opaque cursor string.
+
+    Args:
+        values: Sort-key values of the boundary row (dates become ISO strings)
+        direction: NEXT or PREV
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = json.dumps({'k': list(values), 'd': direction}, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, key_count):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor token
+        key_count: Number of key columns the cursor must carry
+
+    Returns:
+        tuple: (list of key values, direction)
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another keyset
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        values = payload['k']
+        direction = payload['d']
+    except Exception:
+        raise ValueError("Invalid page cursor")
+
+    if direction not in (NEXT, PREV) or len(values) != key_count:
+        raise ValueError("Invalid page cursor")
+
+    return values, direction
+
+
+def row_key(row, keyset):
+    """Extract the keyset values from a result row."""
+    return [row[field] for _, field in keyset]
@@ -0,0 +1,313 @@
+"""
+Product Index
+
+In-memory search index over the in-stock warehouse products, backing the
+order dialog's product picker.
+
+Every product name, product type and warehouse name is split into folded
+words, and each (word, stock key) pair is kept in one sorted list, so the
+stock rows with a word starting with a typed prefix are a contiguous slice
+found by bisection. A query takes the narrowest slice of its words and
+checks the other words against each row's own words, then ranks the
+matches (product name, then warehouse). Large slices - short prefixes such
+as a single letter - are ranked once and memoised with their key sets:
+a one-word query reads its top rows straight from that list, and a query
+whose words are all short intersects their sets. Single-letter
+slices are ranked when the index loads, so no keystroke ranks more than a
+few thousand rows.
+
+The index is loaded once per process on a worker thread and shared by all
+dialogs. refresh() keeps it current: after a write through the repositories
+(or once PRODUCT_INDEX_REFRESH_SECONDS passed) it re-reads only the stock
+rows whose updated_at moved (migration 0009) and patches them in; changes
+to products or warehouses, and databases without updated_at, rebuild it.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import timedelta
+
+from models.lookup_cache import lookup_cache
+from models.product_repository import ProductRepository
+from models.search import tokens
+from utils.constants import (
+    PRODUCT_PICKER_RESULTS, PRODUCT_INDEX_REFRESH_SECONDS,
+    PRODUCT_INDEX_RELOAD_SECONDS, PRODUCT_INDEX_OVERLAP_SECONDS
+)
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Tables the index is built from; a stock write is patched in, the others rebuild
+_TABLES = ('warehouse_products', 'products', 'warehouses')
+
+# Sorts after every word that starts with a given prefix
+_PREFIX_END = '\U0010ffff'
+
+# Word slices longer than this are ranked once and memoised, with their
+# key sets for intersecting; at most _MEMO_SIZE of them are kept
+_WALK_FROM = 2000
+_MEMO_SIZE = 64
+
+
+class ProductIndex:
+    """
+    Prefix/word index of in-stock products.
+
+    Usage:
+        product_index.refresh()                   # worker thread
+        product_index.search("red chair main")   # Tk thread, top matches
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()           # guards the index structures
+        self._refresh_lock = threading.Lock()   # one loader at a time
+        self._entries = {}    # (warehouse_id, product_id) -> row dict with 'display'
+        self._meta = {}       # key -> (rank, words, haystack)
+        self._postings = []   # sorted (word, key)
+        self._ranked = []     # sorted (rank, key): display order
+        self._memo = OrderedDict()   # word prefix -> its slice's keys (ranked, set)
+        self._ready = False
+        self._watermark = None     # server time the last load / change check started
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._generations = None
+
+    @property
+    def ready(self):
+        """True once the index has been loaded."""
+        return self._ready
+
+    def __len__(self):
+        return len(self._entries)
+
+    def refresh(self):
+        """
+        Load the index, or bring it up to date (blocking; call off the Tk thread).
+
+        Returns:
+            ProductIndex: self
+        """
+        with self._refresh_lock:
+            generations = lookup_cache.generations(_TABLES)
+            now = time.monotonic()
+            if (not self._ready
+                    or now - self._loaded_at >= PRODUCT_INDEX_RELOAD_SECONDS
+                    or generations[1:] != self._generations[1:]):
+                self._reload()
+            elif generations[0] != self._generations[0] or \
+                    now - self._checked_at >= PRODUCT_INDEX_REFRESH_SECONDS:
+                if not self._apply_changes():
+                    self._reload()
+            self._generations = generations
+        return self
+
+    def search(self, text, limit=PRODUCT_PICKER_RESULTS):
+        """
+        Find in-stock products with a word starting with every typed word.
+
+        Args:
+            text: Query as typed; matched against product name, product
+                  type and warehouse name, case- and accent-insensitively
+            limit: Maximum number of matches
+
+        Returns:
+            list: Row dicts (warehouse_id, product_id, qty, product_name,
+                  product_type, unit_price, warehouse_name, display) in
+                  display order
+        """
+        words = set(tokens(text))
+        with self._lock:
+            if not words:
+                return [self._entries[key] for _, key in self._ranked[:limit]]
+
+            slices = []
+            for word in words:
+                lo = bisect_left(self._postings, (word,))
+                hi = bisect_left(self._postings, (word + _PREFIX_END,), lo)
+                if lo == hi:
+                    return []
+                slices.append((hi - lo, lo, hi, word))
+            slices.sort()
+            meta = self._meta
+
+            size, lo, hi, word = slices[0]
+            if size <= _WALK_FROM:
+                candidates = {key for _, key in self._postings[lo:hi]}
+                others = [word for _, _, _, word in slices[1:]]
+            elif len(slices) == 1:
+                return [self._entries[key] for key in self._ranked_slice(word, lo, hi)[0][:limit]]
+            else:
+                # Every slice is large: intersect their key sets
+                candidates = frozenset.intersection(
+                    *(self._ranked_slice(word, lo, hi)[1] for _, lo, hi, word in slices)
+                )
+                others = []
+
+            # Each remaining word must start one of the row's words
+            for word in others:
+                needle = '\0' + word
+                candidates = [key for key in candidates if needle in meta[key][2]]
+            best = heapq.nsmallest(limit, candidates, key=lambda key: meta[key][0])
+            return [self._entries[key] for key in best]
+
+    # ---- internals -------------------------------------------------------
+
+    def _reload(self):
+        """Rebuild the whole index from the in-stock rows."""
+        started = time.perf_counter()
+        repo = ProductRepository()
+        watermark = repo.get_server_time()
+
+        entries, meta, postings, ranked = {}, {}, [], []
+        folded = {}   # warehouse names and types repeat; fold each once
+        for row in repo.iter_stock_entries():
+            key, entry, info = self._entry(row, folded)
+            entries[key] = entry
+            meta[key] = info
+            postings.extend((word, key) for word in info[1])
+            ranked.append((info[0], key))
+        postings.sort()
+        ranked.sort()
+        memo = self._rank_letters(postings, meta)
+
+        with self._lock:
+            self._entries, self._meta = entries, meta
+            self._postings, self._ranked = postings, ranked
+            self._memo = memo
+            self._ready = True
+        self._watermark = watermark
+        self._loaded_at = self._checked_at = time.monotonic()
+        logger.info(f"Product index loaded: {len(entries)} stock rows, {len(postings)} words "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _apply_changes(self):
+        """
+        Patch in the stock rows changed since the last load or check.
+
+        Rows are re-read from PRODUCT_INDEX_OVERLAP_SECONDS before that
+        point, so a transaction that committed after the previous check
+        with an earlier timestamp is not missed; re-applying a row is
+        harmless.
+
+        Returns:
+            bool: False if changes cannot be tracked (migration 0009 not
+                  applied)
+        """
+        if self._watermark is None or not ProductRepository.stock_changes_ready:
+            return False
+        repo = ProductRepository()
+        checked = repo.get_server_time()
+        rows = repo.get_stock_changes(self._watermark - timedelta(seconds=PRODUCT_INDEX_OVERLAP_SECONDS))
+        if rows is None:
+            return False
+
+        with self._lock:
+            for row in rows:
+                key = (row['warehouse_id'], row['product_id'])
+                if key in self._entries:
+                    self._remove(key)
+                if row['qty'] > 0:
+                    key, entry, info = self._entry(row)
+                    self._entries[key] = entry
+                    self._meta[key] = info
+                    for word in info[1]:
+                        insort(self._postings, (word, key))
+                    insort(self._ranked, (info[0], key))
+            if rows:
+                self._memo.clear()
+        if rows:
+            memo = self._rank_letters(self._postings, self._meta)
+            with self._lock:
+                self._memo.update(memo)
+        self._watermark = checked
+        self._checked_at = time.monotonic()
+        logger.debug(f"Product index patched with {len(rows)} changed stock rows")
+        return True
+
+    def _remove(self, key):
+        """Drop one stock row (caller holds the lock)."""
+        rank, words, _ = self._meta.pop(key)
+        del self._entries[key]
+        for word in words:
+            self._discard(self._postings, (word, key))
+        self._discard(self._ranked, (rank, key))
+
+    def _ranked_slice(self, word, lo, hi):
+        """Memoised _rank of a large slice (caller holds the lock)."""
+        ranked = self._memo.get(word)
+        if ranked is None:
+            ranked = self._memo[word] = self._rank(self._postings[lo:hi], self._meta)
+            while len(self._memo) > _MEMO_SIZE:
+                self._memo.popitem(last=False)
+        self._memo.move_to_end(word)
+        return ranked
+
+    @staticmethod
+    def _rank(postings, meta):
+        """
+        Keys of a postings slice, once each.
+
+        Returns:
+            tuple: (keys in display order, frozenset of the keys)
+        """
+        keys = frozenset(key for _, key in postings)
+        return sorted(keys, key=lambda key: meta[key][0]), keys
+
+    @classmethod
+    def _rank_letters(cls, postings, meta):
+        """
+        Rank the large single-letter slices up front (only the refresh
+        thread modifies postings, so they can be read without the lock).
+
+        Returns:
+            OrderedDict: letter -> _rank result, for the memo
+        """
+        memo = OrderedDict()
+        lo = 0
+        while lo < len(postings):
+            letter = postings[lo][0][:1]
+            hi = bisect_left(postings, (letter + _PREFIX_END,), lo)
+            if hi - lo > _WALK_FROM:
+                memo[letter] = cls._rank(postings[lo:hi], meta)
+            lo = hi
+        return memo
+
+    @staticmethod
+    def _discard(items, item):
+        """Delete item from a sorted list."""
+        i = bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+
+    @staticmethod
+    def _entry(row, folded=None):
+        """
+        Build the stored entry of a stock row.
+
+        Returns:
+            tuple: (key, entry, (rank, words, haystack))
+        """
+        def fold(value):
+            if folded is None:
+                return tokens(value)
+            if value not in folded:
+                folded[value] = tokens(value)
+            return folded[value]
+
+        key = (row['warehouse_id'], row['product_id'])
+        entry = dict(row)
+        kind = f" ({row['product_type']})" if row.get('product_type') else ""
+        entry['display'] = (f"{row['product_name']}{kind} ${row['unit_price']} - "
+                            f"{row['warehouse_name']} [Qty: {row['qty']}]")
+
+        name, warehouse = tokens(row['product_name']), fold(row['warehouse_name'])
+        words = frozenset(name + fold(row['product_type']) + warehouse)
+        rank = (' '.join(name), ' '.join(warehouse), key)
+        haystack = ''.join('\0' + word for word in words)
+        return key, entry, (rank, words, haystack)
+
+
+product_index = ProductIndex()
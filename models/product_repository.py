@@ -1,11 +1,56 @@
 """
 Product Repository - Data access for product operations
 """
-from models.base_repository import BaseRepository
+from models.base_repository import BaseRepository, missing_column, missing_table
+from models.query_builder import QueryBuilder, Join
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
 
 class ProductRepository(BaseRepository):
     """Repository for Product CRUD operations"""
     
+    # False once is_low_stock turned out to be missing (migration 0008 not
+    # applied); low-stock reads then compare qty with reorder_level
+    low_stock_ready = True
+    
+    # Warehouse stock listing, by warehouse then product
+    LIST_QUERY = QueryBuilder(
+        table="warehouse_products wp",
+        columns=[
+            ('product_id', 'p.product_id'),
+            ('product_name', 'p.product_name'),
+            ('product_type', 'p.product_type'),
+            ('unit_price', 'p.unit_price'),
+            ('warehouse_name', 'w.warehouse_name'),
+            ('qty', 'wp.qty'),
+            ('reorder_level', 'wp.reorder_level'),
+            ('warehouse_product_id', 'wp.warehouse_product_id'),
+            ('warehouse_id', 'wp.warehouse_id')
+        ],
+        joins=[
+            Join('p', "JOIN products p ON wp.product_id = p.product_id"),
+            Join('w', "JOIN warehouses w ON wp.warehouse_id = w.warehouse_id")
+        ],
+        filters={
+            'supervisor': "w.supervisor_id = %s",
+            'search': "(p.product_name LIKE %s OR p.product_type LIKE %s)",
+            'search_ft': "MATCH(p.product_name, p.product_type) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        rankings={
+            'search_ft': "MATCH(p.product_name, p.product_type) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        order_by=[
+            ('w.warehouse_name', 'warehouse_name'),
+            ('p.product_name', 'product_name'),
+            ('wp.warehouse_product_id', 'warehouse_product_id')
+        ]
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('product_name', 'product_type')
+    
     def get_all(self, supervisor_id=None, search_term=None):
         """
         Get products with filters.
@@ -17,35 +62,37 @@ class ProductRepository(BaseRepository):
         Returns:
             list: List of product dicts
         """
-        query = """
-            SELECT 
-                p.product_id,
-                p.product_name,
-                p.product_type,
-                p.unit_price,
-                w.warehouse_name,
-                wp.qty,
-                wp.reorder_level,
-                wp.warehouse_product_id,
-                wp.warehouse_id
-            FROM warehouse_products wp
-            JOIN products p ON wp.product_id = p.product_id
-            JOIN warehouses w ON wp.warehouse_id = w.warehouse_id
-            WHERE 1=1
+        where = self._list_filters(supervisor_id, search_term)
+        return self.execute_query(*self.LIST_QUERY.build(where, ranked=True))
+    
+    def get_page(self, supervisor_id=None, search_term=None, page_size=None,
+                 cursor=None, with_total=False):
         """
-        params = []
+        Get one page of warehouse products using keyset pagination.
         
-        if supervisor_id:
-            query += " AND w.supervisor_id = %s"
-            params.append(supervisor_id)
+        Args:
+            supervisor_id, search_term: Same filters as get_all
+            page_size: Rows per page (default DEFAULT_PAGE_SIZE)
+            cursor: next_cursor / prev_cursor from a previous page
+            with_total: Include an approximate total (or 'exact')
+            
+        Returns:
+            dict: Page with 'rows', 'next_cursor', 'prev_cursor'
+        """
+        where = self._list_filters(supervisor_id, search_term)
+        return self.execute_page(self.LIST_QUERY, where, page_size, cursor,
+                                 with_total=with_total)
+    
+    def _list_filters(self, supervisor_id=None, search_term=None):
+        """Map get_all arguments to active LIST_QUERY filters."""
+        where = {}
         
-        if search_term:
-            query += " AND (p.product_name LIKE %s OR p.product_type LIKE %s)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
+        if supervisor_id:
+            where['supervisor'] = supervisor_id
         
-        query += " ORDER BY w.warehouse_name, p.product_name"
+        where.update(self.search_filter(search_term))
         
-        return self.execute_query(query, params)
+        return where
     
     def get_by_id(self, product_id, warehouse_id):
         """
@@ -117,26 +164,244 @@ class ProductRepository(BaseRepository):
             (product_id, warehouse_id)
         )
     
+    def lock_stock(self, keys):
+        """
+        Lock stock rows for the current transaction and read their quantities.
+        
+        The rows are locked in (warehouse_id, product_id) order, the order
+        of the unique index the lookup scans, so transactions locking
+        overlapping sets always take the locks in the same order.
+        
+        Args:
+            keys: Iterable of (warehouse_id, product_id)
+            
+        Returns:
+            dict: (warehouse_id, product_id) -> qty for the rows that exist
+        """
+        keys = sorted(set(keys))
+        if not keys:
+            return {}
+        placeholders = ", ".join(["(%s, %s)"] * len(keys))
+        rows = self.execute_query(f"""
+            SELECT warehouse_id, product_id, qty
+            FROM warehouse_products
+            WHERE (warehouse_id, product_id) IN ({placeholders})
+            ORDER BY warehouse_id, product_id
+            FOR UPDATE
+        """, [value for key in keys for value in key])
+        return {(row['warehouse_id'], row['product_id']): row['qty'] for row in rows}
+    
+    def adjust_stock(self, quantities, take):
+        """
+        Take quantities out of stock, or put them back, in one statement.
+        
+        Taking is conditional: a row is only decremented if it holds at
+        least the requested quantity, so stock never goes negative.
+        
+        Args:
+            quantities: (warehouse_id, product_id) -> qty (positive)
+            take: True to decrement, False to increment
+            
+        Returns:
+            int: Stock rows changed (fewer than len(quantities) when taking
+                 means some rows were short)
+        """
+        keys = sorted(key for key, qty in quantities.items() if qty > 0)
+        if not keys:
+            return 0
+        rows = " UNION ALL ".join(
+            ["SELECT %s AS warehouse_id, %s AS product_id, %s AS qty"] * len(keys)
+        )
+        change = "wp.qty - r.qty WHERE wp.qty >= r.qty" if take else "wp.qty + r.qty"
+        return self.execute_write(f"""
+            UPDATE warehouse_products wp
+            JOIN ({rows}) r ON wp.warehouse_id = r.warehouse_id AND wp.product_id = r.product_id
+            SET wp.qty = {change}
+        """, [value for key in keys for value in (*key, quantities[key])])
+    
+    def stock_moved_by_triggers(self):
+        """
+        Check whether the order_items triggers still move stock (migration
+        0006 not applied).
+        
+        Returns:
+            bool: True if an order_items trigger writes warehouse_products
+        """
+        result = self.execute_query("""
+            SELECT COUNT(*) as count
+            FROM information_schema.TRIGGERS
+            WHERE TRIGGER_SCHEMA = DATABASE()
+            AND EVENT_OBJECT_TABLE = 'order_items'
+            AND ACTION_STATEMENT LIKE '%%warehouse_products%%'
+        """, fetch_one=True)
+        return bool(result and result['count'])
+    
+    # Stock rows as the order dialog's product picker indexes them
+    # (models/product_index.py)
+    STOCK_ENTRY_QUERY = """
+        SELECT
+            wp.warehouse_id, wp.product_id, wp.qty,
+            p.product_name, p.product_type, p.unit_price,
+            w.warehouse_name
+        FROM warehouse_products wp
+        JOIN products p ON wp.product_id = p.product_id
+        JOIN warehouses w ON wp.warehouse_id = w.warehouse_id
+        WHERE {where}
+    """
+    
+    # False once warehouse_products.updated_at turned out to be missing
+    # (migration 0009 not applied); the picker then reloads everything
+    stock_changes_ready = True
+    
+    def iter_stock_entries(self):
+        """Stream every in-stock row the product picker offers."""
+        return self.iter_query(self.STOCK_ENTRY_QUERY.format(where="wp.qty > 0"))
+    
+    def get_stock_changes(self, since):
+        """
+        Get the stock rows changed at or after a server time, including
+        rows that ran out of stock.
+        
+        Args:
+            since: Server timestamp (see get_server_time)
+            
+        Returns:
+            list: Row dicts, or None if warehouse_products.updated_at does
+                  not exist
+        """
+        if not ProductRepository.stock_changes_ready:
+            return None
+        try:
+            return self.execute_query(
+                self.STOCK_ENTRY_QUERY.format(where="wp.updated_at >= %s"), (since,)
+            )
+        except Exception as e:
+            if not missing_column(e):
+                raise
+            logger.warning("warehouse_products.updated_at missing; apply migration 0009")
+            ProductRepository.stock_changes_ready = False
+            return None
+    
+    def get_server_time(self):
+        """Get the database server's current timestamp."""
+        return self.execute_query("SELECT CURRENT_TIMESTAMP as now", fetch_one=True)['now']
+    
     def get_low_stock_count(self):
         """Get count of items below reorder level"""
-        query = "SELECT COUNT(*) as count FROM warehouse_products WHERE qty <= reorder_level"
-        result = self.execute_query(query, fetch_one=True)
+        def run(indexed):
+            low = "is_low_stock = 1" if indexed else "qty <= reorder_level"
+            return self.execute_query(
+                f"SELECT COUNT(*) as count FROM warehouse_products WHERE {low}", fetch_one=True
+            )
+        result = self._low_stock(run)
         return result['count'] if result else 0
     
-    def get_low_stock_items(self, limit=10):
-        """Get items with stock below reorder level"""
-        query = """
-            SELECT 
-                p.product_id,
-                p.product_name,
-                w.warehouse_name,
-                wp.qty,
-                wp.reorder_level
-            FROM warehouse_products wp
-            JOIN products p ON wp.product_id = p.product_id
-            JOIN warehouses w ON wp.warehouse_id = w.warehouse_id
-            WHERE wp.qty <= wp.reorder_level
-            ORDER BY wp.qty ASC
-            LIMIT %s
+    def get_low_stock_items(self, limit=10, since_event_id=None):
+        """
+        Get items with stock below reorder level, lowest stock first.
+        
+        Args:
+            limit: Maximum number of items
+            since_event_id: Flag items that went low after this
+                            low_stock_events ID with is_new
+            
+        Returns:
+            list: Item dicts
+        """
+        def run(indexed):
+            params = []
+            is_new = "FALSE"
+            if indexed and since_event_id is not None:
+                is_new = """EXISTS (
+                    SELECT 1 FROM low_stock_events e
+                    WHERE e.warehouse_id = wp.warehouse_id AND e.product_id = wp.product_id
+                    AND e.event_type = 'LOW' AND e.event_id > %s
+                )"""
+                params.append(since_event_id)
+            params.append(limit)
+            return self.execute_query(f"""
+                SELECT 
+                    p.product_id,
+                    p.product_name,
+                    w.warehouse_name,
+                    wp.qty,
+                    wp.reorder_level,
+                    {is_new} as is_new
+                FROM warehouse_products wp
+                JOIN products p ON wp.product_id = p.product_id
+                JOIN warehouses w ON wp.warehouse_id = w.warehouse_id
+                WHERE {"wp.is_low_stock = 1" if indexed else "wp.qty <= wp.reorder_level"}
+                ORDER BY wp.qty ASC
+                LIMIT %s
+            """, params)
+        return self._low_stock(run)
+    
+    def count_new_low_stock(self, since_event_id):
+        """
+        Count items that went low after a low_stock_events ID and still are.
+        
+        Reads only the events after since_event_id.
+        
+        Returns:
+            int: Number of items (0 before migration 0008)
+        """
+        def run(indexed):
+            if not indexed:
+                return None
+            return self.execute_query("""
+                SELECT COUNT(DISTINCT e.warehouse_id, e.product_id) as count
+                FROM low_stock_events e
+                JOIN warehouse_products wp
+                    ON wp.warehouse_id = e.warehouse_id AND wp.product_id = e.product_id
+                WHERE e.event_id > %s AND e.event_type = 'LOW' AND wp.is_low_stock = 1
+            """, (since_event_id,), fetch_one=True)
+        result = self._low_stock(run)
+        return result['count'] if result else 0
+    
+    def get_latest_low_stock_event(self):
+        """Get the newest low_stock_events ID (0 if none, None before migration 0008)."""
+        def run(indexed):
+            if not indexed:
+                return None
+            result = self.execute_query(
+                "SELECT COALESCE(MAX(event_id), 0) as event_id FROM low_stock_events", fetch_one=True
+            )
+            return result['event_id'] if result else 0
+        return self._low_stock(run)
+    
+    def get_low_stock_seen(self, person_id):
+        """Get the last low_stock_events ID a person has seen (0 if never)."""
+        def run(indexed):
+            if not indexed:
+                return None
+            return self.execute_query(
+                "SELECT last_event_id FROM low_stock_views WHERE person_id = %s",
+                (person_id,), fetch_one=True
+            )
+        result = self._low_stock(run)
+        return result['last_event_id'] if result else 0
+    
+    def mark_low_stock_seen(self, person_id, event_id):
+        """Record that a person has seen the low-stock events up to event_id."""
+        self.execute_write("""
+            INSERT INTO low_stock_views (person_id, last_event_id) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE last_event_id = GREATEST(last_event_id, VALUES(last_event_id))
+        """, (person_id, event_id))
+    
+    def _low_stock(self, run):
+        """
+        Run a low-stock read against the indexed is_low_stock column, or
+        the plain qty <= reorder_level comparison when it does not exist.
+        
+        Args:
+            run: Callable taking True for the indexed (migration 0008) schema
         """
-        return self.execute_query(query, (limit,))
+        if ProductRepository.low_stock_ready:
+            try:
+                return run(True)
+            except Exception as e:
+                if not (missing_column(e) or missing_table(e)):
+                    raise
+                logger.warning("is_low_stock missing; apply migration 0008")
+                ProductRepository.low_stock_ready = False
+        return run(False)
@@ -2,11 +2,43 @@
 Project Repository - Data access for project operations
 """
 from models.base_repository import BaseRepository
+from models.query_builder import QueryBuilder, Join
 from utils.constants import ProjectStatus
 
 class ProjectRepository(BaseRepository):
     """Repository for Project CRUD operations"""
     
+    # Project listing
+    LIST_QUERY = QueryBuilder(
+        table="projects p",
+        columns=[
+            ('project_id', 'p.project_id'),
+            ('project_name', 'p.project_name'),
+            ('department_name', 'd.department_name'),
+            ('location_name', 'l.location_name'),
+            ('status', 'p.status'),
+            ('start_date', 'p.start_date'),
+            ('end_date', 'p.end_date')
+        ],
+        joins=[
+            Join('d', "LEFT JOIN departments d ON p.department_id = d.department_id", optional=True),
+            Join('l', "LEFT JOIN locations l ON p.location_id = l.location_id", optional=True)
+        ],
+        filters={
+            'department': "p.department_id = %s",
+            'status': "p.status = %s",
+            'search': "p.project_name LIKE %s",
+            'search_ft': "MATCH(p.project_name) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        rankings={
+            'search_ft': "MATCH(p.project_name) AGAINST (%s IN BOOLEAN MODE)"
+        },
+        order_by=[('p.project_name', 'project_name'), ('p.project_id', 'project_id')]
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('project_name',)
+    
     def get_all(self, department_id=None, status=None, search_term=None):
         """
         Get projects with filters.
@@ -19,40 +51,20 @@ class ProjectRepository(BaseRepository):
         Returns:
             list: List of project dicts
         """
-        query = """
-            SELECT 
-                p.project_id,
-                p.project_name,
-                d.department_name,
-                l.location_name,
-                p.status,
-                p.start_date,
-                p.end_date
-            FROM projects p
-            LEFT JOIN departments d ON p.department_id = d.department_id
-            LEFT JOIN locations l ON p.location_id = l.location_id
-            WHERE 1=1
-        """
-        params = []
+        where = {}
         
         if department_id:
-            query += " AND p.department_id = %s"
-            params.append(department_id)
+            where['department'] = department_id
         
         if status:
             status_val = status.value if hasattr(status, 'value') else status
             # Only add filter if it's a valid status (not 'All')
             if status_val != 'All':
-                query += " AND p.status = %s"
-                params.append(status_val)
-        
-        if search_term:
-            query += " AND p.project_name LIKE %s"
-            params.append(f"%{search_term}%")
+                where['status'] = status_val
         
-        query += " ORDER BY p.project_name"
+        where.update(self.search_filter(search_term))
         
-        return self.execute_query(query, params)
+        return self.execute_query(*self.LIST_QUERY.build(where, ranked=True))
     
     def get_by_id(self, project_id):
         """Get project by ID"""
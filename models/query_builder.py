@@ -0,0 +1,221 @@
+"""
+Declarative Listing Query Builder
+
+A repository describes its listing once - base table, selectable columns,
+joins, named filters, grouping and sort keys - and QueryBuilder compiles the
+SQL text for each distinct combination of active filters and columns the
+first time it is needed. Later calls reuse the cached text and only collect
+parameters.
+
+Joins declared ``optional`` (LEFT JOINs that match at most one row, so they
+cannot change the row count) are emitted only when a selected column, an
+active filter, the grouping or the sort keys reference their alias, directly
+or through another join's ON clause.
+
+A filter may also have a ranking expression (e.g. a FULLTEXT relevance
+score). Unpaged listings built with ``ranked=True`` then sort by it first,
+best match on top, whenever that filter is active.
+"""
+import re
+
+from models import pagination
+
+# "alias." references inside an SQL fragment
+_ALIAS_REF = re.compile(r'\b([A-Za-z_]\w*)\.')
+
+
+def _aliases(sql):
+    """Table aliases referenced by an SQL fragment."""
+    return set(_ALIAS_REF.findall(sql))
+
+
+class Join:
+    """
+    One JOIN clause of a listing.
+
+    Args:
+        alias: Alias the joined table is known by
+        sql: Full clause, e.g. "LEFT JOIN person s ON es.supervisor_id = s.person_id"
+        optional: True if the join may be skipped when nothing references it.
+                  Only use for LEFT JOINs to at most one row.
+    """
+
+    def __init__(self, alias, sql, optional=False):
+        self.alias = alias
+        self.sql = " ".join(sql.split())
+        self.optional = optional
+        # Other joins this one's ON clause depends on
+        self.requires = _aliases(self.sql) - {alias}
+
+
+class QueryBuilder:
+    """
+    Compiles and caches the SQL for a repository listing.
+
+    Usage:
+        LIST_QUERY = QueryBuilder(
+            table="orders_m o",
+            columns=[('order_id', 'o.order_id'), ('customer_name', 'c.name')],
+            joins=[Join('c', "JOIN customers c ON o.customer_id = c.customer_id")],
+            filters={'salesman': "o.salesman_id = %s"},
+            order_by=[('o.order_date', 'order_date'), ('o.order_id', 'order_id')],
+            descending=True
+        )
+        query, params = LIST_QUERY.build({'salesman': salesman_id})
+
+    Filter fragments are joined with AND as written, so a fragment containing
+    OR must carry its own parentheses.
+    """
+
+    def __init__(self, table, columns, joins=(), filters=None, group_by=None,
+                 order_by=(), descending=False, rankings=None):
+        """
+        Args:
+            table: Base table with alias, e.g. "orders_m o"
+            columns: List of (row_field, sql_expression) pairs, in SELECT order
+            joins: List of Join, in FROM order
+            filters: Dict of filter name -> SQL predicate with %s placeholders
+            group_by: Optional GROUP BY expression
+            order_by: List of (sql_expression, row_field) sort keys ending with
+                      the primary key; doubles as the keyset for execute_page
+            descending: True if the listing is sorted descending
+            rankings: Dict of filter name -> score expression (higher is a
+                      better match) taking the same parameters as the filter
+        """
+        self.table = table
+        self.columns = list(columns)
+        self.column_map = dict(self.columns)
+        self.joins = list(joins)
+        self.filters = dict(filters or {})
+        self.group_by = group_by
+        self.order_by = list(order_by)
+        self.descending = descending
+        self.rankings = dict(rankings or {})
+        self._cache = {}
+
+    def build(self, where=None, columns=None, seek=None, ordered=True, limit=None,
+              ranked=False):
+        """
+        Get the SQL and parameters for one call.
+
+        Args:
+            where: Dict of active filter name -> parameter value (a list or
+                   tuple for several placeholders). Filters that are absent
+                   or None are left out.
+            columns: Optional subset of row fields to select (sort-key fields
+                     are always included)
+            seek: Optional (direction, key_values) from a page cursor
+            ordered: Append ORDER BY (ignored when seeking)
+            limit: Optional row limit
+            ranked: Sort by the rankings of active filters before the sort
+                    keys (ignored when seeking, since pages follow the keyset)
+
+        Returns:
+            tuple: (query string, list of parameters)
+
+        Raises:
+            KeyError: If an unknown filter or column is requested
+        """
+        where = {name: value for name, value in (where or {}).items() if value is not None}
+        for name in where:
+            if name not in self.filters:
+                raise KeyError(f"Unknown filter: {name}")
+        active = tuple(name for name in self.filters if name in where)
+        fields = self._select_fields(columns)
+        direction = seek[0] if seek else None
+        ranks = tuple(name for name in active if name in self.rankings) \
+            if ranked and ordered and not seek else ()
+
+        key = (active, fields, direction, bool(ordered or seek), limit is not None, ranks)
+        query = self._cache.get(key)
+        if query is None:
+            query = self._compile(*key)
+            self._cache[key] = query
+
+        params = []
+        for name in active + ranks:
+            value = where[name]
+            if isinstance(value, (list, tuple)):
+                params.extend(value)
+            else:
+                params.append(value)
+        if seek:
+            params.extend(seek[1])
+        if limit is not None:
+            params.append(limit)
+
+        return query, params
+
+    def cache_size(self):
+        """Number of compiled query variants held in the cache."""
+        return len(self._cache)
+
+    # ---- internals -------------------------------------------------------
+
+    def _select_fields(self, columns):
+        """Normalise a requested column subset to a tuple in SELECT order."""
+        if columns is None:
+            return None
+        wanted = set(columns) | {field for _, field in self.order_by}
+        unknown = wanted - set(self.column_map)
+        if unknown:
+            raise KeyError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+        return tuple(field for field, _ in self.columns if field in wanted)
+
+    def _compile(self, active, fields, direction, ordered, limited, ranks):
+        """Render the SQL text for one cache key."""
+        selected = self.columns if fields is None else [
+            (field, self.column_map[field]) for field in fields
+        ]
+        predicates = [self.filters[name] for name in active]
+
+        if direction:
+            backwards = direction == pagination.PREV
+            op = '<' if self.descending != backwards else '>'
+            keys = ", ".join(expr for expr, _ in self.order_by)
+            placeholders = ", ".join(["%s"] * len(self.order_by))
+            predicates.append(f"({keys}) {op} ({placeholders})")
+            order_desc = self.descending != backwards
+        else:
+            order_desc = self.descending
+
+        # Work out which joins this variant needs
+        referenced = set()
+        for _, expr in selected:
+            referenced |= _aliases(expr)
+        for predicate in predicates:
+            referenced |= _aliases(predicate)
+        if self.group_by:
+            referenced |= _aliases(self.group_by)
+        if ordered:
+            for expr, _ in self.order_by:
+                referenced |= _aliases(expr)
+
+        needed = {join.alias for join in self.joins if not join.optional} | referenced
+        changed = True
+        while changed:
+            changed = False
+            for join in self.joins:
+                if join.alias in needed and not join.requires <= needed:
+                    needed |= join.requires
+                    changed = True
+
+        select_list = ",\n    ".join(
+            expr if expr.endswith(f".{field}") else f"{expr} AS {field}"
+            for field, expr in selected
+        )
+        parts = [f"SELECT\n    {select_list}", f"FROM {self.table}"]
+        parts.extend(join.sql for join in self.joins if join.alias in needed)
+        if predicates:
+            parts.append("WHERE " + "\n  AND ".join(predicates))
+        if self.group_by:
+            parts.append(f"GROUP BY {self.group_by}")
+        if ordered and self.order_by:
+            parts.append("ORDER BY " + ", ".join(
+                [f"{self.rankings[name]} DESC" for name in ranks] +
+                [f"{expr} {'DESC' if order_desc else 'ASC'}" for expr, _ in self.order_by]
+            ))
+        if limited:
+            parts.append("LIMIT %s")
+
+        return "\n".join(parts)
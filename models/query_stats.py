@@ -0,0 +1,249 @@
+"""
+Query Instrumentation
+
+BaseRepository reports every statement it runs here. Statements are
+fingerprinted (literals and placeholders replaced by ``?``) and aggregated
+per fingerprint into a log-scale latency histogram together with call,
+error, row and result-size counters. Statements slower than SLOW_QUERY_MS
+are written in full, with the shape of their parameters and the calling
+code location, to logs/slow_query_YYYYMMDD.log.
+"""
+import math
+import os
+import re
+import sys
+import threading
+from functools import lru_cache
+
+from config.database import SLOW_QUERY_MS
+from utils.logger import setup_logger
+
+slow_logger = setup_logger('slow_query', file_prefix='slow_query')
+
+# Histogram bucket upper bounds in ms: 0.125, 0.25, 0.5 ... ~65 s
+_BUCKET_BOUNDS = [0.125 * 2 ** i for i in range(20)]
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_MULTI_ROW = re.compile(r"(\(\?\+\))(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames from these files are skipped when looking for the call site
+_INTERNAL_FILES = {
+    os.path.normcase(os.path.abspath(__file__)),
+    os.path.normcase(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'base_repository.py')),
+}
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query):
+    """
+    Normalise a statement so calls differing only in literals group together.
+
+    Example:
+        "SELECT * FROM person WHERE person_id IN (%s, %s)  AND name = 'x'"
+        -> "SELECT * FROM person WHERE person_id IN (?+) AND name = ?"
+    """
+    text = _STRING_LITERAL.sub('?', query)
+    text = _PLACEHOLDER.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _VALUE_LIST.sub('(?+)', text)
+    text = _MULTI_ROW.sub(r'\1', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def params_shape(params):
+    """
+    Describe parameters by type only, so values never reach the log.
+
+    Returns:
+        str: e.g. "tuple[3](int, str, NoneType)" or "list[500] of tuple[4](...)"
+    """
+    if params is None:
+        return "None"
+    if isinstance(params, dict):
+        return "dict(" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + ")"
+    if isinstance(params, (list, tuple)):
+        kind = type(params).__name__
+        if params and isinstance(params[0], (list, tuple, dict)):
+            return f"{kind}[{len(params)}] of {params_shape(params[0])}"
+        return f"{kind}[{len(params)}](" + ", ".join(type(value).__name__ for value in params) + ")"
+    return type(params).__name__
+
+
+def estimate_bytes(result):
+    """
+    Approximate result size from the first row (cheap, O(columns)).
+
+    Args:
+        result: Row dict, list of row dicts, or None
+
+    Returns:
+        int: Estimated bytes of column data
+    """
+    if not result:
+        return 0
+    rows = result if isinstance(result, (list, tuple)) else [result]
+    first = rows[0]
+    values = first.values() if isinstance(first, dict) else first
+    row_bytes = sum(len(str(value)) for value in values if value is not None)
+    return row_bytes * len(rows)
+
+
+def _call_site():
+    """File:line of the first caller outside the repository layer internals."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.normcase(os.path.abspath(frame.f_code.co_filename))
+        if filename not in _INTERNAL_FILES and 'contextlib' not in filename:
+            return f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class _Histogram:
+    """Per-fingerprint aggregate."""
+
+    __slots__ = ('kind', 'count', 'errors', 'total_ms', 'max_ms', 'rows', 'bytes', 'buckets')
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+
+    def add(self, elapsed_ms, rows, size, error):
+        self.count += 1
+        self.errors += 1 if error else 0
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.bytes += size
+        if elapsed_ms <= _BUCKET_BOUNDS[0]:
+            index = 0
+        else:
+            index = min(int(math.ceil(math.log2(elapsed_ms / _BUCKET_BOUNDS[0]))), len(_BUCKET_BOUNDS))
+        self.buckets[index] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of calls (ms)."""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                if index < len(_BUCKET_BOUNDS):
+                    return min(_BUCKET_BOUNDS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        return {
+            'kind': self.kind,
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.50), 3),
+            'p95_ms': round(self.percentile(0.95), 3),
+            'p99_ms': round(self.percentile(0.99), 3),
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'avg_rows': round(self.rows / self.count, 1) if self.count else 0.0,
+            'bytes': self.bytes,
+        }
+
+
+class QueryStats:
+    """
+    Thread-safe registry of per-fingerprint query histograms.
+
+    Usage:
+        stats = QueryStats(slow_query_ms=200)
+        stats.record("SELECT ...", params, elapsed_seconds, rows=10, size=512)
+        stats.top(5)
+    """
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, query, params, elapsed, rows=0, size=0, kind='query', error=False):
+        """
+        Add one statement execution.
+
+        Args:
+            query: SQL text as executed
+            params: Parameters it was executed with (only the shape is logged)
+            elapsed: Duration in seconds
+            rows: Rows returned or affected
+            size: Approximate result bytes
+            kind: 'query', 'write', 'batch', 'transaction' or 'stream'
+            error: True if the statement raised
+        """
+        elapsed_ms = elapsed * 1000
+        key = fingerprint(query)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(kind)
+            histogram.add(elapsed_ms, rows, size, error)
+
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            slow_logger.info(
+                f"{elapsed_ms:.1f} ms | {kind} | rows={rows} | params={params_shape(params)} | "
+                f"at {_call_site()}\n{query.strip()}"
+            )
+
+    def top(self, top_n=10, sort_by='total_ms'):
+        """
+        Get the heaviest fingerprints.
+
+        Args:
+            top_n: Number of entries (None for all)
+            sort_by: Snapshot field to rank by (total_ms, count, p95_ms, rows, bytes...)
+
+        Returns:
+            list: Dicts with 'fingerprint' plus the histogram snapshot fields
+        """
+        with self._lock:
+            entries = [dict(histogram.snapshot(), fingerprint=key)
+                       for key, histogram in self._histograms.items()]
+        entries.sort(key=lambda entry: entry[sort_by], reverse=True)
+        return entries if top_n is None else entries[:top_n]
+
+    def reset(self):
+        """Drop all collected statistics."""
+        with self._lock:
+            self._histograms.clear()
+
+
+# Process-wide registry used by BaseRepository
+query_stats = QueryStats()
+
+
+def get_query_stats(top_n=10, sort_by='total_ms'):
+    """
+    Get the top-N statement fingerprints for monitoring.
+
+    Args:
+        top_n: Number of fingerprints to return (None for all)
+        sort_by: Ranking field (default: total time spent)
+
+    Returns:
+        list: Per-fingerprint dicts (count, errors, avg/p50/p95/p99/max ms,
+              rows, avg_rows, bytes)
+    """
+    return query_stats.top(top_n, sort_by)
+
+
+def reset_query_stats():
+    """Clear the process-wide query statistics."""
+    query_stats.reset()
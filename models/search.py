@@ -0,0 +1,122 @@
+"""
+Search Term Helpers
+
+Turns a user-typed search term into the active search filter of a listing.
+
+Every listing has a 'search' filter using ``LIKE '%term%'``. A listing whose
+QueryBuilder also declares a 'search_ft' filter (MATCH ... AGAINST over the
+FULLTEXT indexes added by migration 0002) can run in 'fulltext' mode: each
+word of the term becomes a required prefix term in boolean mode, so
+"jan smi" becomes ``+jan* +smi*``. Terms with a word shorter than
+FULLTEXT_MIN_TOKEN fall back to LIKE, because InnoDB does not index words
+that short and MATCH would never find them.
+
+like_predicate() mirrors the LIKE filter in Python, so a view can narrow a
+complete result set for a longer term without another query.
+"""
+import re
+import unicodedata
+
+from utils.constants import FULLTEXT_MIN_TOKEN
+
+LIKE = 'like'
+FULLTEXT = 'fulltext'
+MODES = (LIKE, FULLTEXT)
+
+# Boolean-mode operators are dropped; only word characters are searched
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def boolean_query(term, min_token=FULLTEXT_MIN_TOKEN):
+    """
+    Build a boolean-mode AGAINST string requiring every word as a prefix.
+
+    Args:
+        term: Search text as typed
+        min_token: Shortest word the FULLTEXT index holds
+
+    Returns:
+        str: e.g. "+jan* +smi*", or None if LIKE must be used instead
+    """
+    words = _WORD.findall(term or '')
+    if not words or any(len(word) < min_token for word in words):
+        return None
+    return ' '.join(f"+{word}*" for word in words)
+
+
+def search_filter(builder, term, mode=LIKE):
+    """
+    Get the active search filter for a term.
+
+    Args:
+        builder: Listing QueryBuilder with a 'search' (and optionally a
+                 'search_ft') filter
+        term: Search text (empty for no search)
+        mode: LIKE or FULLTEXT
+
+    Returns:
+        dict: {} or one of {'search_ft': ...} / {'search': ...}, ready to merge
+              into the where dict passed to build()
+    """
+    if not term:
+        return {}
+    if mode == FULLTEXT and 'search_ft' in builder.filters:
+        against = boolean_query(term)
+        if against:
+            return {'search_ft': _params(builder.filters['search_ft'], against)}
+    return {'search': _params(builder.filters['search'], f"%{term}%")}
+
+
+def like_predicate(fields, term):
+    """
+    Client-side equivalent of the 'search' LIKE filter.
+    
+    Matching is case- and accent-insensitive, like MySQL's default
+    utf8mb4 collation.
+    
+    Args:
+        fields: Row fields the LIKE filter covers
+        term: Search text
+        
+    Returns:
+        callable: row -> bool, or None if term contains LIKE wildcards
+                  (% or _) that Python substring matching cannot mirror
+    """
+    if '%' in term or '_' in term or not fields:
+        return None
+    needle = _fold(term)
+    
+    def matches(row):
+        return any(needle in _fold(row[field]) for field in fields if row.get(field) is not None)
+    
+    return matches
+
+
+def tokens(text):
+    """
+    Split text into case- and accent-folded words.
+    
+    Args:
+        text: Any value (None gives no words)
+        
+    Returns:
+        list: Folded words, in order
+    """
+    if text is None:
+        return []
+    return _WORD.findall(_fold(text))
+
+
+def _fold(text):
+    """Case- and accent-folded form of a value."""
+    text = str(text)
+    if text.isascii():
+        return text.casefold()
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+
+
+def _params(predicate, value):
+    """Repeat value for every placeholder in the filter predicate."""
+    count = predicate.count('%s')
+    return value if count == 1 else [value] * count
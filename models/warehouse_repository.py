@@ -2,10 +2,39 @@
 Warehouse Repository - Data access for warehouse operations
 """
 from models.base_repository import BaseRepository
+from models.query_builder import QueryBuilder, Join
 
 class WarehouseRepository(BaseRepository):
     """Repository for Warehouse CRUD operations"""
     
+    # Warehouse listing with distinct product counts
+    LIST_QUERY = QueryBuilder(
+        table="warehouses w",
+        columns=[
+            ('warehouse_id', 'w.warehouse_id'),
+            ('warehouse_name', 'w.warehouse_name'),
+            ('location_name', 'l.location_name'),
+            ('supervisor_name', 'p.name'),
+            ('capacity', 'w.capacity'),
+            ('supervisor_id', 'w.supervisor_id'),
+            ('product_count', 'COUNT(DISTINCT wp.product_id)')
+        ],
+        joins=[
+            Join('l', "LEFT JOIN locations l ON w.location_id = l.location_id", optional=True),
+            Join('p', "LEFT JOIN person p ON w.supervisor_id = p.person_id", optional=True),
+            Join('wp', "LEFT JOIN warehouse_products wp ON w.warehouse_id = wp.warehouse_id")
+        ],
+        filters={
+            'supervisor': "w.supervisor_id = %s",
+            'search': "(w.warehouse_name LIKE %s OR l.location_name LIKE %s OR p.name LIKE %s)"
+        },
+        group_by="w.warehouse_id",
+        order_by=[('w.warehouse_name', 'warehouse_name'), ('w.warehouse_id', 'warehouse_id')]
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('warehouse_name', 'location_name', 'supervisor_name')
+    
     def get_all(self, supervisor_id=None, search_term=None):
         """
         Get warehouses with filters.
@@ -17,34 +46,15 @@ class WarehouseRepository(BaseRepository):
         Returns:
             list: List of warehouse dicts
         """
-        query = """
-            SELECT 
-                w.warehouse_id,
-                w.warehouse_name,
-                l.location_name,
-                p.name AS supervisor_name,
-                w.capacity,
-                w.supervisor_id,
-                COUNT(DISTINCT wp.product_id) AS product_count
-            FROM warehouses w
-            LEFT JOIN locations l ON w.location_id = l.location_id
-            LEFT JOIN person p ON w.supervisor_id = p.person_id
-            LEFT JOIN warehouse_products wp ON w.warehouse_id = wp.warehouse_id
-            WHERE 1=1
-        """
-        params = []
+        where = {}
         
         if supervisor_id:
-            query += " AND w.supervisor_id = %s"
-            params.append(supervisor_id)
+            where['supervisor'] = supervisor_id
         
         if search_term:
-            query += " AND (w.warehouse_name LIKE %s OR l.location_name LIKE %s OR p.name LIKE %s)"
-            params.extend([f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"])
-        
-        query += " GROUP BY w.warehouse_id ORDER BY w.warehouse_name"
+            where['search'] = [f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"]
         
-        return self.execute_query(query, params)
+        return self.execute_query(*self.LIST_QUERY.build(where))
     
     def get_by_id(self, wh_id):
         """Get warehouse by ID"""
@@ -2,77 +2,143 @@
 WorkLog Repository - Data access for work logs
 """
 from models.base_repository import BaseRepository
+from models.query_builder import QueryBuilder, Join
 from utils.constants import ApprovalStatus
 
 class WorkLogRepository(BaseRepository):
     """Repository for WorkLog CRUD operations"""
     
+    # Work log listing, newest first. search_ft matches the employee and
+    # project FULLTEXT indexes (migration 0002) separately, since MATCH
+    # cannot span tables; the LEFT JOINed project scores NULL when absent.
+    LIST_QUERY = QueryBuilder(
+        table="work_log w",
+        columns=[
+            ('log_id', 'w.log_id'),
+            ('work_date', 'w.work_date'),
+            ('hours_worked', 'w.total_hours'),
+            ('description', 'w.notes'),
+            ('supervisor_approved', 'w.supervisor_approved'),
+            ('hod_approved', 'w.hod_approved'),
+            ('approval_status', 'w.approval_status'),
+            ('employee_name', 'e.name'),
+            ('employee_email', 'e.email'),
+            ('project_name', 'p.project_name'),
+            ('supervisor_name', 'sup.name'),
+            ('hod_name', 'hod.name')
+        ],
+        joins=[
+            Join('e', "JOIN person e ON w.employee_id = e.person_id"),
+            Join('p', "LEFT JOIN projects p ON w.project_id = p.project_id", optional=True),
+            Join('es', "LEFT JOIN emp_supervisor es ON w.employee_id = es.employee_id", optional=True),
+            Join('sup', "LEFT JOIN person sup ON es.supervisor_id = sup.person_id", optional=True),
+            Join('d', "LEFT JOIN departments d ON e.department_id = d.department_id", optional=True),
+            Join('hod', "LEFT JOIN person hod ON d.hod_id = hod.person_id", optional=True)
+        ],
+        filters={
+            'employee': "w.employee_id = %s",
+            'supervisor': "es.supervisor_id = %s",
+            'hod': "e.department_id = (SELECT department_id FROM person WHERE person_id = %s)",
+            'status': "w.approval_status = %s",
+            'search': "(e.name LIKE %s OR e.email LIKE %s OR p.project_name LIKE %s)",
+            'search_ft': "(MATCH(e.name, e.email) AGAINST (%s IN BOOLEAN MODE) "
+                         "OR MATCH(p.project_name) AGAINST (%s IN BOOLEAN MODE))"
+        },
+        rankings={
+            'search_ft': "MATCH(e.name, e.email) AGAINST (%s IN BOOLEAN MODE) "
+                         "+ COALESCE(MATCH(p.project_name) AGAINST (%s IN BOOLEAN MODE), 0)"
+        },
+        order_by=[('w.work_date', 'work_date'), ('w.log_id', 'log_id')],
+        descending=True
+    )
+    
+    # Row fields the 'search' filter matches
+    SEARCH_FIELDS = ('employee_name', 'employee_email', 'project_name')
+    
+    # Status filter labels shown in the view -> approval_status values
+    STATUS_FILTERS = {
+        'Pending': ApprovalStatus.PENDING.value,
+        'Approved': ApprovalStatus.APPROVED.value,
+        'Rejected': ApprovalStatus.REJECTED.value
+    }
+    
     def get_all(self, emp_id=None, supervisor_id=None, hod_id=None, 
                 status_filter=None, search_term=None):
         """
-        Get work logs with complex role-based filtering.
+        Get work logs with role-based filtering.
         
         Args:
-            emp_id: View own logs
-            supervisor_id: View logs of supervisees
-            hod_id: View logs of department
-            status_filter: Filter by approval status
-            search_term: Search employee name or project
+            emp_id: If set, show only logs for this employee
+            supervisor_id: If set, show logs for supervisor's team
+            hod_id: If set, show logs for HOD's department
+            status_filter: Filter by status
+            search_term: Search in employee name, email or project
             
         Returns:
             list: List of work log dicts
         """
-        query = """
-            SELECT 
-                w.log_id, w.work_date, w.total_hours AS hours_worked, w.notes AS description,
-                w.supervisor_approved, w.hod_approved, w.approval_status,
-                e.name AS employee_name,
-                p.project_name,
-                sup.name AS supervisor_name,
-                hod.name AS hod_name
-            FROM work_log w
-            JOIN person e ON w.employee_id = e.person_id
-            LEFT JOIN projects p ON w.project_id = p.project_id
-            LEFT JOIN emp_supervisor es ON w.employee_id = es.employee_id
-            LEFT JOIN person sup ON es.supervisor_id = sup.person_id
-            LEFT JOIN departments d ON e.department_id = d.department_id
-            LEFT JOIN person hod ON d.hod_id = hod.person_id
-            WHERE 1=1
+        where = self._list_filters(emp_id, supervisor_id, hod_id, status_filter, search_term)
+        return self.execute_query(*self.LIST_QUERY.build(where, ranked=True))
+    
+    def get_page(self, emp_id=None, supervisor_id=None, hod_id=None, status_filter=None,
+                 search_term=None, page_size=None, cursor=None, with_total=False):
         """
-        params = []
+        Get one page of work logs (newest first) using keyset pagination.
+        
+        Args:
+            emp_id, supervisor_id, hod_id, status_filter, search_term: Same filters as get_all
+            page_size: Rows per page (default DEFAULT_PAGE_SIZE)
+            cursor: next_cursor / prev_cursor from a previous page
+            with_total: Include an approximate total (or 'exact')
+            
+        Returns:
+            dict: Page with 'rows', 'next_cursor', 'prev_cursor'
+        """
+        where = self._list_filters(emp_id, supervisor_id, hod_id, status_filter, search_term)
+        return self.execute_page(self.LIST_QUERY, where, page_size, cursor,
+                                 with_total=with_total)
+    
+    def iter_all(self, emp_id=None, supervisor_id=None, hod_id=None,
+                 status_filter=None, search_term=None, chunk_size=None):
+        """
+        Stream work logs with the same filters as get_all, in constant memory.
+        
+        Args:
+            chunk_size: Rows fetched per round trip (default STREAM_CHUNK_SIZE)
+            
+        Yields:
+            dict: One work log row at a time
+        """
+        where = self._list_filters(emp_id, supervisor_id, hod_id, status_filter, search_term)
+        query, params = self.LIST_QUERY.build(where, ranked=True)
+        return self.iter_query(query, params, chunk_size=chunk_size)
+    
+    def _list_filters(self, emp_id=None, supervisor_id=None, hod_id=None,
+                      status_filter=None, search_term=None):
+        """Map get_all arguments to active LIST_QUERY filters."""
+        where = {}
         
         # Access Control Logic
         if emp_id:
             # Employee sees their own
-            query += " AND w.employee_id = %s"
-            params.append(emp_id)
+            where['employee'] = emp_id
         elif supervisor_id:
             # Supervisor sees their team's logs
-            query += " AND es.supervisor_id = %s"
-            params.append(supervisor_id)
+            where['supervisor'] = supervisor_id
         elif hod_id:
             # HOD sees department's logs
-            query += " AND e.department_id = (SELECT department_id FROM person WHERE person_id = %s)"
-            params.append(hod_id)
+            where['hod'] = hod_id
             
         # Status Filter
         if status_filter:
             status_val = status_filter.value if hasattr(status_filter, 'value') else status_filter
-            if status_val == 'Pending':
-                query += " AND w.approval_status = 'PENDING'"
-            elif status_val == 'Approved':
-                query += " AND w.approval_status = 'APPROVED'"
-            elif status_val == 'Rejected':
-                query += " AND w.approval_status = 'REJECTED'"
+            if status_val in self.STATUS_FILTERS:
+                where['status'] = self.STATUS_FILTERS[status_val]
         
         # Search
-        if search_term:
-            query += " AND (e.name LIKE %s OR p.project_name LIKE %s)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
+        where.update(self.search_filter(search_term))
             
-        query += " ORDER BY w.work_date DESC"
-        
-        return self.execute_query(query, params)
+        return where
     
     def create(self, employee_id, project_id, date, hours, description):
         """Create work log"""
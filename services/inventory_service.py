@@ -0,0 +1,215 @@
+"""
+Inventory Service
+
+Stock reservation for orders under concurrency.
+
+Stock is taken in the order's own transaction: the stock rows are locked
+in (warehouse_id, product_id) order, checked, and decremented with a
+conditional UPDATE (qty >= n), so concurrent salesmen can neither oversell
+nor wait on each other in a cycle through this path. Deadlocks with other
+writers and lock wait timeouts still happen under contention; atomic()
+reruns the whole transaction a few times with backoff.
+
+Before migration 0006 the order_items triggers move the stock of each
+line themselves. The service detects that (once per process) and then
+only validates stock for new lines instead of taking it.
+"""
+import random
+import threading
+import time
+
+import pymysql
+
+from models.base_repository import BaseRepository
+from models.product_repository import ProductRepository
+from utils.constants import DEADLOCK_RETRIES, DEADLOCK_BACKOFF_MS
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT
+RETRYABLE_ERRORS = (1213, 1205)
+
+
+class InsufficientStockError(Exception):
+    """Raised when stock rows cannot cover the requested quantities."""
+
+    def __init__(self, shortages):
+        """
+        Args:
+            shortages: List of (warehouse_id, product_id, needed, available);
+                       available is None for rows that do not exist
+        """
+        self.shortages = shortages
+        problems = []
+        for warehouse_id, product_id, needed, available in shortages:
+            if available is None:
+                problems.append(f"product {product_id} is not stocked in warehouse {warehouse_id}")
+            else:
+                problems.append(f"product {product_id} in warehouse {warehouse_id}: "
+                                f"{needed} needed, {available} available")
+        super().__init__("Insufficient stock: " + "; ".join(problems))
+
+
+class InventoryService:
+    """
+    Service layer for stock reservation.
+
+    Usage:
+        inventory = InventoryService()
+        order_id = inventory.atomic(lambda: place_order(...))   # retried on deadlock
+
+        # inside the transaction
+        inventory.reserve_lines({(warehouse_id, product_id): qty, ...})
+    """
+
+    # None until checked; True while the order_items triggers move stock
+    _triggers_move_stock = None
+    _detect_lock = threading.Lock()
+
+    def __init__(self):
+        self.repo = ProductRepository()
+        # Transactions rerun by atomic() (read by the stress benchmark)
+        self.retries = 0
+
+    @property
+    def triggers_move_stock(self):
+        """True if the order_items triggers still deduct and restore stock."""
+        cls = InventoryService
+        if cls._triggers_move_stock is None:
+            with cls._detect_lock:
+                if cls._triggers_move_stock is None:
+                    cls._triggers_move_stock = self.repo.stock_moved_by_triggers()
+                    if cls._triggers_move_stock:
+                        logger.info("order_items triggers move stock; apply migration 0006")
+        return cls._triggers_move_stock
+
+    def atomic(self, work, attempts=DEADLOCK_RETRIES):
+        """
+        Run work in one transaction, rerunning it after a deadlock or lock
+        wait timeout.
+
+        Inside an already active transaction the work just joins it; the
+        outer caller owns the transaction and its retries.
+
+        Args:
+            work: Callable run inside BaseRepository.session(transactional=True);
+                  it must be safe to run again from the start
+            attempts: Maximum number of runs
+
+        Returns:
+            The result of work
+        """
+        current = BaseRepository.current_session()
+        if current is not None and current.transactional:
+            return work()
+
+        for attempt in range(1, attempts + 1):
+            try:
+                with BaseRepository.session(transactional=True):
+                    return work()
+            except pymysql.err.OperationalError as e:
+                if not e.args or e.args[0] not in RETRYABLE_ERRORS or attempt == attempts:
+                    raise
+                self.retries += 1
+                delay = DEADLOCK_BACKOFF_MS * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                logger.warning(f"Retrying transaction after MySQL error {e.args[0]} "
+                               f"(attempt {attempt}/{attempts})")
+                time.sleep(delay / 1000.0)
+
+    def reserve(self, quantities):
+        """
+        Take quantities out of stock.
+
+        Args:
+            quantities: (warehouse_id, product_id) -> qty
+
+        Raises:
+            InsufficientStockError: Listing every short row; nothing is taken
+        """
+        self._check(quantities)
+        changed = self.repo.adjust_stock(quantities, take=True)
+        wanted = sum(1 for qty in quantities.values() if qty > 0)
+        if changed != wanted:
+            # Cannot happen while the rows are locked; never let it pass
+            raise InsufficientStockError(self._shortages(quantities))
+
+    def release(self, quantities):
+        """
+        Put quantities back into stock.
+
+        Args:
+            quantities: (warehouse_id, product_id) -> qty
+        """
+        self.repo.lock_stock(quantities)
+        self.repo.adjust_stock(quantities, take=False)
+
+    def reserve_each(self, requests):
+        """
+        Take stock for several orders at once, each all-or-nothing.
+
+        The rows of every request are locked together in key order, then
+        the requests are allocated in sequence from what is left; requests
+        that cannot be covered in full take nothing. The accepted ones are
+        taken with a single statement.
+
+        Args:
+            requests: List of (warehouse_id, product_id) -> qty dicts
+
+        Returns:
+            list: Shortages for each request, as for InsufficientStockError
+                  (empty for requests that were reserved)
+        """
+        keys = {key for quantities in requests for key in quantities}
+        available = self.repo.lock_stock(keys)
+        taken = {}
+        results = []
+        for quantities in requests:
+            shortages = []
+            for key, qty in sorted(quantities.items()):
+                stock = available.get(key)
+                if stock is None or stock < qty:
+                    shortages.append((*key, qty, stock))
+            if not shortages:
+                for key, qty in quantities.items():
+                    available[key] -= qty
+                    taken[key] = taken.get(key, 0) + qty
+            results.append(shortages)
+
+        taken = {key: qty for key, qty in taken.items() if qty > 0}
+        if taken and self.repo.adjust_stock(taken, take=True) != len(taken):
+            # Cannot happen while the rows are locked; never let it pass
+            raise InsufficientStockError(self._shortages(taken))
+        return results
+
+    def reserve_lines(self, quantities):
+        """
+        Reserve stock for order lines about to be inserted.
+
+        While the triggers still deduct line stock this only validates it
+        (under the same locks).
+        """
+        if self.triggers_move_stock:
+            self._check(quantities)
+        else:
+            self.reserve(quantities)
+
+    def release_lines(self, quantities):
+        """Return the stock of order lines about to be deleted."""
+        if not self.triggers_move_stock:
+            self.release(quantities)
+
+    def _check(self, quantities):
+        """Lock the rows in key order and verify they cover the quantities."""
+        shortages = self._shortages(quantities)
+        if shortages:
+            raise InsufficientStockError(shortages)
+
+    def _shortages(self, quantities):
+        available = self.repo.lock_stock(quantities)
+        shortages = []
+        for key, qty in sorted(quantities.items()):
+            stock = available.get(key)
+            if stock is None or stock < qty:
+                shortages.append((*key, qty, stock))
+        return shortages
@@ -0,0 +1,419 @@
+"""
+Migration Service
+
+Versioned schema migrations for upgrading an existing database in place,
+without re-running the destructive Database/schema.sql setup script.
+
+Migrations live in Database/migrations as numbered file pairs:
+
+    0001_hot_path_indexes.up.sql
+    0001_hot_path_indexes.down.sql
+
+Applied versions are recorded in the ``schema_migrations`` table. Files may
+use ``DELIMITER`` blocks (for triggers and procedures) exactly like
+schema.sql does.
+
+Usage:
+    python -m services.migration_service status
+    python -m services.migration_service up [--target N] [--dry-run]
+    python -m services.migration_service down [--target N] [--dry-run]
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+from config.database import get_db_connection
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Database', 'migrations'
+)
+
+# Held while migrating so two runners cannot interleave
+LOCK_NAME = 'novaflow_schema_migrations'
+
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.(up|down)\.sql$')
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT pk_schema_migrations PRIMARY KEY (version)
+    )
+"""
+
+
+class MigrationError(Exception):
+    """Raised when migration files are inconsistent or a statement fails."""
+    pass
+
+
+def split_statements(sql):
+    """
+    Split a SQL script into individual statements.
+
+    Understands ``DELIMITER`` lines, quoted strings and identifiers, and
+    comments, so semicolons inside trigger bodies or string literals do not
+    end a statement. Line comments are dropped; block comments are kept.
+
+    Args:
+        sql: Script text
+
+    Returns:
+        list: Statement strings without their trailing delimiter
+    """
+    statements = []
+    buffer = []
+    delimiter = ';'
+    quote = None
+    in_block_comment = False
+
+    for line in sql.splitlines(keepends=True):
+        stripped = line.strip()
+        if (not quote and not in_block_comment and not ''.join(buffer).strip()
+                and stripped.upper().startswith('DELIMITER ')):
+            delimiter = stripped.split(None, 1)[1]
+            buffer = []
+            continue
+
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if in_block_comment:
+                buffer.append(char)
+                if line.startswith('*/', i):
+                    buffer.append('/')
+                    in_block_comment = False
+                    i += 1
+            elif quote:
+                buffer.append(char)
+                if char == '\\' and quote != '`' and i + 1 < len(line):
+                    buffer.append(line[i + 1])
+                    i += 1
+                elif char == quote:
+                    quote = None
+            elif char in ("'", '"', '`'):
+                buffer.append(char)
+                quote = char
+            elif char == '#' or (line.startswith('--', i) and line[i + 2:i + 3] in ('', ' ', '\t', '\n', '\r')):
+                buffer.append('\n')
+                break
+            elif line.startswith('/*', i):
+                buffer.append('/*')
+                in_block_comment = True
+                i += 1
+            elif line.startswith(delimiter, i):
+                statement = ''.join(buffer).strip()
+                if statement:
+                    statements.append(statement)
+                buffer = []
+                i += len(delimiter) - 1
+            else:
+                buffer.append(char)
+            i += 1
+
+    statement = ''.join(buffer).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+class Migration:
+    """
+    One numbered migration (an up file and an optional down file).
+    """
+
+    def __init__(self, version, name, up_path, down_path=None):
+        self.version = version
+        self.name = name
+        self.up_path = up_path
+        self.down_path = down_path
+
+    def statements(self, direction):
+        """
+        Get the statements for one direction.
+
+        Args:
+            direction: 'up' or 'down'
+
+        Returns:
+            list: SQL statements
+
+        Raises:
+            MigrationError: If the migration has no down file
+        """
+        path = self.up_path if direction == 'up' else self.down_path
+        if path is None:
+            raise MigrationError(f"Migration {self.label} has no down file")
+        with open(path, encoding='utf-8') as f:
+            return split_statements(f.read())
+
+    def checksum(self):
+        """SHA-256 of the up file, to detect edits after it was applied."""
+        with open(self.up_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @property
+    def label(self):
+        return f"{self.version:04d}_{self.name}"
+
+
+class MigrationService:
+    """
+    Applies and rolls back numbered migrations.
+
+    Each migration is recorded in (or removed from) schema_migrations only
+    after all of its statements succeed. MySQL commits DDL implicitly, so a
+    migration that fails half-way is not rolled back; the error names the
+    failing statement so the database can be repaired by hand.
+    """
+
+    def __init__(self, migrations_dir=MIGRATIONS_DIR, connection_func=get_db_connection, echo=None):
+        """
+        Args:
+            migrations_dir: Directory holding the NNNN_name.up/down.sql files
+            connection_func: Returns a DB-API connection with dict cursors
+            echo: Optional callable given each dry-run statement (e.g. print)
+        """
+        self.migrations_dir = migrations_dir
+        self.connection_func = connection_func
+        self.echo = echo
+
+    def discover(self):
+        """
+        Find migration files on disk.
+
+        Returns:
+            list: Migration objects sorted by version
+
+        Raises:
+            MigrationError: On duplicate versions or a down file without an up file
+        """
+        found = {}
+        if not os.path.isdir(self.migrations_dir):
+            return []
+
+        for filename in sorted(os.listdir(self.migrations_dir)):
+            match = _FILENAME.match(filename)
+            if not match:
+                continue
+            version, name, direction = int(match.group(1)), match.group(2), match.group(3)
+            entry = found.setdefault(version, {'name': name})
+            if entry['name'] != name:
+                raise MigrationError(
+                    f"Version {version:04d} is used by both '{entry['name']}' and '{name}'"
+                )
+            entry[direction] = os.path.join(self.migrations_dir, filename)
+
+        migrations = []
+        for version in sorted(found):
+            entry = found[version]
+            if 'up' not in entry:
+                raise MigrationError(f"Migration {version:04d}_{entry['name']} has no up file")
+            migrations.append(Migration(version, entry['name'], entry['up'], entry.get('down')))
+        return migrations
+
+    def get_status(self):
+        """
+        Get every known migration with its applied state.
+
+        Returns:
+            list: Dicts with version, name, applied, applied_at and modified
+                  (up file changed since it was applied). Versions recorded in
+                  the database but missing on disk are included with
+                  missing=True.
+        """
+        migrations = self.discover()
+        conn = self.connection_func()
+        try:
+            with conn.cursor() as cursor:
+                applied = self._applied(cursor)
+            conn.commit()
+        finally:
+            conn.close()
+
+        status = []
+        for migration in migrations:
+            row = applied.pop(migration.version, None)
+            status.append({
+                'version': migration.version,
+                'name': migration.name,
+                'applied': row is not None,
+                'applied_at': row['applied_at'] if row else None,
+                'modified': bool(row) and row['checksum'] != migration.checksum(),
+                'missing': False
+            })
+        for version, row in sorted(applied.items()):
+            status.append({
+                'version': version,
+                'name': row['name'],
+                'applied': True,
+                'applied_at': row['applied_at'],
+                'modified': False,
+                'missing': True
+            })
+        return status
+
+    def up(self, target=None, dry_run=False):
+        """
+        Apply pending migrations in version order.
+
+        Args:
+            target: Highest version to apply (default: all)
+            dry_run: Log the statements instead of executing them
+
+        Returns:
+            list: Labels of the migrations applied (or that would be)
+        """
+        migrations = self.discover()
+        return self._run(
+            lambda applied: [m for m in migrations
+                             if m.version not in applied and (target is None or m.version <= target)],
+            'up', dry_run
+        )
+
+    def down(self, target=None, dry_run=False):
+        """
+        Roll back applied migrations in reverse version order.
+
+        Args:
+            target: Version to roll back to, exclusive - everything above it is
+                    reverted (0 reverts all). Default: only the latest one.
+            dry_run: Log the statements instead of executing them
+
+        Returns:
+            list: Labels of the migrations rolled back (or that would be)
+        """
+        by_version = {m.version: m for m in self.discover()}
+
+        def select(applied):
+            versions = sorted(applied, reverse=True)
+            if target is None:
+                versions = versions[:1]
+            else:
+                versions = [v for v in versions if v > target]
+            missing = [v for v in versions if v not in by_version]
+            if missing:
+                raise MigrationError(
+                    f"Cannot roll back version(s) {missing}: migration files not found"
+                )
+            return [by_version[v] for v in versions]
+
+        return self._run(select, 'down', dry_run)
+
+    # ---- internals -------------------------------------------------------
+
+    def _run(self, select, direction, dry_run):
+        """Lock, pick the migrations to run from the applied set, run them."""
+        conn = self.connection_func()
+        try:
+            with conn.cursor() as cursor:
+                if not dry_run:
+                    cursor.execute("SELECT GET_LOCK(%s, 10) AS acquired", (LOCK_NAME,))
+                    if not cursor.fetchone()['acquired']:
+                        raise MigrationError("Another migration run is in progress")
+                try:
+                    todo = select(self._applied(cursor, create=not dry_run))
+                    if not todo:
+                        logger.info(f"No migrations to run ({direction})")
+                    for migration in todo:
+                        self._apply(conn, cursor, migration, direction, dry_run)
+                finally:
+                    if not dry_run:
+                        cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return [migration.label for migration in todo]
+
+    def _applied(self, cursor, create=False):
+        """Applied versions -> row; creates schema_migrations if asked."""
+        if create:
+            cursor.execute(_CREATE_TABLE)
+        else:
+            cursor.execute("SHOW TABLES LIKE 'schema_migrations'")
+            if not cursor.fetchone():
+                return {}
+        cursor.execute("SELECT version, name, checksum, applied_at FROM schema_migrations")
+        return {row['version']: row for row in cursor.fetchall()}
+
+    def _apply(self, conn, cursor, migration, direction, dry_run):
+        """Execute one migration's statements and record the outcome."""
+        statements = migration.statements(direction)
+        logger.info(
+            f"{'[dry-run] ' if dry_run else ''}{direction} {migration.label} "
+            f"({len(statements)} statement(s))"
+        )
+
+        if dry_run:
+            for statement in statements:
+                logger.info(f"[dry-run] {statement}")
+                if self.echo:
+                    self.echo(f"-- {migration.label} ({direction})\n{statement};\n")
+            return
+
+        for number, statement in enumerate(statements, 1):
+            try:
+                cursor.execute(statement)
+            except Exception as e:
+                conn.rollback()
+                raise MigrationError(
+                    f"{direction} {migration.label} failed at statement {number}: {e}\n{statement}"
+                ) from e
+
+        if direction == 'up':
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (migration.version, migration.name, migration.checksum())
+            )
+        else:
+            cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (migration.version,))
+        conn.commit()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="NovaFlow schema migrations")
+    parser.add_argument('command', choices=['up', 'down', 'status'])
+    parser.add_argument('--target', type=int, default=None,
+                        help="up: highest version to apply; down: version to roll back to")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="print the statements without executing them")
+    args = parser.parse_args(argv)
+
+    service = MigrationService(echo=print)
+    try:
+        if args.command == 'status':
+            for entry in service.get_status():
+                state = 'applied' if entry['applied'] else 'pending'
+                if entry['modified']:
+                    state += ' (modified since applied)'
+                if entry['missing']:
+                    state += ' (file missing)'
+                applied_at = entry['applied_at'] or ''
+                print(f"{entry['version']:04d}  {entry['name']:<32} {state:<12} {applied_at}")
+            return 0
+
+        run = service.up if args.command == 'up' else service.down
+        labels = run(target=args.target, dry_run=args.dry_run)
+        prefix = "Would run" if args.dry_run else "Ran"
+        print(f"{prefix} {args.command}: {', '.join(labels) if labels else 'nothing to do'}")
+        return 0
+    except MigrationError as e:
+        logger.error(str(e))
+        print(f"Migration failed: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,469 @@
+"""
+Order Import Service
+
+Bulk import of orders from CSV or JSONL files of any size.
+
+Every input record is one order line. CSV files need a header row; JSONL
+files hold one object per line, either a flat line or an order with a
+"lines" list whose entries inherit the order's fields:
+
+    order_ref, customer_id, salesman_id, order_date, status,
+    warehouse_id, product_id, qty, unit_price
+
+salesman_id, order_date (default today), status (default PENDING) and
+unit_price (default the catalog price) are optional. The lines of an order
+must be contiguous and share its header fields; an order_ref that comes
+back later in the file is rejected (within one run - order_refs are not
+stored, so a resumed run does not see those of earlier runs).
+
+The file is streamed, never loaded whole. Customers, salesmen and stock
+rows are preloaded into memory once, so validation costs no round trips.
+Orders are written in chunks, one transaction each: stock for the whole
+chunk is locked and taken at once (InventoryService.reserve_each), then
+the headers and lines go in as multi-row INSERTs and the checkpoint
+(migration 0007) advances in the same transaction. An interrupted import
+resumes after the last committed chunk. Orders with any invalid line, or
+without enough stock, are skipped whole and listed with the reason in a
+rejects file next to the input.
+
+Usage:
+    python -m services.order_import_service orders.csv
+    python -m services.order_import_service orders.jsonl --restart
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from models.import_repository import ImportRepository
+from services.inventory_service import InventoryService, InsufficientStockError
+from utils.constants import (
+    OrderStatus, IMPORT_CHUNK_ORDERS, IMPORT_CHUNK_LINES, IMPORT_PROGRESS_SECONDS
+)
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+STATUSES = {status.value for status in OrderStatus}
+CANCELLED = OrderStatus.CANCELLED.value
+
+# Bytes hashed to recognise a source file when resuming
+FINGERPRINT_BYTES = 64 * 1024
+
+
+class OrderImportError(Exception):
+    """Raised when an import cannot start or continue."""
+    pass
+
+
+class _PendingOrder:
+    """An order being collected from consecutive records."""
+
+    __slots__ = ('ref', 'line_no', 'header', 'lines', 'error', 'end_offset', 'end_line')
+
+    def __init__(self, ref, line_no):
+        self.ref = ref
+        self.line_no = line_no
+        self.header = None
+        self.lines = []
+        self.error = None
+        self.end_offset = 0
+        self.end_line = 0
+
+    def quantities(self):
+        totals = {}
+        for warehouse_id, product_id, qty, _ in self.lines:
+            key = (warehouse_id, product_id)
+            totals[key] = totals.get(key, 0) + qty
+        return totals
+
+
+class OrderImportService:
+    """
+    Service layer for bulk order imports.
+
+    Usage:
+        stats = OrderImportService().import_file('orders.csv', progress=print)
+    """
+
+    def __init__(self):
+        self.repo = ImportRepository()
+        self.inventory = InventoryService()
+        self.customers = set()
+        self.salesmen = set()
+        self.prices = {}
+
+    def import_file(self, path, fmt=None, rejects_path=None, restart=False,
+                    chunk_orders=IMPORT_CHUNK_ORDERS, progress=None) -> dict:
+        """
+        Import (or resume importing) a file of orders.
+
+        Args:
+            path: CSV or JSONL file
+            fmt: 'csv' or 'jsonl' (default: from the file extension)
+            rejects_path: CSV of rejected orders (default: <path>.rejects.csv)
+            restart: Ignore any checkpoint and import the file from the start
+            chunk_orders: Orders per transaction
+            progress: Optional callable receiving the stats dict periodically
+
+        Returns:
+            dict: rows (read this run), orders, lines, rejected (totals for
+                  the file), seconds, rows_per_sec, resumed, completed
+
+        Raises:
+            OrderImportError: Unknown format, changed file or legacy triggers
+        """
+        source = os.path.abspath(path)
+        fmt = fmt or FORMATS.get(os.path.splitext(source)[1].lower())
+        if fmt not in FORMATS.values():
+            raise OrderImportError(f"Cannot tell the format of {path}; pass --format")
+        if self.inventory.triggers_move_stock:
+            raise OrderImportError("The order_items triggers still move stock; "
+                                   "apply migration 0006 before importing")
+
+        fingerprint = self._fingerprint(source)
+        if restart:
+            self.repo.clear_checkpoint(source)
+            checkpoint = None
+        else:
+            checkpoint = self.repo.get_checkpoint(source)
+        if checkpoint and checkpoint['fingerprint'] != fingerprint:
+            raise OrderImportError(f"{path} changed since its last import; "
+                                   f"use --restart to import it again from the start")
+
+        stats = {
+            'rows': 0,
+            'orders': int(checkpoint['orders_imported']) if checkpoint else 0,
+            'lines': int(checkpoint['lines_imported']) if checkpoint else 0,
+            'rejected': int(checkpoint['orders_rejected']) if checkpoint else 0,
+            'seconds': 0.0,
+            'rows_per_sec': 0.0,
+            'resumed': checkpoint is not None,
+            'completed': bool(checkpoint and checkpoint['completed'])
+        }
+        if stats['completed']:
+            logger.info(f"Import of {source} already completed")
+            return stats
+
+        self._preload()
+        offset = int(checkpoint['byte_offset']) if checkpoint else 0
+        line_no = int(checkpoint['line_no']) if checkpoint else 0
+        multi_row, step = self.repo.consecutive_insert_ids()
+        rejects_path = rejects_path or source + '.rejects.csv'
+        logger.info(f"Importing {source} ({fmt}) from byte {offset}")
+
+        started = time.perf_counter()
+        last_report = started
+        chunk = []
+        chunk_lines = 0
+        pending = None
+        seen = set()
+
+        with open(source, 'rb') as handle, \
+                open(rejects_path, 'a' if checkpoint else 'w', newline='', encoding='utf-8') as rejects_file:
+            rejects = csv.writer(rejects_file)
+            if rejects_file.tell() == 0:
+                rejects.writerow(['line', 'order_ref', 'reason'])
+
+            records = (self._csv_records if fmt == 'csv' else self._jsonl_records)(
+                handle, offset, line_no
+            )
+            for record_line, end_offset, end_line, row, error in records:
+                stats['rows'] += 1
+                ref = str(row.get('order_ref') or '').strip() if row else ''
+
+                if pending is None or not ref or ref != pending.ref:
+                    if pending is not None:
+                        chunk.append(pending)
+                        chunk_lines += len(pending.lines)
+                        if len(chunk) >= chunk_orders or chunk_lines >= IMPORT_CHUNK_LINES:
+                            self._write_chunk(chunk, source, fingerprint, stats, rejects,
+                                              multi_row, step)
+                            chunk, chunk_lines = [], 0
+                            if progress and time.perf_counter() - last_report >= IMPORT_PROGRESS_SECONDS:
+                                last_report = time.perf_counter()
+                                progress(self._timed(stats, started))
+                    pending = _PendingOrder(ref, record_line)
+                    if ref in seen:
+                        pending.error = f"order_ref {ref} appears again after other orders"
+                    elif ref:
+                        seen.add(ref)
+
+                pending.end_offset, pending.end_line = end_offset, end_line
+                if pending.error:
+                    continue
+                if error:
+                    pending.error = f"line {record_line}: {error}"
+                    continue
+                try:
+                    _, header, line = self._parse(row)
+                except ValueError as e:
+                    pending.error = f"line {record_line}: {e}"
+                    continue
+                if pending.header is None:
+                    pending.header = header
+                elif header != pending.header:
+                    pending.error = f"line {record_line}: order fields differ from the order's first line"
+                    continue
+                pending.lines.append(line)
+
+            if pending is not None:
+                chunk.append(pending)
+            self._write_chunk(chunk, source, fingerprint, stats, rejects, multi_row, step,
+                              completed=True, end=(offset, line_no))
+
+        stats['completed'] = True
+        self._timed(stats, started)
+        if progress:
+            progress(stats)
+        logger.info(f"Imported {source}: {stats['orders']} orders, {stats['lines']} lines, "
+                    f"{stats['rejected']} rejected ({stats['rows_per_sec']:.0f} rows/sec)")
+        return stats
+
+    def _preload(self):
+        """Load the keys orders are validated against."""
+        self.customers = self.repo.load_customer_ids()
+        self.salesmen = self.repo.load_salesman_ids()
+        self.prices = self.repo.load_stock_prices()
+        logger.info(f"Preloaded {len(self.customers)} customers, {len(self.salesmen)} salesmen, "
+                    f"{len(self.prices)} stock rows")
+
+    def _write_chunk(self, chunk, source, fingerprint, stats, rejects, multi_row, step,
+                     completed=False, end=None):
+        """
+        Write a chunk of orders and advance the checkpoint in one transaction.
+
+        Args:
+            chunk: Collected orders, in file order
+            end: (byte_offset, line_no) to record when the chunk is empty
+        """
+        byte_offset, line_no = (chunk[-1].end_offset, chunk[-1].end_line) if chunk else end
+
+        def work():
+            valid = [order for order in chunk if not order.error]
+            rejected = [order for order in chunk if order.error]
+            reserving = [order for order in valid if order.header[2] != CANCELLED]
+            shortages = self.inventory.reserve_each([order.quantities() for order in reserving])
+            short = {}
+            for order, missing in zip(reserving, shortages):
+                if missing:
+                    short[id(order)] = str(InsufficientStockError(missing))
+            accepted = [order for order in valid if id(order) not in short]
+            rejected += [order for order in valid if id(order) in short]
+
+            order_ids = self.repo.insert_headers(
+                [order.header for order in accepted], multi_row, step
+            )
+            lines = [(order_id, *line)
+                     for order_id, order in zip(order_ids, accepted) for line in order.lines]
+            self.repo.insert_lines(lines)
+            self.repo.save_checkpoint(
+                source, fingerprint, byte_offset, line_no,
+                stats['orders'] + len(accepted), stats['lines'] + len(lines),
+                stats['rejected'] + len(rejected), completed
+            )
+            return len(accepted), len(lines), [
+                (order.line_no, order.ref, order.error or short[id(order)]) for order in rejected
+            ]
+
+        orders, lines, rejected = self.inventory.atomic(work)
+        stats['orders'] += orders
+        stats['lines'] += lines
+        stats['rejected'] += len(rejected)
+        rejects.writerows(sorted(rejected))
+
+    def _parse(self, row):
+        """
+        Validate one record against the preloaded keys.
+
+        Returns:
+            tuple: (order_ref, (customer_id, salesman_id, status, order_date),
+                    (warehouse_id, product_id, qty, unit_price))
+
+        Raises:
+            ValueError: With the reason the record is invalid
+        """
+        ref = str(row.get('order_ref') or '').strip()
+        if not ref:
+            raise ValueError("missing order_ref")
+
+        customer_id = _int(row, 'customer_id')
+        if customer_id not in self.customers:
+            raise ValueError(f"unknown customer {customer_id}")
+        salesman_id = _int(row, 'salesman_id', required=False)
+        if salesman_id is not None and salesman_id not in self.salesmen:
+            raise ValueError(f"unknown salesman {salesman_id}")
+        status = str(row.get('status') or OrderStatus.PENDING.value).strip().upper()
+        if status not in STATUSES:
+            raise ValueError(f"invalid status {status!r}")
+        order_date = row.get('order_date')
+        try:
+            order_date = date.fromisoformat(str(order_date).strip()) if order_date else date.today()
+        except ValueError:
+            raise ValueError(f"invalid order_date {order_date!r}")
+
+        warehouse_id = _int(row, 'warehouse_id')
+        product_id = _int(row, 'product_id')
+        if (warehouse_id, product_id) not in self.prices:
+            raise ValueError(f"product {product_id} is not stocked in warehouse {warehouse_id}")
+        qty = _int(row, 'qty')
+        if qty <= 0:
+            raise ValueError(f"invalid qty {qty}")
+        unit_price = row.get('unit_price')
+        if unit_price in (None, ''):
+            unit_price = self.prices[(warehouse_id, product_id)]
+        else:
+            try:
+                unit_price = Decimal(str(unit_price).strip())
+            except InvalidOperation:
+                raise ValueError(f"invalid unit_price {unit_price!r}")
+            if not unit_price.is_finite() or unit_price < 0:
+                raise ValueError(f"invalid unit_price {unit_price}")
+
+        return ref, (customer_id, salesman_id, status, order_date), \
+            (warehouse_id, product_id, qty, unit_price)
+
+    @staticmethod
+    def _csv_records(handle, offset, line_no):
+        """
+        Stream CSV records from a binary file, starting at a byte offset.
+
+        Yields:
+            tuple: (line_no, end_offset, end_line, row dict, error); the end
+                   is where the next record starts
+        """
+        header_line = handle.readline()
+        header = [name.strip().lower() for name in
+                  next(csv.reader([header_line.decode('utf-8-sig', errors='replace')]), [])]
+        if not header:
+            return
+        if offset:
+            handle.seek(offset)
+        else:
+            offset, line_no = len(header_line), 1
+
+        position = [offset]
+
+        def lines():
+            for raw in iter(handle.readline, b''):
+                position[0] += len(raw)
+                yield raw.decode('utf-8', errors='replace')
+
+        reader = csv.reader(lines())
+        consumed = 0
+        for values in reader:
+            record_line = line_no + consumed + 1
+            consumed = reader.line_num
+            if not values:
+                continue
+            if len(values) != len(header):
+                yield record_line, position[0], line_no + consumed, None, \
+                    f"expected {len(header)} fields, got {len(values)}"
+            else:
+                yield record_line, position[0], line_no + consumed, dict(zip(header, values)), None
+
+    @staticmethod
+    def _jsonl_records(handle, offset, line_no):
+        """Stream JSONL records from a binary file; yields as _csv_records."""
+        handle.seek(offset)
+        for raw in iter(handle.readline, b''):
+            offset += len(raw)
+            line_no += 1
+            text = raw.decode('utf-8', errors='replace').lstrip('\ufeff').strip()
+            if not text:
+                continue
+            try:
+                obj = json.loads(text)
+            except ValueError as e:
+                yield line_no, offset, line_no, None, f"invalid JSON ({e})"
+                continue
+            if not isinstance(obj, dict):
+                yield line_no, offset, line_no, None, "expected a JSON object"
+                continue
+            if 'lines' not in obj:
+                yield line_no, offset, line_no, obj, None
+                continue
+
+            order = {name: value for name, value in obj.items() if name != 'lines'}
+            lines = obj['lines']
+            if not isinstance(lines, list) or not lines:
+                yield line_no, offset, line_no, order, "expected a non-empty lines list"
+                continue
+            for line in lines:
+                if isinstance(line, dict):
+                    yield line_no, offset, line_no, {**line, **order}, None
+                else:
+                    yield line_no, offset, line_no, order, "expected lines to be JSON objects"
+
+    @staticmethod
+    def _fingerprint(source):
+        """Hash the start of the file, to recognise it when resuming."""
+        with open(source, 'rb') as handle:
+            return hashlib.sha256(handle.read(FINGERPRINT_BYTES)).hexdigest()
+
+    @staticmethod
+    def _timed(stats, started):
+        stats['seconds'] = time.perf_counter() - started
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
+
+
+def _int(row, name, required=True):
+    """Read an integer field of a record."""
+    value = row.get(name)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise ValueError(f"missing {name}")
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"invalid {name} {value!r}")
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"invalid {name} {value!r}")
+
+
+def _report(stats):
+    print(f"{stats['rows']} rows read, {stats['orders']} orders / {stats['lines']} lines imported, "
+          f"{stats['rejected']} orders rejected ({stats['rows_per_sec']:.0f} rows/sec)")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="NovaFlow bulk order import")
+    parser.add_argument('file', help="CSV or JSONL file of order lines")
+    parser.add_argument('--format', choices=sorted(set(FORMATS.values())), default=None,
+                        help="input format (default: from the file extension)")
+    parser.add_argument('--rejects', default=None,
+                        help="CSV of rejected orders (default: FILE.rejects.csv)")
+    parser.add_argument('--restart', action='store_true',
+                        help="ignore the checkpoint and import from the start")
+    parser.add_argument('--chunk-orders', type=int, default=IMPORT_CHUNK_ORDERS,
+                        help="orders written per transaction")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = OrderImportService().import_file(
+            args.file, fmt=args.format, rejects_path=args.rejects, restart=args.restart,
+            chunk_orders=max(1, args.chunk_orders), progress=_report
+        )
+    except (OrderImportError, OSError) as e:
+        logger.error(str(e))
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+
+    if stats['rows'] == 0 and stats['resumed']:
+        print(f"{args.file} was already imported: {stats['orders']} orders, "
+              f"{stats['rejected']} rejected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Order Service
+
+Business logic for saving orders and their lines.
+
+Stock is reserved through InventoryService in the order's own transaction:
+the stock rows of all lines are locked in key order and decremented
+conditionally before the lines are inserted, returned when lines are
+deleted, and moved as a whole when an order is cancelled, revived or
+deleted. The order_items triggers apply each line's amount to the order
+total (orders_m.total_amount is never written from Python). Every save is
+a handful of statements regardless of the number of lines, and is rerun
+after a deadlock.
+"""
+from collections import defaultdict
+from datetime import date
+
+from models.order_repository import OrderRepository
+from services.inventory_service import InventoryService
+from utils.constants import OrderStatus
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CANCELLED = OrderStatus.CANCELLED.value
+
+
+class OrderError(Exception):
+    """Raised when an order cannot be saved as requested."""
+    pass
+
+
+class OrderService:
+    """
+    Service layer for order persistence.
+    """
+
+    def __init__(self):
+        self.repo = OrderRepository()
+        self.inventory = InventoryService()
+
+    def create_order(self, customer_id, salesman_id, items) -> tuple:
+        """
+        Create a pending order with its lines in one transaction.
+
+        Args:
+            customer_id: Ordering customer
+            salesman_id: Salesman taking the order
+            items: List of dicts with warehouse_id, product_id, qty, unit_price
+
+        Returns:
+            tuple: (order_id, error_message)
+                   On success: (id, None)
+                   On failure: (None, error_string)
+        """
+        def place():
+            self.inventory.reserve_lines(self._totals(items))
+            order_id = self.repo.create_order(
+                customer_id, salesman_id, OrderStatus.PENDING.value, date.today()
+            )
+            self.repo.add_items(order_id, items)
+            return order_id
+
+        try:
+            order_id = self.inventory.atomic(place)
+            logger.info(f"Order created: #{order_id} ({len(items)} lines)")
+            return order_id, None
+
+        except Exception as e:
+            logger.error(f"Failed to create order: {e}")
+            return None, str(e)
+
+    def update_order(self, order_id, status, new_items=(), removed_item_ids=()) -> tuple:
+        """
+        Save changes to an existing order in one transaction.
+
+        A cancelled order keeps its lines but not their stock: moving to
+        CANCELLED returns the stock, moving out of it takes the stock again.
+        The lines of an order that stays cancelled cannot be changed.
+
+        Args:
+            order_id: Order to update
+            status: New status
+            new_items: Lines to add (dicts as for create_order)
+            removed_item_ids: order_item_ids of lines to delete
+
+        Returns:
+            tuple: (success, error_message)
+        """
+        new_items = list(new_items)
+        removed_item_ids = list(removed_item_ids)
+
+        def save():
+            order = self.repo.lock_order(order_id)
+            if order is None:
+                raise OrderError(f"Order #{order_id} no longer exists")
+            was_cancelled = order['status'] == CANCELLED
+
+            if was_cancelled and status == CANCELLED and (new_items or removed_item_ids):
+                raise OrderError("Lines of a cancelled order cannot be changed")
+
+            if was_cancelled and status != CANCELLED:
+                # Revive the existing lines first, so the changes below
+                # move stock like on any active order
+                self.inventory.reserve(self.repo.get_item_totals(order_id))
+
+            if removed_item_ids:
+                self.inventory.release_lines(
+                    self.repo.get_item_totals(order_id, removed_item_ids)
+                )
+                self.repo.delete_items(order_id, removed_item_ids)
+            if new_items:
+                self.inventory.reserve_lines(self._totals(new_items))
+                self.repo.add_items(order_id, new_items)
+
+            if status == CANCELLED and not was_cancelled:
+                # Before the status change: restore_stock skips cancelled orders
+                self._restore_stock([order_id])
+            if status != order['status']:
+                self.repo.update_status(order_id, status)
+
+        try:
+            self.inventory.atomic(save)
+            logger.info(f"Order updated: #{order_id} ({len(new_items)} added, "
+                        f"{len(removed_item_ids)} removed, status {status})")
+            return True, None
+
+        except Exception as e:
+            logger.error(f"Failed to update order #{order_id}: {e}")
+            return False, str(e)
+
+    def delete_orders(self, order_ids) -> tuple:
+        """
+        Delete orders and return their stock in one transaction.
+
+        The stock rows of all orders are locked in key order, their lines
+        summed per row and put back with a single statement (cancelled
+        orders have already returned theirs), then the headers are deleted
+        and their lines cascade. Orders that
+        no longer exist are skipped.
+
+        Args:
+            order_ids: Orders to delete
+
+        Returns:
+            tuple: (deleted_count, error_message)
+                   On success: (count, None)
+                   On failure: (0, error_string); nothing is deleted
+        """
+        order_ids = sorted(set(order_ids))
+
+        def delete():
+            found = list(self.repo.lock_orders(order_ids))
+            self._restore_stock(found)
+            return self.repo.delete_orders(found)
+
+        try:
+            deleted = self.inventory.atomic(delete)
+            logger.info(f"Orders deleted: {deleted} of {len(order_ids)} requested")
+            return deleted, None
+
+        except Exception as e:
+            logger.error(f"Failed to delete orders {order_ids[:10]}: {e}")
+            return 0, str(e)
+
+    def _restore_stock(self, order_ids):
+        """Return the stock of locked orders, locking its rows in key order first."""
+        self.inventory.repo.lock_stock(self.repo.get_stock_keys(order_ids))
+        self.repo.restore_stock(order_ids)
+
+    @staticmethod
+    def _totals(items):
+        """Sum line quantities per (warehouse_id, product_id)."""
+        totals = defaultdict(int)
+        for item in items:
+            totals[(item['warehouse_id'], item['product_id'])] += item['qty']
+        return dict(totals)
@@ -2,7 +2,15 @@
 Report Service
 
 Business logic for generating reports and analytics.
+
+Usage:
+    python -m services.report_service check-summary [--repair]
 """
+import argparse
+import sys
+
+from models.base_repository import BaseRepository
+from models.dashboard_repository import DashboardRepository
 from models.order_repository import OrderRepository
 from models.product_repository import ProductRepository
 from models.customer_repository import CustomerRepository
@@ -24,37 +32,86 @@ class ReportService:
         self.customer_repo = CustomerRepository()
         self.worklog_repo = WorkLogRepository()
         self.employee_repo = EmployeeRepository()
+        self.dashboard_repo = DashboardRepository()
     
-    def get_dashboard_metrics(self):
+    def get_dashboard_metrics(self, person_id=None):
         """
         Get key metrics for dashboard display.
         
+        The metrics are read in one query from the trigger-maintained
+        dashboard_summary table. Until migration 0003 is applied they are
+        aggregated from the source tables instead, also in one query.
+        
+        Args:
+            person_id: Viewer; adds new_low_stock_count, the items that went
+                       low since they last opened the low stock report
+        
         Returns:
             dict: Dictionary with metric values
         """
         try:
-            return {
-                'total_orders': self.order_repo.get_total_count(),
-                'total_revenue': self.order_repo.get_total_revenue(),
-                'total_customers': self.customer_repo.get_count(),
-                'low_stock_count': self.product_repo.get_low_stock_count()
-            }
+            metrics = self.dashboard_repo.get_summary()
+            if metrics is None:
+                metrics = self.dashboard_repo.compute_from_source()
+            metrics['new_low_stock_count'] = 0
+            if person_id is not None:
+                metrics['new_low_stock_count'] = self.product_repo.count_new_low_stock(
+                    self.product_repo.get_low_stock_seen(person_id)
+                )
+            return metrics
         except Exception as e:
             logger.error(f"Error getting dashboard metrics: {e}")
             return {
                 'total_orders': 0,
                 'total_revenue': 0,
                 'total_customers': 0,
-                'low_stock_count': 0
+                'low_stock_count': 0,
+                'new_low_stock_count': 0
             }
     
+    def check_dashboard_summary(self, repair=False):
+        """
+        Verify the dashboard summary against the source tables.
+        
+        Args:
+            repair: Rewrite the summary when it has drifted
+            
+        Returns:
+            dict: metric -> (summary value, source value) for drifted metrics
+        """
+        return self.dashboard_repo.check(repair=repair)
+    
     def get_top_salesmen(self, limit=5):
         """Get top performing salesmen."""
         return self.order_repo.get_top_salesmen(limit)
     
-    def get_low_stock_items(self, limit=10):
-        """Get items with low stock."""
-        return self.product_repo.get_low_stock_items(limit)
+    def get_low_stock_items(self, limit=10, person_id=None):
+        """
+        Get items with low stock, lowest stock first.
+        
+        Args:
+            limit: Maximum number of items
+            person_id: Viewer; items that went low since their previous
+                       view are flagged is_new, and the view is recorded
+                       once it has shown all of them
+        
+        Returns:
+            list: Item dicts
+        """
+        if person_id is None:
+            return self.product_repo.get_low_stock_items(limit)
+        
+        with BaseRepository.session(transactional=True):
+            # Events newer than latest are flagged again on the next view
+            latest = self.product_repo.get_latest_low_stock_event()
+            seen = self.product_repo.get_low_stock_seen(person_id)
+            items = self.product_repo.get_low_stock_items(limit, since_event_id=seen)
+            # Only mark the view seen if it showed every new item; new items
+            # beyond the limit stay counted on the dashboard card
+            shown_new = sum(1 for item in items if item['is_new'])
+            if latest is not None and self.product_repo.count_new_low_stock(seen) <= shown_new:
+                self.product_repo.mark_low_stock_seen(person_id, latest)
+        return items
     
     def get_salesman_metrics(self, salesman_id):
         """
@@ -66,11 +123,12 @@ class ReportService:
         Returns:
             dict: Salesman-specific metrics
         """
-        return {
-            'total_orders': self.order_repo.get_total_count(salesman_id=salesman_id),
-            'total_sales': self.order_repo.get_total_revenue(salesman_id=salesman_id),
-            'customer_count': self.customer_repo.get_count(salesman_id=salesman_id)
-        }
+        with BaseRepository.session(transactional=True):
+            return {
+                'total_orders': self.order_repo.get_total_count(salesman_id=salesman_id),
+                'total_sales': self.order_repo.get_total_revenue(salesman_id=salesman_id),
+                'customer_count': self.customer_repo.get_count(salesman_id=salesman_id)
+            }
     
     def get_employee_metrics(self, employee_id, month=None, year=None):
         """
@@ -96,3 +154,27 @@ class ReportService:
                 employee_id, month=month, year=year
             )
         }
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="NovaFlow report maintenance")
+    parser.add_argument('command', choices=['check-summary'])
+    parser.add_argument('--repair', action='store_true',
+                        help="rewrite the dashboard summary if it has drifted")
+    args = parser.parse_args(argv)
+
+    drift = ReportService().check_dashboard_summary(repair=args.repair)
+    if not drift:
+        print("Dashboard summary is consistent")
+        return 0
+    for name, (summary, source) in drift.items():
+        print(f"{name:<16} summary={summary}  source={source}")
+    if args.repair:
+        print("Dashboard summary repaired")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
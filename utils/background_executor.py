@@ -0,0 +1,176 @@
+"""
+Background Executor
+
+Runs blocking work (repository and service calls) on worker threads so the
+Tk main loop never waits on MySQL. Results are handed back to the Tk thread
+by polling a queue with ``root.after``. Tk widgets must only be touched from
+callbacks, never from the submitted function itself.
+
+Every task is submitted under a key. A newer task with the same key
+supersedes the older one: the older task is cancelled if it has not started
+yet, and its result is discarded if it has.
+"""
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.constants import BACKGROUND_WORKERS, BACKGROUND_POLL_MS
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BackgroundExecutor:
+    """
+    Worker pool bound to one Tk root.
+
+    Usage:
+        executor = get_executor(root)
+        executor.submit('orders', lambda: repo.get_all(),
+                        on_success=populate, on_error=show_error)
+    """
+
+    def __init__(self, root, max_workers=BACKGROUND_WORKERS, poll_ms=BACKGROUND_POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-worker')
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._tokens = itertools.count(1)
+        self._latest = {}      # key -> token of the current task
+        self._pending = {}     # token -> (key, future, on_success, on_error)
+        self._polling = False
+        self._closed = False
+
+    def submit(self, key, func, on_success=None, on_error=None):
+        """
+        Run func() on a worker thread.
+
+        Args:
+            key: Supersede key; a newer submit with the same key wins
+            func: Callable run off the Tk thread (must not touch widgets)
+            on_success: Called on the Tk thread with func's return value
+            on_error: Called on the Tk thread with the raised exception
+
+        Returns:
+            int: Task token
+        """
+        if self._closed:
+            raise RuntimeError("Background executor is shut down")
+
+        token = next(self._tokens)
+        with self._lock:
+            previous = self._latest.get(key)
+            self._latest[key] = token
+            future = self._pool.submit(self._run, token, func)
+            self._pending[token] = (key, future, on_success, on_error)
+        if previous is not None:
+            self._drop(previous)
+
+        self._schedule_poll()
+        return token
+
+    def cancel(self, key):
+        """Cancel (or discard the result of) the current task for key."""
+        with self._lock:
+            token = self._latest.pop(key, None)
+        if token is not None:
+            self._drop(token)
+
+    def is_pending(self, key):
+        """True if a task for key has not delivered its result yet."""
+        with self._lock:
+            return key in self._latest
+
+    def shutdown(self):
+        """Stop accepting work and cancel tasks that have not started."""
+        self._closed = True
+        with self._lock:
+            self._latest.clear()
+            self._pending.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---- internals -------------------------------------------------------
+
+    def _run(self, token, func):
+        """Worker-thread body: run func and queue the outcome."""
+        try:
+            self._results.put((token, True, func()))
+        except Exception as e:
+            self._results.put((token, False, e))
+
+    def _drop(self, token):
+        """Forget a superseded task; cancel it if it has not started."""
+        with self._lock:
+            entry = self._pending.pop(token, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def _schedule_poll(self):
+        with self._lock:
+            if self._polling:
+                return
+            self._polling = True
+        try:
+            self.root.after(self.poll_ms, self._poll)
+        except Exception:
+            # Root already destroyed
+            self._polling = False
+
+    def _poll(self):
+        """Tk-thread: deliver finished results, then keep polling while busy."""
+        while True:
+            try:
+                token, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                entry = self._pending.pop(token, None)
+                if entry is None:
+                    continue  # superseded or cancelled
+                key, _, on_success, on_error = entry
+                if self._latest.get(key) == token:
+                    del self._latest[key]
+
+            callback = on_success if ok else on_error
+            if not ok and on_error is None:
+                logger.error(f"Background task {key!r} failed: {value}")
+            if callback is None:
+                continue
+            try:
+                callback(value)
+            except Exception as e:
+                logger.error(f"Callback for background task {key!r} failed: {e}", exc_info=True)
+
+        with self._lock:
+            self._polling = False
+            busy = bool(self._pending) and not self._closed
+        if busy:
+            self._schedule_poll()
+
+
+def get_executor(root):
+    """
+    Get the BackgroundExecutor for a Tk root, creating it on first use.
+
+    Args:
+        root: Tk root (or any widget; its toplevel root is used)
+
+    Returns:
+        BackgroundExecutor: Shared executor for this root
+    """
+    root = root._root()
+    executor = getattr(root, '_background_executor', None)
+    if executor is None:
+        executor = BackgroundExecutor(root)
+        root._background_executor = executor
+    return executor
+
+
+def shutdown_executor(root):
+    """Shut down the root's executor, if one was created (call on exit)."""
+    executor = getattr(root, '_background_executor', None)
+    if executor is not None:
+        executor.shutdown()
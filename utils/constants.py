@@ -155,3 +155,59 @@ COLORS = {
 # Table row limit for performance
 DEFAULT_PAGE_SIZE = 50
 MAX_PAGE_SIZE = 200
+
+# Rows fetched per round trip when streaming with a server-side cursor
+STREAM_CHUNK_SIZE = 500
+
+# Dropdown lookup cache: seconds an entry stays fresh, and max entries kept
+LOOKUP_CACHE_TTL = 300
+LOOKUP_CACHE_SIZE = 256
+
+# Background executor: worker threads for DB calls, result polling interval (ms)
+BACKGROUND_WORKERS = 4
+BACKGROUND_POLL_MS = 30
+
+# Shortest word InnoDB FULLTEXT indexes hold (innodb_ft_min_token_size);
+# search terms with a shorter word fall back to LIKE
+FULLTEXT_MIN_TOKEN = 3
+
+# Search-as-you-type: debounce after the last keystroke (ms), result sets
+# cached per view, and how long a cached result set may be reused (seconds)
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_CACHE_SIZE = 32
+SEARCH_CACHE_TTL = 60
+
+# Virtual treeview: rows kept materialised above and below the visible ones
+VIRTUAL_OVERSCAN = 20
+
+# Streaming rows into a view: rows per queued batch, Tk time spent adding
+# rows per event-loop turn (ms), and batches buffered ahead of the UI
+STREAM_BATCH_ROWS = 100
+STREAM_FRAME_BUDGET_MS = 12
+STREAM_QUEUE_BATCHES = 20
+
+# Dashboard view cache: views kept alive while hidden, total rows they may
+# hold, and seconds a re-shown view is trusted before it revalidates
+VIEW_CACHE_SIZE = 6
+VIEW_CACHE_MAX_ROWS = 50000
+VIEW_CACHE_TTL = 120
+
+# Stock reservation: attempts for a transaction that hit a deadlock or lock
+# wait timeout, and the base backoff before retrying (ms, doubled each time)
+DEADLOCK_RETRIES = 5
+DEADLOCK_BACKOFF_MS = 20
+
+# Bulk order import: orders written per transaction (chunks also end once
+# they hold this many lines), and seconds between progress reports
+IMPORT_CHUNK_ORDERS = 500
+IMPORT_CHUNK_LINES = 5000
+IMPORT_PROGRESS_SECONDS = 5
+
+# Order dialog product picker: matches shown per keystroke, seconds before
+# the in-memory product index checks for stock changes and before it is
+# rebuilt outright, and how far back (s) a change check re-reads rows to
+# cover transactions that committed after the previous check
+PRODUCT_PICKER_RESULTS = 50
+PRODUCT_INDEX_REFRESH_SECONDS = 30
+PRODUCT_INDEX_RELOAD_SECONDS = 900
+PRODUCT_INDEX_OVERLAP_SECONDS = 60
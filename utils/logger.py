@@ -9,13 +9,14 @@ import os
 from datetime import datetime
 
 
-def setup_logger(name, log_level=logging.INFO):
+def setup_logger(name, log_level=logging.INFO, file_prefix='app'):
     """
     Setup and return a logger instance.
     
     Args:
         name: Logger name (typically __name__)
         log_level: Logging level (default: INFO)
+        file_prefix: Log file name prefix (default: 'app' -> app_YYYYMMDD.log)
         
     Returns:
         logging.Logger: Configured logger instance
@@ -26,7 +27,7 @@ def setup_logger(name, log_level=logging.INFO):
     os.makedirs(log_dir, exist_ok=True)
     
     # Log file with date
-    log_file = os.path.join(log_dir, f'app_{datetime.now().strftime("%Y%m%d")}.log')
+    log_file = os.path.join(log_dir, f'{file_prefix}_{datetime.now().strftime("%Y%m%d")}.log')
     
     # Create logger
     logger = logging.getLogger(name)
@@ -0,0 +1,207 @@
+"""
+Startup Profiler
+
+Cold-start instrumentation behind ``python main.py --profile-startup``.
+
+While enabled, every module import is timed (cumulative and self time,
+per thread, like ``python -X importtime``), and named milestones such as
+the first paint of the login window and of the dashboard are recorded
+relative to process start. report() prints both.
+
+Enable it before importing anything heavy:
+
+    from utils.startup_profiler import profiler
+    if '--profile-startup' in sys.argv:
+        profiler.enable()
+"""
+import importlib.abc
+import sys
+import threading
+import time
+
+# Earliest timestamp available to us; the interpreter start itself is not
+# measurable from Python, so milestones are relative to this import.
+_PROCESS_START = time.perf_counter()
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader to time exec_module."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._timing(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path hook that hands out timed loaders for every import."""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, 'busy', False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+
+        loader = spec.loader
+        if loader is not None and hasattr(loader, 'exec_module'):
+            spec.loader = _TimedLoader(loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Collects import timings and startup milestones.
+
+    Usage:
+        profiler.enable()
+        ...
+        profiler.mark('login first paint')
+        profiler.report()
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.imports = {}        # module -> (cumulative_s, self_s, thread name)
+        self.marks = []          # (label, seconds since process start)
+        self._finder = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        """Start timing imports (modules already imported are not counted)."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def disable(self):
+        """Stop timing imports; collected data is kept."""
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        self.enabled = False
+
+    def mark(self, label):
+        """
+        Record a milestone (no-op unless enabled).
+
+        Args:
+            label: Milestone name, e.g. 'login first paint'
+        """
+        if self.enabled:
+            with self._lock:
+                self.marks.append((label, time.perf_counter() - _PROCESS_START))
+
+    def report(self, out=None, limit=25):
+        """
+        Print milestones and the slowest imports.
+
+        Args:
+            out: File to write to (default: sys.stderr)
+            limit: Number of imports listed
+        """
+        out = out or sys.stderr
+        with self._lock:
+            marks = list(self.marks)
+            imports = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+
+        print("\n=== Startup profile ===", file=out)
+        print("Milestones (ms since start):", file=out)
+        for label, seconds in marks:
+            print(f"  {seconds * 1000:9.1f}  {label}", file=out)
+
+        total_self = sum(entry[1] for _, entry in imports)
+        print(f"\nImports: {len(imports)} modules, {total_self * 1000:.1f} ms in module bodies", file=out)
+        print(f"  {'cumul ms':>9}  {'self ms':>9}  module", file=out)
+        for name, (cumulative, own, thread) in imports[:limit]:
+            where = '' if thread == 'MainThread' else f"  [{thread}]"
+            print(f"  {cumulative * 1000:9.1f}  {own * 1000:9.1f}  {name}{where}", file=out)
+        out.flush()
+
+    # ---- internals -------------------------------------------------------
+
+    def _timing(self, name):
+        return _ImportTimer(self, name)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class _ImportTimer:
+    """Times one module body; nested imports are subtracted from self time."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0.0
+        self.profiler._stack().append(self)
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        with self.profiler._lock:
+            self.profiler.imports[self.name] = (
+                elapsed, elapsed - self.children, threading.current_thread().name
+            )
+        return False
+
+
+def after_first_paint(widget, callback):
+    """
+    Run callback once the widget's window has been mapped and drawn.
+
+    Tk draws in idle handlers queued by Expose events; the callback is
+    queued one idle pass later so it runs after those redraws.
+
+    Args:
+        widget: Any widget of the window to watch
+        callback: Called with no arguments on the Tk thread
+    """
+    top = widget.winfo_toplevel()
+    state = {'done': False}
+
+    def exposed(event):
+        if state['done']:
+            return
+        state['done'] = True
+        top.after_idle(lambda: top.after_idle(callback))
+
+    # Expose events of every child pass through the toplevel's bind tag
+    top.bind('<Expose>', exposed, add='+')
+
+
+# Process-wide profiler used by main.py
+profiler = StartupProfiler()
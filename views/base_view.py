@@ -7,29 +7,47 @@ Handles standardized layouts, headers, and widget creation helpers.
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils.constants import COLORS, DEFAULT_PAGE_SIZE
+from utils.background_executor import get_executor
+from views.virtual_treeview import VirtualTreeview
+from views.tree_sync import sync_tree
+from views.row_stream import RowStream
 
 class BaseView:
     """Base class for all dashboard views"""
     
-    def __init__(self, parent, current_user):
+    # Tables the view displays; a write to any of them makes a cached copy
+    # of the view revalidate when it is shown again (see ViewCache)
+    CACHE_TABLES = ()
+    
+    def __init__(self, parent, current_user, clear_parent=True):
         """
         Initialize the view.
         
         Args:
             parent: Parent widget (usually the content area frame)
             current_user: Dict containing logged-in user info
+            clear_parent: Destroy the parent's other children first (False
+                          when a ViewCache keeps hidden views there)
         """
         self.parent = parent
         self.current_user = current_user
         self.root = parent.winfo_toplevel()
+        self.executor = get_executor(self.root)
+        self._async_keys = set()      # keys with a request in flight
+        self._loading_label = None
+        self._tree_rows = {}          # tree path -> rows shown (see show_rows)
+        self._streams = {}            # key -> active RowStream
+        self._progress = {}           # key -> rows streamed so far
         
         # Clear parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        if clear_parent:
+            for widget in self.parent.winfo_children():
+                widget.destroy()
             
         # Main container for this view - "Card" look
         self.frame = tk.Frame(self.parent, bg='white')
         self.frame.pack(fill='both', expand=True, padx=0, pady=0)
+        self.frame.bind('<Destroy>', self._on_destroy, add='+')
         
         # Add a subtle border/shadow effect via a nested frame if needed, 
         # but pure white card on grey bg is standard modern look.
@@ -40,6 +58,202 @@ class BaseView:
         """Override this method to build the UI"""
         pass
     
+    def show(self):
+        """Re-display the view after hide()."""
+        self.frame.pack(fill='both', expand=True, padx=0, pady=0)
+    
+    def hide(self):
+        """Unmap the view, keeping its widgets and rows for a later show()."""
+        self.frame.pack_forget()
+        search = getattr(self, 'search', None)
+        if search is not None:
+            # Only the rows on screen are worth keeping while hidden
+            search.trim()
+    
+    def revalidate(self):
+        """
+        Reload the data of a re-shown view whose rows may be out of date.
+        
+        The rows already displayed stay until the reload replaces them.
+        Views whose reload is not load_data() override this.
+        """
+        load_data = getattr(self, 'load_data', None)
+        if load_data is not None:
+            load_data()
+    
+    def cached_rows(self):
+        """Rows the view holds (for the view cache's memory cap)."""
+        tree = getattr(self, 'tree', None)
+        if tree is None:
+            return 0
+        if isinstance(tree, VirtualTreeview):
+            return tree.row_count()
+        return len(tree.get_children())
+    
+    def run_async(self, key, func, on_success, on_error=None, show_loading=True):
+        """
+        Run a repository/service call off the Tk thread.
+        
+        Read any Tk variables before calling and pass plain values into
+        func; func must not touch widgets. A newer call with the same key
+        supersedes an older one still in flight (e.g. a new search), whose
+        result is then discarded.
+        
+        Args:
+            key: Request name, unique within this view (e.g. 'load')
+            func: Callable doing the blocking work
+            on_success: Called on the Tk thread with func's result
+            on_error: Called on the Tk thread with the exception
+                      (default: error message box)
+            show_loading: Show the loading indicator while pending
+        """
+        task_key = (id(self), key)
+        
+        def deliver(callback, value):
+            self._async_keys.discard(key)
+            if not self._alive():
+                return
+            self._update_loading()
+            callback(value)
+        
+        def failed(exc):
+            (on_error or (lambda e: self.show_error(str(e))))(exc)
+        
+        if show_loading:
+            self._async_keys.add(key)
+            self._update_loading()
+        
+        return self.executor.submit(
+            task_key, func,
+            on_success=lambda result: deliver(on_success, result),
+            on_error=lambda exc: deliver(failed, exc)
+        )
+    
+    def cancel_async(self, key):
+        """Cancel this view's in-flight request for key."""
+        self.executor.cancel((id(self), key))
+        self._async_keys.discard(key)
+        if self._alive():
+            self._update_loading()
+    
+    def stream_rows(self, key, source, tree, render, on_done=None, on_error=None):
+        """
+        Stream rows from a repository generator into a Treeview.
+        
+        The generator runs on a worker thread; rows are added on the Tk
+        thread in time-sliced batches, with a row count in the loading
+        indicator. The tree keeps its old rows until the first batch
+        arrives. A newer stream with the same key, cancel_stream, or
+        leaving the view stops the stream and closes the generator.
+        
+        Args:
+            key: Stream name, unique within this view
+            source: Callable returning the row iterator (e.g.
+                    lambda: repo.iter_all(**filters)); runs off the Tk thread
+            tree: Treeview from create_treeview
+            render: row -> (iid, values, tags)
+            on_done: Called with the list of all streamed rows
+            on_error: Called with the exception (default: error message box)
+        
+        Returns:
+            RowStream: The running stream
+        """
+        self.cancel_stream(key)
+        rows = []
+        shown = {}
+        virtual = isinstance(tree, VirtualTreeview)
+        
+        def add(batch):
+            first = not rows
+            rows.extend(batch)
+            if virtual:
+                # The tree renders from rows itself; only the band costs Tk calls
+                if first:
+                    tree.set_rows(rows, render)
+                else:
+                    tree.refresh_rows()
+                return
+            if first:
+                tree.delete(*tree.get_children())
+                # Kept current per batch, so show_rows can sync from a
+                # stream that was cancelled or failed part-way
+                self._tree_rows[str(tree)] = shown
+            for row in batch:
+                iid, values, tags = render(row)
+                tree.insert('', 'end', iid=iid, values=values, tags=tags)
+                shown[iid] = (tuple(values), tuple(tags))
+        
+        def finished(count):
+            self._end_stream(key, stream)
+            if not rows:
+                add([])
+            if on_done:
+                on_done(rows)
+        
+        def failed(exc):
+            self._end_stream(key, stream)
+            (on_error or (lambda e: self.show_error(str(e))))(exc)
+        
+        def progress(count):
+            self._progress[key] = count
+            self._update_loading()
+        
+        stream = RowStream(self, source, add, on_done=finished, on_error=failed,
+                           on_progress=progress)
+        self._streams[key] = stream
+        self._progress[key] = 0
+        self._update_loading()
+        stream.start()
+        return stream
+    
+    def cancel_stream(self, key):
+        """Stop this view's stream for key, if one is running."""
+        stream = self._streams.get(key)
+        if stream is not None:
+            stream.cancel()
+            self._end_stream(key, stream)
+    
+    def _end_stream(self, key, stream):
+        if self._streams.get(key) is stream:
+            del self._streams[key]
+            self._progress.pop(key, None)
+            if self._alive():
+                self._update_loading()
+    
+    def _alive(self):
+        try:
+            return bool(self.frame.winfo_exists())
+        except tk.TclError:
+            return False
+    
+    def _update_loading(self):
+        """Show or hide the loading indicator for pending requests and streams."""
+        if self._async_keys or self._streams:
+            if self._loading_label is None:
+                self._loading_label = tk.Label(self.frame, text="⏳ Loading...", bg='white',
+                                               fg=COLORS['text_muted'], font=('Segoe UI', 10))
+            streamed = sum(self._progress.values())
+            self._loading_label.config(
+                text=f"⏳ Loading... {streamed:,} rows" if streamed else "⏳ Loading..."
+            )
+            self._loading_label.place(relx=1.0, x=-24, y=6, anchor='ne')
+            self._loading_label.lift()
+            self.frame.config(cursor='watch')
+        elif self._loading_label is not None:
+            self._loading_label.place_forget()
+            self.frame.config(cursor='')
+    
+    def _on_destroy(self, event):
+        """Drop pending requests and streams when the view is torn down."""
+        if event.widget is not self.frame:
+            return
+        for key in list(self._async_keys):
+            self.executor.cancel((id(self), key))
+        self._async_keys.clear()
+        for stream in list(self._streams.values()):
+            stream.cancel()
+        self._streams.clear()
+    
     def create_header(self, title, button_text=None, button_command=None):
         """
         Create a standardized header with title and optional action button.
@@ -86,6 +300,9 @@ class BaseView:
     def create_toolbar(self, search_command=None, filter_options=None):
         """
         Create a standardized toolbar with search and filters.
+        
+        search_command runs on Return / Search click. For search-as-you-type,
+        attach an IncrementalSearch to widgets['search_var'].
         """
         toolbar = tk.Frame(self.frame, bg=COLORS['bg_light'], padx=15, pady=10)
         toolbar.pack(fill='x', padx=20)
@@ -138,9 +355,15 @@ class BaseView:
         
         return widgets
 
-    def create_treeview(self, columns, parent_frame=None):
+    def create_treeview(self, columns, parent_frame=None, virtual=False):
         """
         Create a standardized Treeview widget with scrollbar.
+        
+        Args:
+            columns: Column identifiers (also used as heading text)
+            parent_frame: Optional container (default: new frame in the view)
+            virtual: Use a VirtualTreeview, which only creates Tk items for
+                     the visible rows; for listings that can grow large
         """
         if parent_frame is None:
             parent_frame = tk.Frame(self.frame, bg='white')
@@ -151,8 +374,9 @@ class BaseView:
         scrollbar.pack(side='right', fill='y')
         
         # Treeview
-        tree = ttk.Treeview(parent_frame, columns=columns, show='headings', 
-                           yscrollcommand=scrollbar.set, height=15)
+        tree_class = VirtualTreeview if virtual else ttk.Treeview
+        tree = tree_class(parent_frame, columns=columns, show='headings', 
+                          yscrollcommand=scrollbar.set, height=15)
         
         for col in columns:
             tree.heading(col, text=col)
@@ -179,6 +403,26 @@ class BaseView:
         
         return tree
 
+    def show_rows(self, tree, rows, render):
+        """
+        Show rows in a Treeview created by create_treeview.
+        
+        Rows are keyed by the iid that render returns (the primary key), and
+        only rows added, removed, changed or moved since the last call cost Tk
+        calls, so selection and scroll position survive a refresh.
+        
+        Args:
+            tree: Treeview (plain or virtual) only ever filled through here
+            rows: Row dicts in display order
+            render: row -> (iid, values, tags)
+        """
+        if isinstance(tree, VirtualTreeview):
+            tree.set_rows(rows, render)
+            return
+        key = str(tree)
+        self._tree_rows[key] = sync_tree(tree, [render(row) for row in rows],
+                                         self._tree_rows.get(key, {}))
+
     def show_error(self, message):
         messagebox.showerror("Error", message)
 
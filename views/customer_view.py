@@ -4,10 +4,13 @@ Customer View - Manages customer UI interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.customer_repository import CustomerRepository
 from config.database import get_db_connection
 
 class CustomerView(BaseView):
+    CACHE_TABLES = ('customers', 'person', 'orders_m')
+
     def create_ui(self):
         self.repository = CustomerRepository()
         self.search_var = tk.StringVar()
@@ -15,6 +18,13 @@ class CustomerView(BaseView):
         self.create_header("👥 Customer Management", "#0891b2")
         self.create_toolbar()
         self.create_treeview()
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate
+        )
         self.load_data()
 
     def create_toolbar(self):
@@ -25,7 +35,6 @@ class CustomerView(BaseView):
         search_frame.pack(side='left')
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left')
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var, bg='#f8fafc', relief='solid', bd=1).pack(side='left')
 
         btn_frame = tk.Frame(toolbar, bg='white')
@@ -56,24 +65,22 @@ class CustomerView(BaseView):
         self.tree.bind('<Double-1>', lambda e: self.edit_customer())
 
     def load_data(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Salesman typically sees everyone but highlights his own - logic from main.py
-            customers = self.repository.get_all(search_term=self.search_var.get())
-            
-            my_id = self.current_user['person_id']
-            
-            for cust in customers:
-                tag = 'my_customer' if cust['salesman_id'] == my_id else ''
-                self.tree.insert('', 'end', values=(
-                    cust['customer_id'], cust['name'], cust['email'] or '-',
-                    cust['phone'] or '-', cust['salesman_name'] or 'Unassigned', cust['order_count']
-                ), tags=(tag,))
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        """Reload from the database (drops cached search results)"""
+        self.search.refresh()
+
+    def list_filters(self):
+        # Salesman typically sees everyone but highlights his own - logic from main.py
+        return {}
+
+    def populate_tree(self, customers):
+        self.show_rows(self.tree, customers, self.customer_item)
+
+    def customer_item(self, cust):
+        tag = 'my_customer' if cust['salesman_id'] == self.current_user['person_id'] else ''
+        return str(cust['customer_id']), (
+            cust['customer_id'], cust['name'], cust['email'] or '-',
+            cust['phone'] or '-', cust['salesman_name'] or 'Unassigned', cust['order_count']
+        ), (tag,)
 
     def add_customer(self):
         from dialogs.customer_dialog import CustomerDialog
@@ -4,24 +4,41 @@ Dashboard View
 Main application shell containing sidebar navigation and content area.
 Handles routing between different modules.
 """
+import importlib
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils.constants import COLORS, PersonType, has_permission
 from utils.logger import setup_logger
-
-# Import Views
-from views.employee_view import EmployeeView
-from views.department_view import DepartmentView
-from views.project_view import ProjectView
-from views.warehouse_view import WarehouseView
-from views.product_view import ProductView
-from views.customer_view import CustomerView
-from views.order_view import OrderView
-from views.worklog_view import WorkLogView
-from views.report_view import ReportView
+from views.view_cache import ViewCache
 
 logger = setup_logger(__name__)
 
+# View modules are imported on first navigation rather than at startup
+VIEWS = {
+    'EmployeeView': 'views.employee_view',
+    'DepartmentView': 'views.department_view',
+    'ProjectView': 'views.project_view',
+    'WarehouseView': 'views.warehouse_view',
+    'ProductView': 'views.product_view',
+    'CustomerView': 'views.customer_view',
+    'OrderView': 'views.order_view',
+    'WorkLogView': 'views.worklog_view',
+    'ReportView': 'views.report_view',
+}
+
+
+def load_view(name):
+    """
+    Get a view class by name, importing its module on first use.
+    
+    Args:
+        name: Class name, a key of VIEWS
+        
+    Returns:
+        type: The BaseView subclass
+    """
+    return getattr(importlib.import_module(VIEWS[name]), name)
+
 
 class DashboardView:
     """Main Dashboard Container"""
@@ -67,6 +84,9 @@ class DashboardView:
         # Add shadow/border effect to content area
         self.content_area.config(highlightbackground='#e2e8f0', highlightthickness=1)
         
+        # Views are kept while hidden and re-shown from this cache
+        self.views = ViewCache(self.content_area, self.current_user)
+        
         # Show default view based on role
         self.show_default_view()
         
@@ -182,31 +202,31 @@ class DashboardView:
             btn.config(bg=COLORS['bg_card'], fg='#e2e8f0')
 
     def show_employees(self):
-        self.current_view = EmployeeView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('EmployeeView'))
         
     def show_departments(self):
-        self.current_view = DepartmentView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('DepartmentView'))
         
     def show_projects(self):
-        self.current_view = ProjectView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('ProjectView'))
         
     def show_warehouses(self):
-        self.current_view = WarehouseView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('WarehouseView'))
         
     def show_products(self):
-        self.current_view = ProductView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('ProductView'))
         
     def show_customers(self):
-        self.current_view = CustomerView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('CustomerView'))
         
     def show_orders(self):
-        self.current_view = OrderView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('OrderView'))
         
     def show_work_logs(self):
-        self.current_view = WorkLogView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('WorkLogView'))
         
     def show_reports(self):
-        self.current_view = ReportView(self.content_area, self.current_user)
+        self.current_view = self.views.show(load_view('ReportView'))
         
     def show_default_view(self):
         """Determine default view based on role"""
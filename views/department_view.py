@@ -4,10 +4,13 @@ Department View - Manages department UI interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.department_repository import DepartmentRepository
 from config.database import get_db_connection
 
 class DepartmentView(BaseView):
+    CACHE_TABLES = ('departments', 'locations', 'person')
+
     def create_ui(self):
         self.repository = DepartmentRepository()
         self.search_var = tk.StringVar()
@@ -23,6 +26,14 @@ class DepartmentView(BaseView):
         self.create_treeview()
         
         # Load initial data
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load departments: {e}")
+        )
         self.load_data()
         
     def create_toolbar(self):
@@ -36,7 +47,6 @@ class DepartmentView(BaseView):
         
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left', padx=(0, 5))
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var,
                  font=('Arial', 10), bg='#f8fafc', width=30, relief='solid', bd=1).pack(side='left', ipady=5)
         
@@ -72,24 +82,26 @@ class DepartmentView(BaseView):
         self.tree.bind('<Double-1>', lambda e: self.edit_department())
 
     def load_data(self):
-        """Fetch and display departments"""
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-                
-            departments = self.repository.get_all(search_term=self.search_var.get())
-            
-            for dept in departments:
-                self.tree.insert('', 'end', values=(
-                    dept['department_id'],
-                    dept['department_name'],
-                    dept['location_name'] or 'N/A',
-                    dept['hod_name'] or 'Not Assigned',
-                    dept['employee_count']
-                ))
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load departments: {e}")
+        """Reload departments in the background (drops cached search results)"""
+        self.search.refresh()
+
+    def list_filters(self):
+        return {}
+
+    def populate_tree(self, departments):
+        """Display fetched departments"""
+        self.show_rows(self.tree, departments, self.department_item)
+
+    @staticmethod
+    def department_item(dept):
+        """Render one department row as (iid, values, tags)"""
+        return str(dept['department_id']), (
+            dept['department_id'],
+            dept['department_name'],
+            dept['location_name'] or 'N/A',
+            dept['hod_name'] or 'Not Assigned',
+            dept['employee_count']
+        ), ()
 
     def add_department(self):
         from dialogs.department_dialog import DepartmentDialog
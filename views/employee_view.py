@@ -4,12 +4,19 @@ Employee Management View
 import tkinter as tk
 from tkinter import messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.employee_repository import EmployeeRepository
-from dialogs.employee_dialog import EmployeeDialog
 from utils.constants import PersonType, has_permission, COLORS
 from config.database import get_db_connection  # For passing to dialog
 
+# Listing fields shown in the tree (lets the repository skip the salary joins),
+# plus search_key for narrowing results client-side
+LIST_COLUMNS = ('person_id', 'name', 'person_type', 'department_name', 'email',
+                'phone', 'is_active', 'supervisor_name', 'search_key')
+
 class EmployeeView(BaseView):
+    CACHE_TABLES = ('person', 'departments', 'emp_supervisor', 'employee_directory')
+
     def create_ui(self):
         self.repo = EmployeeRepository()
         
@@ -23,17 +30,18 @@ class EmployeeView(BaseView):
         filter_options = []
         # Role filter
         roles = ['All Roles', 'HOD', 'SUPERVISOR', 'SALESMAN', 'GENERAL_EMPLOYEE']
-        filter_options.append(('Role:', roles, self.refresh_data))
+        filter_options.append(('Role:', roles, lambda: self.search.run()))
         
         # Status filter
         statuses = ['Active', 'Inactive', 'All']
-        filter_options.append(('Status:', statuses, self.refresh_data))
+        filter_options.append(('Status:', statuses, lambda: self.search.run()))
         
-        self.widgets = self.create_toolbar(self.refresh_data, filter_options)
+        # Return / Search button search immediately; typing is debounced
+        self.widgets = self.create_toolbar(lambda: self.search.run(), filter_options)
         
         # Treeview
         columns = ('ID', 'Name', 'Role', 'Department', 'Email', 'Phone', 'Status', 'Supervisor')
-        self.tree = self.create_treeview(columns)
+        self.tree = self.create_treeview(columns, virtual=True)
         
         # Configure column widths
         self.tree.column('ID', width=50, anchor='center')
@@ -47,12 +55,25 @@ class EmployeeView(BaseView):
         self.tree.bind('<Double-1>', self.on_double_click)
         
         # Load initial data
+        self.search = IncrementalSearch(
+            self, self.widgets['search_var'],
+            fetch=lambda **kwargs: self.repo.get_all(columns=LIST_COLUMNS, **kwargs),
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repo.search_predicate,
+            on_error=lambda e: self.show_error(f"Failed to load employees: {e}")
+        )
         self.refresh_data()
         
     def refresh_data(self):
-        """Refresh employee list based on filters"""
-        # Get filters
-        search = self.widgets['search_var'].get().strip()
+        """Reload the employee list (drops cached search results)"""
+        self.search.refresh()
+    
+    def revalidate(self):
+        self.refresh_data()
+    
+    def list_filters(self):
+        """Current filter arguments for EmployeeRepository.get_all"""
         role_filter = self.widgets['filter_Role:'].get()
         status_filter = self.widgets['filter_Status:'].get()
         
@@ -76,41 +97,37 @@ class EmployeeView(BaseView):
         elif user_type == PersonType.SUPERVISOR:
             sup_id = self.current_user['person_id']
             
-        # Fetch data
-        try:
-            employees = self.repo.get_all(
-                department_id=dept_id,
-                supervisor_id=sup_id,
-                person_type=person_type,
-                is_active=is_active,
-                search_term=search
-            )
-            
-            # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-                
-            # Populate tree
-            for emp in employees:
-                status_display = "Active" if emp['is_active'] else "Inactive"
-                tag = 'active' if emp['is_active'] else 'inactive'
-                
-                self.tree.insert('', 'end', values=(
-                    emp['person_id'],
-                    emp['name'],
-                    emp['person_type'],
-                    emp['department_name'] or '-',
-                    emp['email'],
-                    emp['phone'],
-                    status_display,
-                    emp['supervisor_name'] or '-'
-                ), tags=(tag,))
-                
-        except Exception as e:
-            self.show_error(f"Failed to load employees: {e}")
+        return {
+            'department_id': dept_id,
+            'supervisor_id': sup_id,
+            'person_type': person_type,
+            'is_active': is_active
+        }
+    
+    def populate_tree(self, employees):
+        """Display fetched employees"""
+        self.show_rows(self.tree, employees, self.employee_item)
+
+    @staticmethod
+    def employee_item(emp):
+        """Render one employee row as (iid, values, tags)"""
+        status_display = "Active" if emp['is_active'] else "Inactive"
+        tag = 'active' if emp['is_active'] else 'inactive'
+        
+        return str(emp['person_id']), (
+            emp['person_id'],
+            emp['name'],
+            emp['person_type'],
+            emp['department_name'] or '-',
+            emp['email'],
+            emp['phone'],
+            status_display,
+            emp['supervisor_name'] or '-'
+        ), (tag,)
             
     def add_employee(self):
         """Open add employee dialog"""
+        from dialogs.employee_dialog import EmployeeDialog
         dialog = EmployeeDialog(self.root, mode='add', 
                                current_user=self.current_user,
                                db_connection_func=get_db_connection)
@@ -137,6 +154,7 @@ class EmployeeView(BaseView):
             employee_data = self.repo.get_by_id(person_id)
             
             if employee_data:
+                from dialogs.employee_dialog import EmployeeDialog
                 dialog = EmployeeDialog(self.root, mode='edit', 
                                        employee_data=employee_data,
                                        current_user=self.current_user,
@@ -0,0 +1,223 @@
+"""
+Incremental Search
+
+Search-as-you-type for list views. Keystrokes are debounced, at most one
+query per view is in flight (further keystrokes only mark the search as
+stale, and the latest term runs when the query returns), and results are
+cached per (filters, term).
+
+When the term is extended and a complete result set is cached for a prefix
+of it under the same filters, the new results are filtered from that set in
+Python using the repository's search_predicate, without a query.
+
+With a stream source, results for a new term or filter are streamed into the
+tree as they arrive (BaseView.stream_rows); refreshing the term already on
+screen still fetches the whole set and applies it as a keyed diff.
+"""
+import time
+from collections import OrderedDict
+
+from utils.constants import SEARCH_DEBOUNCE_MS, SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL
+
+
+class IncrementalSearch:
+    """
+    Drives one view's search box.
+
+    Usage:
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate
+        )
+        self.search.run()        # filter changed: search now
+        self.search.refresh()    # data changed: drop cached results, reload
+    """
+
+    def __init__(self, view, search_var, fetch, filters, on_results, predicate=None,
+                 on_error=None, max_rows=None, stream=None, stream_to=None,
+                 delay_ms=SEARCH_DEBOUNCE_MS, cache_size=SEARCH_CACHE_SIZE,
+                 cache_ttl=SEARCH_CACHE_TTL):
+        """
+        Args:
+            view: Owning BaseView (provides run_async and the Tk frame)
+            search_var: StringVar of the search entry; edits are debounced
+            fetch: fetch(search_term=..., **filters) -> list of rows (or a
+                   PagedSource, which is never refined), run on a worker thread
+            filters: Tk-thread callable returning the current filter kwargs
+                     (hashable values)
+            on_results: Called on the Tk thread with the rows to show
+            predicate: predicate(term) -> row predicate or None, mirroring
+                       the server-side search (enables client-side refinement)
+            on_error: Called with the exception (default: view.show_error)
+            max_rows: Row cap of fetch, if any; a result that reaches it is
+                      treated as incomplete and never refined
+            stream: stream(search_term=..., **filters) -> row iterator (a
+                    repository iter_all), used instead of fetch when the
+                    term or filters change
+            stream_to: (tree, render) the stream is shown in
+            delay_ms: Debounce delay after the last keystroke
+            cache_size: Result sets kept per view
+            cache_ttl: Seconds a cached result set may be reused
+        """
+        self.view = view
+        self.search_var = search_var
+        self.fetch = fetch
+        self.filters = filters
+        self.on_results = on_results
+        self.predicate = predicate
+        self.on_error = on_error
+        self.max_rows = max_rows
+        self.stream = stream
+        self.stream_to = stream_to
+        self.delay_ms = delay_ms
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        self._cache = OrderedDict()   # (filters, term) -> (expires_at, rows, complete)
+        self._after_id = None
+        self._in_flight = None        # key being fetched
+        self._generation = 0          # bumped by refresh(); older fetches are not cached
+        self._shown = None            # key of the rows on screen
+        self._last = None             # same, but kept across refresh()
+
+        search_var.trace_add('write', lambda *args: self.schedule())
+
+    def schedule(self):
+        """Run the search once typing pauses for delay_ms."""
+        self._cancel_timer()
+        self._after_id = self.view.frame.after(self.delay_ms, self.run)
+
+    def run(self):
+        """Show results for the current term and filters now."""
+        self._cancel_timer()
+        if not self.view._alive():
+            return
+
+        key = self._current_key()
+        rows = self._cached(key)
+        if rows is None:
+            rows = self._refine(key)
+        if rows is not None:
+            if key != self._shown:
+                self._show(key, rows)
+            return
+
+        if self._in_flight is None:
+            self._start(key)
+        # else: the in-flight query re-runs the latest key when it returns
+
+    def refresh(self):
+        """Drop cached results (the data changed) and reload."""
+        self._cache.clear()
+        self._generation += 1
+        self._shown = None
+        self.run()
+
+    def trim(self):
+        """Drop cached result sets other than the one on screen."""
+        for key in list(self._cache):
+            if key != self._shown:
+                del self._cache[key]
+
+    # ---- internals -------------------------------------------------------
+
+    def _current_key(self):
+        filters = tuple(sorted(self.filters().items()))
+        return filters, self.search_var.get().strip()
+
+    def _cancel_timer(self):
+        if self._after_id is not None:
+            try:
+                self.view.frame.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _start(self, key):
+        """Fetch key on a worker thread."""
+        filters, term = key
+        generation = self._generation
+        self._in_flight = key
+        if self.stream is not None and key != self._last:
+            tree, render = self.stream_to
+            self.view.stream_rows(
+                'search',
+                lambda: self.stream(search_term=term, **dict(filters)),
+                tree, render,
+                on_done=lambda rows: self._streamed(key, generation, rows),
+                on_error=self._failed
+            )
+            return
+        self.view.run_async(
+            'search',
+            lambda: self.fetch(search_term=term, **dict(filters)),
+            lambda rows: self._done(key, generation, rows),
+            on_error=self._failed
+        )
+
+    def _done(self, key, generation, rows):
+        self._in_flight = None
+        if generation == self._generation:
+            complete = ((self.max_rows is None or len(rows) < self.max_rows)
+                        and not getattr(rows, 'has_more', False))
+            self._store(key, rows, complete)
+        # Shows these rows if the key is still current; otherwise runs
+        # (or refines) the latest term
+        self.run()
+
+    def _streamed(self, key, generation, rows):
+        # Already on screen
+        self._shown = self._last = key
+        self._done(key, generation, rows)
+
+    def _failed(self, exc):
+        self._in_flight = None
+        (self.on_error or self.view.show_error)(exc)
+
+    def _show(self, key, rows):
+        self._shown = self._last = key
+        self.on_results(rows)
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, rows, complete, expires=None):
+        # Refined sets expire with the set they were filtered from
+        expires = expires or time.monotonic() + self.cache_ttl
+        self._cache[key] = (expires, rows, complete)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _refine(self, key):
+        """Filter the narrowest complete cached superset of key, if any."""
+        if self.predicate is None:
+            return None
+        filters, term = key
+        folded = term.casefold()
+        now = time.monotonic()
+        base = None
+        for (base_filters, base_term), (expires, rows, complete) in self._cache.items():
+            if (base_filters == filters and complete and expires > now
+                    and folded.startswith(base_term.casefold())
+                    and (base is None or len(base_term) > len(base[0]))):
+                base = (base_term, rows, expires)
+        if base is None:
+            return None
+
+        matches = self.predicate(term) if term else None
+        if matches is None:
+            return None
+        rows = [row for row in base[1] if matches(row)]
+        self._store(key, rows, True, expires=base[2])
+        return rows
@@ -2,12 +2,17 @@
 Order View - Manages order UI interactions
 """
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
+from views.virtual_treeview import PagedSource
 from models.order_repository import OrderRepository
 from config.database import get_db_connection
+from utils.constants import MAX_PAGE_SIZE
 
 class OrderView(BaseView):
+    CACHE_TABLES = ('orders_m', 'customers', 'person')
+
     def create_ui(self):
         self.repository = OrderRepository()
         self.search_var = tk.StringVar()
@@ -16,6 +21,13 @@ class OrderView(BaseView):
         self.create_header("🧾 Orders Management", "#4f46e5")
         self.create_toolbar()
         self.create_treeview()
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.fetch_orders,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate
+        )
         self.load_data()
 
     def create_toolbar(self):
@@ -26,13 +38,12 @@ class OrderView(BaseView):
         search_frame.pack(side='left')
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left')
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var, bg='#f8fafc', relief='solid', bd=1).pack(side='left')
 
         tk.Label(toolbar, text="Status:", bg='white').pack(side='left', padx=(20, 5))
         self.status_filter = ttk.Combobox(toolbar, values=['All', 'PENDING', 'PROCESSING', 'COMPLETED', 'CANCELLED'], state='readonly')
         self.status_filter.current(0)
-        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.load_data())
+        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.search.run())
         self.status_filter.pack(side='left')
 
         btn_frame = tk.Frame(toolbar, bg='white')
@@ -68,30 +79,32 @@ class OrderView(BaseView):
 
     def create_treeview_widget(self, columns):
         # Helper to bridge the mismatch if BaseView uses create_treeview
-        return super().create_treeview(columns)
+        return super().create_treeview(columns, virtual=True)
 
     def load_data(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            sid = self.current_user['person_id'] if self.current_user['person_type'] == 'SALESMAN' else None
-            status = self.status_filter.get()
-            
-            orders = self.repository.get_all(
-                salesman_id=sid,
-                status=status,
-                search_term=self.search_var.get()
-            )
-            
-            for ord in orders:
-                self.tree.insert('', 'end', values=(
-                    ord['order_id'], ord['order_date'], ord['customer_name'],
-                    ord['salesman_name'], f"${ord['total_amount']:.2f}", ord['status']
-                ), tags=(ord['status'],))
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.search.refresh()
+
+    def list_filters(self):
+        sid = self.current_user['person_id'] if self.current_user['person_type'] == 'SALESMAN' else None
+        return {'salesman_id': sid, 'status': self.status_filter.get()}
+
+    def fetch_orders(self, **filters):
+        """First page of orders; later pages load as the list is scrolled."""
+        return PagedSource(
+            lambda cursor: self.repository.get_page(cursor=cursor, page_size=MAX_PAGE_SIZE, **filters),
+            lambda func, on_success, on_error: self.run_async(
+                'orders_page', func, on_success, on_error=on_error, show_loading=False)
+        )
+
+    def populate_tree(self, orders):
+        self.show_rows(self.tree, orders, self.order_item)
+
+    @staticmethod
+    def order_item(ord):
+        return str(ord['order_id']), (
+            ord['order_id'], ord['order_date'], ord['customer_name'],
+            ord['salesman_name'], f"${ord['total_amount']:.2f}", ord['status']
+        ), (ord['status'],)
 
     def add_order(self):
         from dialogs.order_dialog import OrderDialog
@@ -115,37 +128,20 @@ class OrderView(BaseView):
         sel = self.tree.selection()
         if not sel: return
         
-        oid = self.tree.item(sel[0])['values'][0]
-        if messagebox.askyesno("Confirm", f"Delete Order #{oid}? Stock will be returned."):
-            # Need to implement the complex return stock logic here or in repository
-            # Main.py had this logic inline. It's better to move it to a service layer, 
-            # but for now we'll rely on the repository delete (which I implemented to just delete).
-            # WAIT: My repository delete() DOES NOT handle stock return yet. 
-            # I should fix the repository or the view.
-            # Best is to put business logic in a Service, but we are doing Repo+View.
-            # Let's fix the delete logic here using a quick inline DB call like main.py did, 
-            # or better yet update the repository to handle it.
-            # I'll update the repository to handle cascading and restoration in a transaction if possible,
-            # but for now I will mirror the main.py logic here to ensure safety.
-            
-            try:
-                # Mirroring logic from main.py
-                conn = get_db_connection()
-                cur = conn.cursor()
-                
-                # Restore stock
-                cur.execute("SELECT warehouse_id, product_id, qty FROM order_items WHERE order_id = %s", (oid,))
-                items = cur.fetchall()
-                for i in items:
-                    cur.execute("UPDATE warehouse_products SET qty = qty + %s WHERE warehouse_id = %s AND product_id = %s", 
-                               (i['qty'], i['warehouse_id'], i['product_id']))
-                
-                conn.commit()
-                conn.close()
-                
-                # Now delete
-                self.repository.delete_order(oid)
-                self.load_data()
-                
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+        order_ids = [int(iid) for iid in sel]
+        if len(order_ids) == 1:
+            prompt = f"Delete Order #{order_ids[0]}? Stock will be returned."
+        else:
+            prompt = f"Delete {len(order_ids)} orders? Their stock will be returned."
+        if not self.confirm_action("Confirm", prompt):
+            return
+        
+        from services.order_service import OrderService
+        
+        def deleted(result):
+            _, error = result
+            if error:
+                self.show_error(error)
+            self.load_data()
+        
+        self.run_async('delete', lambda: OrderService().delete_orders(order_ids), deleted)
@@ -4,10 +4,13 @@ Product View - Manages product UI interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.product_repository import ProductRepository
 from config.database import get_db_connection
 
 class ProductView(BaseView):
+    CACHE_TABLES = ('products', 'warehouse_products', 'warehouses')
+
     def create_ui(self):
         self.repository = ProductRepository()
         self.search_var = tk.StringVar()
@@ -15,6 +18,13 @@ class ProductView(BaseView):
         self.create_header("📦 Products Inventory", "#059669")
         self.create_toolbar()
         self.create_treeview()
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate
+        )
         self.load_data()
 
     def create_toolbar(self):
@@ -26,7 +36,6 @@ class ProductView(BaseView):
         search_frame.pack(side='left')
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left')
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var, bg='#f8fafc', relief='solid', bd=1).pack(side='left')
 
         # Buttons
@@ -42,7 +51,7 @@ class ProductView(BaseView):
 
     def create_treeview(self):
         columns = ('ID', 'Product Name', 'Type', 'Price', 'Warehouse', 'Stock', 'Low Stock')
-        self.tree = super().create_treeview(columns)
+        self.tree = super().create_treeview(columns, virtual=True)
         
         self.tree.heading('ID', text='ID')
         self.tree.heading('Product Name', text='Product Name')
@@ -60,30 +69,26 @@ class ProductView(BaseView):
         self.tree.bind('<Double-1>', lambda e: self.edit_product())
 
     def load_data(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            sup_id = self.current_user['person_id'] if self.current_user['person_type'] == 'SUPERVISOR' else None
-            
-            products = self.repository.get_all(
-                supervisor_id=sup_id,
-                search_term=self.search_var.get()
-            )
-            
-            for prod in products:
-                is_low = prod['qty'] <= (prod['reorder_level'] or 10)
-                tag = 'low_stock' if is_low else 'normal'
-                status = '⚠️ Low Stock' if is_low else '✅ OK'
-                
-                self.tree.insert('', 'end', values=(
-                    prod['product_id'], prod['product_name'], prod['product_type'] or '-',
-                    f"{prod['unit_price']:.2f}", prod['warehouse_name'], prod['qty'], status,
-                    # Hidden column logic is handled by repository call in edit
-                ), tags=(tag,))
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.search.refresh()
+
+    def list_filters(self):
+        sup_id = self.current_user['person_id'] if self.current_user['person_type'] == 'SUPERVISOR' else None
+        return {'supervisor_id': sup_id}
+
+    def populate_tree(self, products):
+        self.show_rows(self.tree, products, self.product_item)
+
+    @staticmethod
+    def product_item(prod):
+        is_low = prod['qty'] <= (prod['reorder_level'] or 10)
+        tag = 'low_stock' if is_low else 'normal'
+        status = '⚠️ Low Stock' if is_low else '✅ OK'
+        
+        return str(prod['warehouse_product_id']), (
+            prod['product_id'], prod['product_name'], prod['product_type'] or '-',
+            f"{prod['unit_price']:.2f}", prod['warehouse_name'], prod['qty'], status,
+            # Hidden column logic is handled by repository call in edit
+        ), (tag,)
 
     def add_product(self):
         from dialogs.product_dialog import ProductDialog
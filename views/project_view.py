@@ -4,10 +4,13 @@ Project View - Manages project UI interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.project_repository import ProjectRepository
 from config.database import get_db_connection
 
 class ProjectView(BaseView):
+    CACHE_TABLES = ('projects', 'departments', 'locations')
+
     def create_ui(self):
         self.repository = ProjectRepository()
         self.search_var = tk.StringVar()
@@ -16,6 +19,13 @@ class ProjectView(BaseView):
         self.create_header("📋 Projects Management", "#8b5cf6")
         self.create_toolbar()
         self.create_treeview()
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate
+        )
         self.load_data()
 
     def create_toolbar(self):
@@ -27,14 +37,13 @@ class ProjectView(BaseView):
         search_frame.pack(side='left')
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left')
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var, bg='#f8fafc', relief='solid', bd=1).pack(side='left')
 
         # Filter
         tk.Label(toolbar, text="Status:", bg='white').pack(side='left', padx=(20, 5))
         self.status_filter = ttk.Combobox(toolbar, values=['All', 'PLANNING', 'IN_PROGRESS', 'COMPLETED', 'ON_HOLD'], state='readonly')
         self.status_filter.current(0)
-        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.load_data())
+        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.search.run())
         self.status_filter.pack(side='left')
 
         # Buttons
@@ -71,27 +80,21 @@ class ProjectView(BaseView):
         self.tree.bind('<Double-1>', lambda e: self.edit_project())
 
     def load_data(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            dept_id = self.current_user['department_id'] if self.current_user['person_type'] == 'HOD' else None
-            status = self.status_filter.get()
-            
-            projects = self.repository.get_all(
-                department_id=dept_id,
-                status=status,
-                search_term=self.search_var.get()
-            )
-            
-            for p in projects:
-                self.tree.insert('', 'end', values=(
-                    p['project_id'], p['project_name'], p['department_name'],
-                    p['location_name'], p['status'], p['start_date'], p['end_date']
-                ), tags=(p['status'],))
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.search.refresh()
+
+    def list_filters(self):
+        dept_id = self.current_user['department_id'] if self.current_user['person_type'] == 'HOD' else None
+        return {'department_id': dept_id, 'status': self.status_filter.get()}
+
+    def populate_tree(self, projects):
+        self.show_rows(self.tree, projects, self.project_item)
+
+    @staticmethod
+    def project_item(p):
+        return str(p['project_id']), (
+            p['project_id'], p['project_name'], p['department_name'],
+            p['location_name'], p['status'], p['start_date'], p['end_date']
+        ), (p['status'],)
 
     def add_project(self):
         from dialogs.project_dialog import ProjectDialog
@@ -11,6 +11,8 @@ from utils.constants import COLORS, has_permission, PersonType
 class ReportView(BaseView):
     """Reports and Dashboard View"""
     
+    CACHE_TABLES = ('orders_m', 'customers', 'warehouse_products', 'person')
+    
     def create_ui(self):
         self.service = ReportService()
         
@@ -28,37 +30,56 @@ class ReportView(BaseView):
         metrics_frame = tk.Frame(self.frame, bg='white')
         metrics_frame.pack(fill='x', padx=20, pady=20)
         
-        # Get metrics from service
-        try:
-            metrics = self.service.get_dashboard_metrics()
-        except Exception as e:
-            metrics = {
-                'total_orders': 0,
-                'total_revenue': 0,
-                'total_customers': 0,
-                'low_stock_count': 0
-            }
-        
-        # Create cards
+        # Create cards (values are filled in once the metrics arrive)
         cards_data = [
-            ("📦 Total Orders", metrics.get('total_orders', 0), COLORS['primary']),
-            ("💰 Revenue", f"PKR {metrics.get('total_revenue', 0):,.0f}", COLORS['success']),
-            ("👥 Customers", metrics.get('total_customers', 0), COLORS['info']),
-            ("⚠️ Low Stock", metrics.get('low_stock_count', 0), COLORS['warning']),
+            ("📦 Total Orders", 'total_orders', COLORS['primary']),
+            ("💰 Revenue", 'total_revenue', COLORS['success']),
+            ("👥 Customers", 'total_customers', COLORS['info']),
+            ("⚠️ Low Stock", 'low_stock_count', COLORS['warning']),
         ]
         
-        for i, (label, value, color) in enumerate(cards_data):
+        self.metric_labels = {}
+        for i, (label, key, color) in enumerate(cards_data):
             card = tk.Frame(metrics_frame, bg=color, padx=20, pady=15)
             card.grid(row=0, column=i, padx=10, sticky='nsew')
             
             tk.Label(card, text=label, font=('Arial', 11), 
                     bg=color, fg='white').pack(anchor='w')
-            tk.Label(card, text=str(value), font=('Arial', 22, 'bold'), 
-                    bg=color, fg='white').pack(anchor='w', pady=(5, 0))
+            value_label = tk.Label(card, text="…", font=('Arial', 22, 'bold'), 
+                                   bg=color, fg='white')
+            value_label.pack(anchor='w', pady=(5, 0))
+            self.metric_labels[key] = value_label
         
         # Configure grid columns to expand equally
         for i in range(4):
             metrics_frame.columnconfigure(i, weight=1)
+        
+        self.load_metrics()
+    
+    def load_metrics(self):
+        """Get metrics from service"""
+        person_id = self.current_user['person_id']
+        self.run_async('metrics', lambda: self.service.get_dashboard_metrics(person_id),
+                       self.show_metrics,
+                       on_error=lambda e: self.show_metrics({}))
+    
+    def revalidate(self):
+        """Refresh the metric cards; a generated report stays until regenerated"""
+        self.load_metrics()
+    
+    def show_metrics(self, metrics):
+        """Fill the metric cards"""
+        low_stock = str(metrics.get('low_stock_count', 0))
+        if metrics.get('new_low_stock_count'):
+            low_stock += f" ({metrics['new_low_stock_count']} new)"
+        values = {
+            'total_orders': metrics.get('total_orders', 0),
+            'total_revenue': f"PKR {metrics.get('total_revenue', 0):,.0f}",
+            'total_customers': metrics.get('total_customers', 0),
+            'low_stock_count': low_stock,
+        }
+        for key, value in values.items():
+            self.metric_labels[key].config(text=str(value))
     
     def create_report_section(self):
         """Create report generation section"""
@@ -90,31 +111,47 @@ class ReportView(BaseView):
                 bg='white', fg=COLORS['text_muted'], font=('Arial', 12)).pack(expand=True)
     
     def generate_report(self):
-        """Generate the selected report"""
+        """Fetch the selected report in the background"""
+        report_type = self.report_type.get()
+        person_id = self.current_user['person_id']
+        
+        loaders = {
+            'Top Salesmen': (lambda: self.service.get_top_salesmen(5), self.show_top_salesmen),
+            'Low Stock Items': (lambda: self.service.get_low_stock_items(10, person_id),
+                                self.show_low_stock),
+            'Order Summary': (self.service.get_dashboard_metrics, self.show_order_summary),
+        }
+        if report_type not in loaders:
+            return
+        fetch, show = loaders[report_type]
+        
+        # A newer Generate click supersedes a report still loading
+        self.run_async('report', fetch,
+                       lambda data: self.render_report(show, data),
+                       on_error=self.show_report_error)
+    
+    def render_report(self, show, data):
+        """Replace the report area with a freshly loaded report"""
         # Clear previous
         for widget in self.report_display.winfo_children():
             widget.destroy()
         
-        report_type = self.report_type.get()
-        
         try:
-            if report_type == 'Top Salesmen':
-                self.show_top_salesmen()
-            elif report_type == 'Low Stock Items':
-                self.show_low_stock()
-            elif report_type == 'Order Summary':
-                self.show_order_summary()
+            show(data)
         except Exception as e:
-            tk.Label(self.report_display, text=f"Error: {e}", 
-                    bg='white', fg=COLORS['danger']).pack(expand=True)
+            self.show_report_error(e)
+    
+    def show_report_error(self, error):
+        for widget in self.report_display.winfo_children():
+            widget.destroy()
+        tk.Label(self.report_display, text=f"Error: {error}", 
+                bg='white', fg=COLORS['danger']).pack(expand=True)
     
-    def show_top_salesmen(self):
+    def show_top_salesmen(self, data):
         """Display top salesmen report"""
         tk.Label(self.report_display, text="🏆 Top Salesmen", 
                 font=('Arial', 14, 'bold'), bg='white').pack(pady=10)
         
-        data = self.service.get_top_salesmen(5)
-        
         if not data:
             tk.Label(self.report_display, text="No data available", 
                     bg='white', fg=COLORS['text_muted']).pack()
@@ -138,42 +175,45 @@ class ReportView(BaseView):
         
         tree.pack(fill='x', padx=20, pady=10)
     
-    def show_low_stock(self):
+    def show_low_stock(self, data):
         """Display low stock items"""
         tk.Label(self.report_display, text="⚠️ Low Stock Items", 
                 font=('Arial', 14, 'bold'), bg='white').pack(pady=10)
         
-        data = self.service.get_low_stock_items(10)
-        
         if not data:
             tk.Label(self.report_display, text="All items have sufficient stock!", 
                     bg='white', fg=COLORS['success']).pack()
             return
         
-        columns = ('Product', 'Warehouse', 'Current Stock', 'Reorder Level')
+        columns = ('Product', 'Warehouse', 'Current Stock', 'Reorder Level', 'Status')
         tree = ttk.Treeview(self.report_display, columns=columns, show='headings', height=8)
+        tree.tag_configure('new', background='#fee2e2')
         
         for col in columns:
             tree.heading(col, text=col)
             tree.column(col, width=150)
         
+        # Items that went low since the last view are highlighted
         for row in data:
+            is_new = bool(row.get('is_new'))
             tree.insert('', 'end', values=(
                 row.get('product_name', 'Unknown'),
                 row.get('warehouse_name', 'Unknown'),
                 row.get('qty', 0),
-                row.get('reorder_level', 10)
-            ))
+                row.get('reorder_level', 10),
+                'New' if is_new else ''
+            ), tags=('new',) if is_new else ())
         
         tree.pack(fill='x', padx=20, pady=10)
+        
+        # Viewing the report marked the items seen; update the card's count
+        self.load_metrics()
     
-    def show_order_summary(self):
+    def show_order_summary(self, metrics):
         """Display order summary"""
         tk.Label(self.report_display, text="📋 Order Summary", 
                 font=('Arial', 14, 'bold'), bg='white').pack(pady=10)
         
-        metrics = self.service.get_dashboard_metrics()
-        
         summary = f"""
         Total Orders: {metrics.get('total_orders', 0)}
         Total Revenue: PKR {metrics.get('total_revenue', 0):,.0f}
@@ -0,0 +1,179 @@
+"""
+Row Stream
+
+Feeds rows from a repository generator (e.g. WorkLogRepository.iter_all)
+into a view without blocking the Tk event loop.
+
+A worker thread pulls rows from the generator and queues them in batches
+(bounded, so a slow UI applies back-pressure instead of buffering the whole
+result). On the Tk thread, an after_idle pump hands rows to a sink in slices
+sized to fit a frame budget, then yields back to the event loop so input
+and redraws stay responsive while thousands of rows arrive.
+"""
+import queue
+import threading
+import time
+from collections import deque
+
+from utils.constants import (
+    STREAM_BATCH_ROWS, STREAM_FRAME_BUDGET_MS, STREAM_QUEUE_BATCHES, BACKGROUND_POLL_MS
+)
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_END = object()
+
+
+class RowStream:
+    """
+    One streaming load. Usually created through BaseView.stream_rows, which
+    provides a Treeview sink and cancels the stream when the view goes away.
+
+    Usage:
+        stream = RowStream(view, lambda: repo.iter_all(status_filter='PENDING'),
+                           on_rows=add_to_tree, on_done=finished)
+        stream.start()
+        stream.cancel()   # e.g. navigating away
+    """
+
+    def __init__(self, view, source, on_rows, on_done=None, on_error=None,
+                 on_progress=None, budget_ms=STREAM_FRAME_BUDGET_MS):
+        """
+        Args:
+            view: Owning BaseView (provides the executor and the Tk frame)
+            source: Callable returning the row iterator; called and iterated
+                    on a worker thread
+            on_rows: Tk-thread sink given each slice of rows (a list)
+            on_done: Called on the Tk thread with the total row count
+            on_error: Called on the Tk thread with the exception
+            on_progress: Called on the Tk thread with the rows shown so far
+            budget_ms: Tk time spent in on_rows per event-loop turn
+        """
+        self.view = view
+        self.source = source
+        self.on_rows = on_rows
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.budget = budget_ms / 1000.0
+
+        self.count = 0
+        self._queue = queue.Queue(maxsize=STREAM_QUEUE_BATCHES)
+        self._pending = deque()           # rows taken from the queue, not yet shown
+        self._slice = STREAM_BATCH_ROWS   # rows per on_rows call, adapted to the budget
+        self._cancelled = threading.Event()
+        self._after_id = None
+        self._finished = False
+
+    def start(self):
+        """Start the worker and the Tk-side pump."""
+        self.view.executor.submit(('stream', id(self)), self._produce)
+        self._after_id = self.view.frame.after_idle(self._pump)
+
+    def cancel(self):
+        """Stop streaming; the worker closes the generator (and its cursor)."""
+        if self._cancelled.is_set():
+            return
+        self._cancelled.set()
+        if self._after_id is not None:
+            try:
+                self.view.frame.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        # Unblock a worker waiting on a full queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    @property
+    def active(self):
+        """True until the stream finished, failed or was cancelled."""
+        return not (self._finished or self._cancelled.is_set())
+
+    # ---- worker thread ---------------------------------------------------
+
+    def _produce(self):
+        iterator = None
+        try:
+            iterator = iter(self.source())
+            batch = []
+            for row in iterator:
+                if self._cancelled.is_set():
+                    return
+                batch.append(row)
+                if len(batch) >= STREAM_BATCH_ROWS:
+                    self._put(batch)
+                    batch = []
+            if batch:
+                self._put(batch)
+            self._put(_END)
+        except Exception as e:
+            self._put(e)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def _put(self, item):
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    # ---- Tk thread -------------------------------------------------------
+
+    def _pump(self):
+        """Show queued rows until the frame budget is spent, then yield."""
+        self._after_id = None
+        if self._cancelled.is_set():
+            return
+        if not self.view._alive():
+            self.cancel()
+            return
+
+        deadline = time.perf_counter() + self.budget
+        outcome = None
+        while time.perf_counter() < deadline:
+            if not self._pending:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END or isinstance(item, Exception):
+                    outcome = item
+                    break
+                self._pending.extend(item)
+
+            size = min(self._slice, len(self._pending))
+            rows = [self._pending.popleft() for _ in range(size)]
+            started = time.perf_counter()
+            self.on_rows(rows)
+            self.count += size
+            # Size the next slice from the measured cost per row
+            per_row = (time.perf_counter() - started) / size
+            if per_row > 0:
+                self._slice = max(1, min(STREAM_BATCH_ROWS * 10, int(self.budget / 2 / per_row)))
+
+        if self.on_progress:
+            self.on_progress(self.count)
+
+        if outcome is _END:
+            self._finished = True
+            if self.on_done:
+                self.on_done(self.count)
+        elif outcome is not None:
+            self._finished = True
+            logger.error(f"Row stream failed after {self.count} rows: {outcome}")
+            if self.on_error:
+                self.on_error(outcome)
+        elif self._pending or not self._queue.empty():
+            self._after_id = self.view.frame.after_idle(self._pump)
+        else:
+            # Waiting on the database; poll instead of spinning on idle
+            self._after_id = self.view.frame.after(BACKGROUND_POLL_MS, self._pump)
@@ -0,0 +1,90 @@
+"""
+Tree Sync
+
+Keyed diff for Treeview refreshes. Rows are identified by their primary key
+(the item iid), and only the rows that were added, removed, changed or
+reordered cost Tk calls; unchanged rows keep their items, so selection and
+scroll position survive a refresh.
+"""
+import bisect
+from tkinter import ttk
+
+
+def _stable(order, position):
+    """
+    Pick the largest set of existing items that are already in the right
+    relative order (longest increasing subsequence of their new positions);
+    every other existing item has to move.
+
+    Args:
+        order: Current iids in display order (all present in position)
+        position: iid -> new display position
+
+    Returns:
+        set: iids that can stay where they are
+    """
+    tail_positions = []   # smallest new position ending a run of length k+1
+    tails = []            # index into order of that run's last element
+    previous = []         # index of the element before order[i] in its run
+    for i, iid in enumerate(order):
+        k = bisect.bisect_left(tail_positions, position[iid])
+        previous.append(tails[k - 1] if k else -1)
+        if k == len(tails):
+            tail_positions.append(position[iid])
+            tails.append(i)
+        else:
+            tail_positions[k] = position[iid]
+            tails[k] = i
+
+    stable = set()
+    i = tails[-1] if tails else -1
+    while i != -1:
+        stable.add(order[i])
+        i = previous[i]
+    return stable
+
+
+def sync_tree(tree, items, shown):
+    """
+    Bring a flat Treeview in line with items using as few Tk calls as possible.
+
+    Native ttk.Treeview methods are called directly, so this also works on
+    subclasses that override insert/delete/move (VirtualTreeview).
+
+    Args:
+        tree: Treeview whose top-level items are exactly those in shown
+        items: Wanted rows in display order as (iid, values, tags)
+        shown: iid -> (values, tags) of the items on screen, in display
+               order (the dict returned by the previous call; {} at first)
+
+    Returns:
+        dict: The new shown mapping, to pass to the next call
+    """
+    wanted = {}
+    for iid, values, tags in items:
+        wanted[iid] = (tuple(values), tuple(tags))
+
+    gone = [iid for iid in shown if iid not in wanted]
+    if gone:
+        ttk.Treeview.delete(tree, *gone)
+
+    position = {iid: pos for pos, iid in enumerate(wanted)}
+    stable = _stable([iid for iid in shown if iid in wanted], position)
+    moving = [iid for iid in shown if iid in wanted and iid not in stable]
+    if moving:
+        ttk.Treeview.detach(tree, *moving)
+
+    # Invariant: the first pos items on screen are the first pos wanted rows,
+    # followed only by stable rows still to be reached. So a stable row is
+    # already in place and every other row goes to index pos.
+    for pos, (iid, (values, tags)) in enumerate(wanted.items()):
+        old = shown.get(iid)
+        if old is None:
+            ttk.Treeview.insert(tree, '', pos, iid=iid, values=values, tags=tags)
+            continue
+        if iid not in stable:
+            ttk.Treeview.move(tree, iid, '', pos)
+        if old != (values, tags):
+            ttk.Treeview.item(tree, iid, values=values, tags=tags)
+
+    return wanted
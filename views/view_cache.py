@@ -0,0 +1,138 @@
+"""
+View Cache
+
+Keeps constructed dashboard views alive while another one is shown, so
+switching back to a screen re-packs its existing widgets instead of
+rebuilding them and re-querying the database.
+
+A re-shown view displays the rows it already has at once (stale while
+revalidate) and reloads them in the background when its data may have
+changed: a table it reads (BaseView.CACHE_TABLES) was written since it
+last loaded, or it is older than the TTL. Writes are detected through the
+lookup cache's per-table generation counters, which every committed
+BaseRepository write and every invalidate_tables() call bumps.
+
+Hidden views are evicted least recently used first once there are more
+than max_views of them or together they hold more than max_rows rows.
+"""
+import time
+from collections import OrderedDict
+
+from models.lookup_cache import lookup_cache
+from utils.constants import VIEW_CACHE_SIZE, VIEW_CACHE_MAX_ROWS, VIEW_CACHE_TTL
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class _Entry:
+    def __init__(self, view, generations):
+        self.view = view
+        self.generations = generations
+        self.loaded_at = time.monotonic()
+
+
+class ViewCache:
+    """
+    LRU cache of BaseView instances sharing one content area.
+
+    Usage:
+        self.views = ViewCache(self.content_area, self.current_user)
+        self.current_view = self.views.show(EmployeeView)
+    """
+
+    def __init__(self, parent, current_user, max_views=VIEW_CACHE_SIZE,
+                 max_rows=VIEW_CACHE_MAX_ROWS, ttl=VIEW_CACHE_TTL):
+        """
+        Args:
+            parent: Content area the views are packed into
+            current_user: Logged-in user dict passed to each view
+            max_views: Views kept, including the visible one
+            max_rows: Rows hidden views may hold in total
+            ttl: Seconds a re-shown view is trusted without revalidating
+        """
+        self.parent = parent
+        self.current_user = current_user
+        self.max_views = max_views
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.current = None
+        self._entries = OrderedDict()   # view class -> _Entry, least recent first
+
+    def show(self, view_class):
+        """
+        Show the view of a class, reusing the cached instance if there is one.
+
+        Args:
+            view_class: BaseView subclass
+
+        Returns:
+            BaseView: The visible view
+        """
+        entry = self._entries.get(view_class)
+        if entry is not None and not entry.view._alive():
+            del self._entries[view_class]
+            entry = None
+
+        if self.current is not None and (entry is None or self.current is not entry.view):
+            self.current.hide()
+
+        if entry is None:
+            # Snapshot before the view starts loading, so a write racing the
+            # first load marks it stale
+            generations = lookup_cache.generations(view_class.CACHE_TABLES)
+            view = view_class(self.parent, self.current_user, clear_parent=False)
+            entry = _Entry(view, generations)
+            self._entries[view_class] = entry
+        else:
+            self._entries.move_to_end(view_class)
+            entry.view.show()
+            if self._stale(entry):
+                self._revalidate(entry)
+
+        self.current = entry.view
+        self._evict()
+        return entry.view
+
+    def invalidate(self, view_class=None):
+        """
+        Drop cached views so they are rebuilt on their next show.
+
+        Args:
+            view_class: Only this class (default: every hidden view)
+        """
+        for cls in list(self._entries):
+            if view_class is None or cls is view_class:
+                self._drop(cls)
+
+    # ---- internals -------------------------------------------------------
+
+    def _stale(self, entry):
+        tables = type(entry.view).CACHE_TABLES
+        return (lookup_cache.generations(tables) != entry.generations
+                or time.monotonic() - entry.loaded_at > self.ttl)
+
+    def _revalidate(self, entry):
+        entry.generations = lookup_cache.generations(type(entry.view).CACHE_TABLES)
+        entry.loaded_at = time.monotonic()
+        entry.view.revalidate()
+
+    def _evict(self):
+        hidden = [cls for cls, entry in self._entries.items() if entry.view is not self.current]
+        rows = sum(self._entries[cls].view.cached_rows() for cls in hidden)
+        for cls in hidden:
+            if len(self._entries) <= self.max_views and rows <= self.max_rows:
+                break
+            rows -= self._entries[cls].view.cached_rows()
+            self._drop(cls)
+
+    def _drop(self, view_class):
+        entry = self._entries[view_class]
+        if entry.view is self.current:
+            return
+        del self._entries[view_class]
+        logger.debug(f"Evicting cached view {view_class.__name__}")
+        try:
+            entry.view.frame.destroy()
+        except Exception:
+            pass
@@ -0,0 +1,470 @@
+"""
+Virtual Treeview
+
+A ttk.Treeview that keeps only the visible rows (plus an overscan band above
+and below) as Tk items. The full listing lives in a Python sequence and rows
+are rendered into items as they scroll into the band, so a 50k-row listing
+costs a few dozen Tcl items instead of 50k.
+
+Rows come from either
+  * set_rows(rows, render) - any sequence of row dicts plus a function
+    turning a row into (iid, values, tags); only visible rows are rendered, or
+  * the usual insert()/delete()/item() calls, which are served from the
+    in-memory list, so existing populate loops keep working.
+
+A PagedSource fetches further pages of a keyset-paginated listing when the
+view is scrolled near the end of what has been loaded.
+
+Headings, columns, tags, bindings and selection() behave like a plain
+Treeview; selected rows stay selected while scrolled out of the band.
+The band is updated with a keyed diff, so re-setting the rows after an edit
+only touches the Tk items that changed.
+"""
+import itertools
+import tkinter as tk
+from tkinter import ttk
+
+from utils.constants import VIRTUAL_OVERSCAN
+from utils.logger import setup_logger
+from views.tree_sync import sync_tree
+
+logger = setup_logger(__name__)
+
+
+def _item_row(item):
+    """Render function for rows added through insert(): already (iid, values, tags)."""
+    return item
+
+
+def _tags(tags):
+    if not tags:
+        return ()
+    if isinstance(tags, str):
+        return tuple(tags.split())
+    return tuple(tags)
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    Treeview that materialises only a window of its rows.
+
+    Usage:
+        tree = VirtualTreeview(frame, columns=('ID', 'Name'), show='headings',
+                               yscrollcommand=scrollbar.set)
+        scrollbar.config(command=tree.yview)
+        tree.set_rows(rows, lambda row: (str(row['id']), (row['id'], row['name']), ()))
+    """
+
+    def __init__(self, master=None, overscan=VIRTUAL_OVERSCAN, yscrollcommand=None, **kwargs):
+        """
+        Args:
+            master: Parent widget
+            overscan: Rows kept materialised above and below the visible ones
+            yscrollcommand: Scrollbar.set of the external scrollbar; it is
+                            driven in whole-listing terms
+            kwargs: Other ttk.Treeview options (columns, show, height...)
+        """
+        super().__init__(master, yscrollcommand=self._on_native_scroll, **kwargs)
+        self.overscan = overscan
+        self._yscroll = yscrollcommand
+
+        self._rows = []               # data source
+        self._render = _item_row      # row -> (iid, values, tags)
+        self._owned = True            # _rows is our own list of items
+        self._index = None            # iid -> position, built on demand
+        self._dead = set()            # deleted iids awaiting compaction
+
+        self._top = 0                 # first visible position
+        self._start = self._end = 0   # materialised band [start, end)
+        self._band = {}               # iid -> position for materialised rows
+        self._shown = {}              # iid -> (values, tags) of the band, in order
+        self._selected = set()        # selected iids, materialised or not
+        self._redraw_id = None
+        self._replace = False         # next native selection change replaces ours
+        self._ids = itertools.count(1)
+
+        self.bind('<<TreeviewSelect>>', self._on_native_select, add='+')
+        self.bind('<Configure>', lambda e: self._schedule(), add='+')
+        self.bind('<ButtonPress-1>', self._on_user_select, add='+')
+        for key in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.bind(key, self._on_user_select, add='+')
+
+    # ---- data source -------------------------------------------------------
+
+    def set_rows(self, rows, render):
+        """
+        Show a new listing, keeping selection and scroll position.
+
+        Rows are matched by iid: the first visible row stays at the top if
+        it is still listed, and only band rows that were added, removed,
+        changed or moved cost Tk calls.
+
+        Args:
+            rows: Sequence of rows (list, or a PagedSource)
+            render: row -> (iid, values, tags); iids must be unique strings
+        """
+        anchor = self._anchor()
+        self._rows = rows
+        self._render = render
+        self._owned = False
+        self._index = None
+        self._dead.clear()
+        if anchor is not None and anchor in self._positions():
+            self._top = self._index[anchor]
+        self._redraw()
+
+    def refresh_rows(self):
+        """Re-render after the current source changed in place (e.g. a page loaded)."""
+        self._index = None
+        self._schedule()
+
+    def row_count(self):
+        """Number of rows in the listing."""
+        self._compact()
+        return len(self._rows)
+
+    # ---- Treeview API served from the model --------------------------------
+
+    def insert(self, parent, index, iid=None, **kw):
+        """Add a row (parent must be ''); returns its iid."""
+        if parent:
+            raise tk.TclError("VirtualTreeview rows cannot have children")
+        self._own()
+        if iid is None:
+            iid = f"R{next(self._ids):06d}"
+        iid = str(iid)
+        if iid in self._positions():
+            raise tk.TclError(f'Item {iid} already exists')
+
+        item = (iid, tuple(kw.get('values', ())), _tags(kw.get('tags')))
+        if index == 'end' or index >= len(self._rows):
+            self._rows.append(item)
+            self._index[iid] = len(self._rows) - 1
+        else:
+            self._rows.insert(int(index), item)
+            self._index = None
+        self._schedule()
+        return iid
+
+    def delete(self, *items):
+        """Remove rows. Cheap per call; the list is compacted once later."""
+        for iid in items:
+            self._dead.add(str(iid))
+            self._selected.discard(str(iid))
+        self._schedule()
+
+    def get_children(self, item=None):
+        """All row iids in order."""
+        if item:
+            return ()
+        self._compact()
+        return tuple(self._render(row)[0] for row in self._rows)
+
+    def exists(self, item):
+        return str(item) in self._positions()
+
+    def index(self, item):
+        return self._position(item)
+
+    def move(self, item, parent, index):
+        """Move a row to a new position."""
+        self._own()
+        pos = self._position(item)
+        row = self._rows.pop(pos)
+        self._rows.insert(len(self._rows) if index == 'end' else int(index), row)
+        self._index = None
+        self._schedule()
+
+    def item(self, item, option=None, **kw):
+        """Get or set a row's values/tags, like ttk.Treeview.item."""
+        iid = str(item)
+        if kw:
+            self._own()
+            pos = self._position(iid)
+            _, values, tags = self._rows[pos]
+            values = tuple(kw.get('values', values))
+            tags = _tags(kw.get('tags', tags))
+            self._rows[pos] = (iid, values, tags)
+            if iid in self._band:
+                super().item(iid, values=values, tags=tags)
+                self._shown[iid] = (values, tags)
+            return None
+
+        _, values, tags = self._render(self._rows[self._position(iid)])
+        info = {'text': '', 'image': '', 'values': list(values), 'open': 0, 'tags': list(tags)}
+        return info[option] if option else info
+
+    def see(self, item):
+        """Scroll so the row is visible."""
+        pos = self._position(item)
+        visible = self._visible()
+        if pos < self._top:
+            self._scroll_to(pos)
+        elif pos >= self._top + visible:
+            self._scroll_to(pos - visible + 1)
+
+    def selection(self):
+        """Selected iids in listing order (including rows scrolled away)."""
+        positions = self._positions()
+        return tuple(sorted((iid for iid in self._selected if iid in positions),
+                            key=positions.get))
+
+    def selection_set(self, *items):
+        self._selected = set(self._flatten(items))
+        super().selection_set([iid for iid in self._selected if iid in self._band])
+
+    def selection_add(self, *items):
+        added = self._flatten(items)
+        self._selected.update(added)
+        super().selection_add([iid for iid in added if iid in self._band])
+
+    def selection_remove(self, *items):
+        removed = self._flatten(items)
+        self._selected.difference_update(removed)
+        super().selection_remove([iid for iid in removed if iid in self._band])
+
+    # ---- scrolling -------------------------------------------------------
+
+    def yview(self, *args):
+        """Scrollbar protocol in whole-listing terms."""
+        total = self.row_count()
+        if not args:
+            return self._fractions(total)
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self._visible() if args[2] == 'pages' else 1)
+            self._scroll_to(self._top + step)
+        return None
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    # ---- internals -------------------------------------------------------
+
+    def _own(self):
+        """Switch to an owned list of (iid, values, tags) before mutating."""
+        self._compact()
+        if not self._owned:
+            self._rows = [self._render(row) for row in self._rows]
+            self._render = _item_row
+            self._owned = True
+            self._index = None
+        if self._index is None:
+            self._positions()
+
+    def _compact(self):
+        """Apply pending deletes in one pass."""
+        if not self._dead:
+            return
+        dead, self._dead = self._dead, set()
+        if not self._owned:
+            self._rows = [self._render(row) for row in self._rows]
+            self._render = _item_row
+            self._owned = True
+        self._rows = [row for row in self._rows if row[0] not in dead]
+        self._index = None
+
+    def _positions(self):
+        """iid -> position map (rebuilt lazily after changes)."""
+        self._compact()
+        if self._index is None:
+            self._index = {self._render(row)[0]: pos for pos, row in enumerate(self._rows)}
+        return self._index
+
+    def _position(self, item):
+        try:
+            return self._positions()[str(item)]
+        except KeyError:
+            raise tk.TclError(f'Item {item} not found')
+
+    @staticmethod
+    def _flatten(items):
+        flat = []
+        for item in items:
+            if isinstance(item, (list, tuple)):
+                flat.extend(str(i) for i in item)
+            else:
+                flat.append(str(item))
+        return flat
+
+    def _anchor(self):
+        """iid of the first visible row, if any."""
+        self._compact()
+        if self._top < len(self._rows):
+            return self._render(self._rows[self._top])[0]
+        return None
+
+    def _visible(self):
+        """Rows that fit in the widget."""
+        style = self.cget('style') or 'Treeview'
+        try:
+            rowheight = int(ttk.Style().lookup(style, 'rowheight') or 20)
+        except (ValueError, tk.TclError):
+            rowheight = 20
+        height = self.winfo_height()
+        if height <= 1:
+            return int(self.cget('height'))
+        return max(1, height // rowheight)
+
+    def _fractions(self, total):
+        if not total:
+            return 0.0, 1.0
+        return self._top / total, min(1.0, (self._top + self._visible()) / total)
+
+    def _schedule(self):
+        """Coalesce redraws (e.g. a loop of insert calls) into one idle pass."""
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._redraw)
+
+    def _scroll_to(self, top):
+        self._top = top
+        self._redraw()
+
+    def _redraw(self):
+        """Bring the materialised band in line with the rows and scroll offset."""
+        if self._redraw_id is not None:
+            try:
+                self.after_cancel(self._redraw_id)
+            except tk.TclError:
+                pass
+            self._redraw_id = None
+        try:
+            if not self.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        self._compact()
+
+        total = len(self._rows)
+        visible = self._visible()
+        self._top = max(0, min(self._top, total - visible))
+        start = max(0, self._top - self.overscan)
+        end = min(total, self._top + visible + self.overscan)
+
+        # Diff the band against what is on screen: scrolling adds and drops
+        # rows at the edges, a refresh only touches rows that changed
+        items = [self._render(self._rows[pos]) for pos in range(start, end)]
+        self._shown = sync_tree(self, items, self._shown)
+        self._band = {iid: start + i for i, (iid, _, _) in enumerate(items)}
+        self._start, self._end = start, end
+
+        native = set(super().selection())
+        wanted = {iid for iid in self._selected if iid in self._band}
+        if native != wanted:
+            super().selection_set(list(wanted))
+
+        if end > start:
+            super().yview('moveto', (self._top - start) / (end - start))
+        if self._yscroll:
+            self._yscroll(*self._fractions(total))
+        self._maybe_load_more(end, total)
+
+    def _maybe_load_more(self, end, total):
+        """Ask a paged source for its next page when the band reaches the end."""
+        rows = self._rows
+        if end >= total and getattr(rows, 'has_more', False):
+            rows.load_more(self.refresh_rows)
+
+    def _on_native_scroll(self, first, last):
+        """The native view moved (wheel, keys): track it and slide the band."""
+        count = self._end - self._start
+        if not count:
+            if self._yscroll:
+                self._yscroll(*self._fractions(len(self._rows)))
+            return
+        self._top = self._start + int(round(float(first) * count))
+        total = len(self._rows)
+        if self._yscroll:
+            self._yscroll(*self._fractions(total))
+
+        margin = self.overscan // 2
+        visible = self._visible()
+        if ((self._start > 0 and self._top - self._start < margin) or
+                (self._end < total and self._end - (self._top + visible) < margin)):
+            self._schedule()
+
+    def _on_user_select(self, event):
+        """A plain click or arrow key replaces the selection; Shift/Ctrl extend it."""
+        self._replace = not (event.state & 0x0005)
+
+    def _on_native_select(self, event):
+        """Mirror selection changes of materialised rows into the model."""
+        native = set(super().selection())
+        if self._replace:
+            self._selected = native
+            self._replace = False
+        else:
+            self._selected = {iid for iid in self._selected if iid not in self._band} | native
+
+
+class PagedSource:
+    """
+    Row sequence backed by a keyset-paginated repository listing.
+
+    The first page is fetched when the source is created (call this off the
+    Tk thread); later pages are fetched in the background when a
+    VirtualTreeview showing the source scrolls near its end.
+
+    Usage (inside a BaseView):
+        source = PagedSource(
+            lambda cursor: repo.get_page(cursor=cursor, page_size=MAX_PAGE_SIZE),
+            lambda func, on_success, on_error: self.run_async(
+                'page', func, on_success, on_error=on_error, show_loading=False)
+        )
+    """
+
+    def __init__(self, fetch_page, run_async):
+        """
+        Args:
+            fetch_page: fetch_page(cursor) -> page dict from execute_page
+            run_async: run_async(func, on_success, on_error) runner for
+                       background page loads
+        """
+        self.fetch_page = fetch_page
+        self.run_async = run_async
+        self._loading = False
+        page = fetch_page(None)
+        self._rows = list(page['rows'])
+        self._cursor = page['next_cursor']
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    @property
+    def has_more(self):
+        """True while further pages remain to be fetched."""
+        return self._cursor is not None
+
+    def load_more(self, on_loaded):
+        """
+        Fetch the next page in the background (no-op if one is loading).
+
+        Args:
+            on_loaded: Called on the Tk thread once the rows are appended
+        """
+        if self._loading or self._cursor is None:
+            return
+        self._loading = True
+        cursor = self._cursor
+
+        def loaded(page):
+            self._loading = False
+            self._rows.extend(page['rows'])
+            self._cursor = page['next_cursor']
+            on_loaded()
+
+        def failed(exc):
+            self._loading = False
+            logger.error(f"Failed to load next page: {exc}")
+
+        self.run_async(lambda: self.fetch_page(cursor), loaded, failed)
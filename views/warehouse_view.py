@@ -4,10 +4,13 @@ Warehouse View - Manages warehouse UI interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.warehouse_repository import WarehouseRepository
 from config.database import get_db_connection
 
 class WarehouseView(BaseView):
+    CACHE_TABLES = ('warehouses', 'locations', 'person', 'warehouse_products')
+
     def create_ui(self):
         self.repository = WarehouseRepository()
         self.search_var = tk.StringVar()
@@ -15,6 +18,13 @@ class WarehouseView(BaseView):
         self.create_header("📦 Warehouse Management", "#7c3aed")
         self.create_toolbar()
         self.create_treeview()
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate
+        )
         self.load_data()
 
     def create_toolbar(self):
@@ -26,7 +36,6 @@ class WarehouseView(BaseView):
         search_frame.pack(side='left')
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left')
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var, bg='#f8fafc', relief='solid', bd=1).pack(side='left')
 
         # Actions
@@ -59,26 +68,24 @@ class WarehouseView(BaseView):
         self.tree.bind('<Double-1>', lambda e: self.edit_warehouse())
 
     def load_data(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            sup_id = self.current_user['person_id'] if self.current_user['person_type'] == 'SUPERVISOR' else None
-            
-            warehouses = self.repository.get_all(
-                supervisor_id=sup_id,
-                search_term=self.search_var.get()
-            )
-            
-            for idx, wh in enumerate(warehouses):
-                tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-                self.tree.insert('', 'end', values=(
-                    wh['warehouse_id'], wh['warehouse_name'], wh['location_name'] or 'N/A',
-                    wh['supervisor_name'] or 'Unassigned', wh['capacity'] or '-', wh['product_count']
-                ), tags=(tag,))
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.search.refresh()
+
+    def list_filters(self):
+        sup_id = self.current_user['person_id'] if self.current_user['person_type'] == 'SUPERVISOR' else None
+        return {'supervisor_id': sup_id}
+
+    def populate_tree(self, warehouses):
+        # Stripes follow the position, so rows below an insert/delete re-tag
+        self.show_rows(self.tree, list(enumerate(warehouses)), self.warehouse_item)
+
+    @staticmethod
+    def warehouse_item(entry):
+        idx, wh = entry
+        tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
+        return str(wh['warehouse_id']), (
+            wh['warehouse_id'], wh['warehouse_name'], wh['location_name'] or 'N/A',
+            wh['supervisor_name'] or 'Unassigned', wh['capacity'] or '-', wh['product_count']
+        ), (tag,)
 
     def add_warehouse(self):
         from dialogs.warehouse_dialog import WarehouseDialog
@@ -4,11 +4,14 @@ Work Log View - Manages Work Log UI interactions
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
+from views.incremental_search import IncrementalSearch
 from models.worklog_repository import WorkLogRepository
 from config.database import get_db_connection
 from utils.constants import COLORS
 
 class WorkLogView(BaseView):
+    CACHE_TABLES = ('work_log', 'person', 'projects')
+
     def create_ui(self):
         self.repository = WorkLogRepository()
         self.search_var = tk.StringVar()
@@ -17,6 +20,15 @@ class WorkLogView(BaseView):
         self.create_header("⏰ Work Logs", "#f59e0b")
         self.create_toolbar()
         self.create_treeview()
+        self.search = IncrementalSearch(
+            self, self.search_var,
+            fetch=self.repository.get_all,
+            filters=self.list_filters,
+            on_results=self.populate_tree,
+            predicate=self.repository.search_predicate,
+            stream=self.repository.iter_all,
+            stream_to=(self.tree, self.log_item)
+        )
         self.load_data()
 
     def create_toolbar(self):
@@ -28,14 +40,13 @@ class WorkLogView(BaseView):
         search_frame.pack(side='left')
         tk.Label(search_frame, text="🔍", font=('Arial', 14), bg='white').pack(side='left')
         
-        self.search_var.trace('w', lambda *args: self.load_data())
         tk.Entry(search_frame, textvariable=self.search_var, bg='#f8fafc', relief='solid', bd=1).pack(side='left')
 
         # Filter
         tk.Label(toolbar, text="Status:", bg='white').pack(side='left', padx=(20, 5))
         self.status_filter = ttk.Combobox(toolbar, values=['All', 'PENDING', 'APPROVED', 'REJECTED'], state='readonly')
         self.status_filter.current(0)
-        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.load_data())
+        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.search.run())
         self.status_filter.pack(side='left')
 
         # Buttons
@@ -53,7 +64,7 @@ class WorkLogView(BaseView):
 
     def create_treeview(self):
         columns = ('ID', 'Employee', 'Date', 'Hours', 'Status', 'Description')
-        self.tree = super().create_treeview(columns)
+        self.tree = super().create_treeview(columns, virtual=True)
         
         self.tree.heading('ID', text='ID')
         self.tree.heading('Employee', text='Employee')
@@ -69,38 +80,31 @@ class WorkLogView(BaseView):
         self.tree.tag_configure('REJECTED', background='#fee2e2')
 
     def load_data(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Context filters
-            emp_id = None
-            hod_id = None
-            
-            if self.current_user['person_type'] in ['GENERAL_EMPLOYEE', 'SALESMAN']:
-                emp_id = self.current_user['person_id']
-            elif self.current_user['person_type'] == 'HOD':
-                # HOD sees dept logs
-                hod_id = self.current_user['person_id']
-            # Supervisor logic would go here if needed (supervisor_id)
-            
-            status = self.status_filter.get()
-            
-            logs = self.repository.get_all(
-                emp_id=emp_id,
-                hod_id=hod_id,
-                status_filter=status,
-                search_term=self.search_var.get()
-            )
-            
-            for log in logs:
-                self.tree.insert('', 'end', values=(
-                    log['log_id'], log['employee_name'], log['work_date'], 
-                    log['hours_worked'], log['approval_status'], log['description'] or ''
-                ), tags=(log['approval_status'],))
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.search.refresh()
+
+    def list_filters(self):
+        # Context filters
+        emp_id = None
+        hod_id = None
+        
+        if self.current_user['person_type'] in ['GENERAL_EMPLOYEE', 'SALESMAN']:
+            emp_id = self.current_user['person_id']
+        elif self.current_user['person_type'] == 'HOD':
+            # HOD sees dept logs
+            hod_id = self.current_user['person_id']
+        # Supervisor logic would go here if needed (supervisor_id)
+        
+        return {'emp_id': emp_id, 'hod_id': hod_id, 'status_filter': self.status_filter.get()}
+
+    def populate_tree(self, logs):
+        self.show_rows(self.tree, logs, self.log_item)
+
+    @staticmethod
+    def log_item(log):
+        return str(log['log_id']), (
+            log['log_id'], log['employee_name'], log['work_date'], 
+            log['hours_worked'], log['approval_status'], log['description'] or ''
+        ), (log['approval_status'],)
 
     def add_log(self):
         from dialogs.worklog_dialog import WorkLogDialog